@@ -0,0 +1,130 @@
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import router
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import (
+    AuthenticationFailed, InvalidToken
+)
+from rest_framework_simplejwt.settings import api_settings
+
+from api.tokens import USER_CLAIMS
+
+User = get_user_model()
+
+MISSING = object()
+
+
+class UserStateCache:
+    """
+    Кэш ролей и флагов пользователей в памяти процесса.
+
+    Запись живёт `ttl` секунд: за это время изменение роли, блокировка или
+    удаление пользователя в другом процессе вступят в силу. В текущем
+    процессе запись сбрасывается сразу, сигналами модели пользователя.
+    Хранится не больше `maxsize` записей: при записи удаляются истёкшие и
+    самые старые.
+    """
+
+    def __init__(self, ttl, maxsize):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        # Записи упорядочены по времени истечения: у всех одинаковый ttl.
+        self._states = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, user_id):
+        entry = self._states.get(user_id)
+        if entry is None or entry[0] < monotonic():
+            return MISSING
+        return entry[1]
+
+    def set(self, user_id, state):
+        now = monotonic()
+        with self._lock:
+            self._states[user_id] = (now + self.ttl, state)
+            self._states.move_to_end(user_id)
+            while self._states and (
+                len(self._states) > self.maxsize
+                or next(iter(self._states.values()))[0] < now
+            ):
+                self._states.popitem(last=False)
+
+    def __len__(self):
+        return len(self._states)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._states.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._states.clear()
+
+
+user_states = UserStateCache(
+    getattr(settings, 'AUTH_USER_STATE_TTL', 30),
+    getattr(settings, 'AUTH_USER_STATE_CACHE_SIZE', 10000),
+)
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    JWT-аутентификация без SELECT пользователя на каждый запрос.
+
+    Пользователь собирается из утверждений токена (см. ClaimsAccessToken)
+    как экземпляр User с отложенными полями: id, имя, роль и флаги уже
+    загружены, остальные поля подгрузятся из БД при первом обращении.
+    Актуальность роли и флагов сверяется с БД не чаще раза в
+    AUTH_USER_STATE_TTL секунд на пользователя.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                'Токен не содержит идентификатора пользователя'
+            )
+
+        state = self.get_state(user_id)
+        if state is None:
+            raise AuthenticationFailed(
+                'Пользователь не найден', code='user_not_found'
+            )
+        claims = {
+            claim: validated_token.get(claim, MISSING)
+            for claim in USER_CLAIMS
+        }
+        if claims != state:
+            # Токен выпущен до смены роли или без утверждений вовсе.
+            claims = state
+        if not claims['is_active']:
+            raise AuthenticationFailed(
+                'Пользователь заблокирован', code='user_inactive'
+            )
+        return self.build_user(user_id, claims)
+
+    def get_state(self, user_id):
+        state = user_states.get(user_id)
+        if state is MISSING:
+            state = User.objects.filter(
+                **{api_settings.USER_ID_FIELD: user_id}
+            ).values(*USER_CLAIMS).first()
+            user_states.set(user_id, state)
+        return state
+
+    def build_user(self, user_id, claims):
+        values = {api_settings.USER_ID_FIELD: user_id, **claims}
+        field_names = [
+            field.attname for field in User._meta.concrete_fields
+            if field.attname in values
+        ]
+        return User.from_db(
+            router.db_for_write(User),
+            field_names,
+            [values[name] for name in field_names]
+        )
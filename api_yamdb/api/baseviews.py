@@ -1,12 +1,16 @@
+from django.shortcuts import get_object_or_404
 from rest_framework import filters, viewsets
 from rest_framework.pagination import LimitOffsetPagination
 
+from api.cache import CachedResponseMixin
 from api.permissions import IsAdminOrReadOnly
+from api.replicas import ReplicaReadMixin
 
 
 class CategoryGenreBaseViewSet(
-    viewsets.mixins.CreateModelMixin, viewsets.mixins.DestroyModelMixin,
-    viewsets.mixins.ListModelMixin, viewsets.GenericViewSet
+    ReplicaReadMixin, CachedResponseMixin, viewsets.mixins.CreateModelMixin,
+    viewsets.mixins.DestroyModelMixin, viewsets.mixins.ListModelMixin,
+    viewsets.GenericViewSet
 ):
     """
     Базовый вьюсет для Категорий и Жанров.
@@ -19,3 +23,33 @@ class CategoryGenreBaseViewSet(
     pagination_class = LimitOffsetPagination
     search_fields = ('name',)
     lookup_field = 'slug'
+    query_budget = {'list': 3}
+
+
+class NestedResourceMixin:
+    """
+    Вьюсет вложенного ресурса (/titles/{title_id}/reviews/ и т.п.).
+
+    Объекты выбираются сразу по id родителей из URL, без отдельной загрузки
+    родителя. Сам родитель загружается не больше одного раза за запрос:
+    при создании объекта, для валидаторов ответа и когда страница списка
+    пуста — чтобы отличить пустой список от несуществующего родителя (404).
+    """
+
+    parent_queryset = None
+    # Поле родителя -> именованный аргумент URL.
+    parent_lookups = {}
+
+    def get_parent(self):
+        if not hasattr(self, '_parent'):
+            self._parent = get_object_or_404(self.parent_queryset, **{
+                field: self.kwargs.get(kwarg)
+                for field, kwarg in self.parent_lookups.items()
+            })
+        return self._parent
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        if not page:
+            self.get_parent()
+        return page
@@ -0,0 +1,124 @@
+"""Кэш ответов публичных эндпоинтов каталога.
+
+Ключ ответа строится из полного URL запроса, выбранного формата ответа и
+счётчика поколений (generation) своего пространства имён: `titles`,
+`genres`, `categories`. Сигналы моделей увеличивают счётчик, и все старые
+ключи пространства перестают использоваться — без перебора ключей. Массовые
+изменения без сигналов (update(), bulk_create) вызывают invalidate_models
+сами: так делают BulkLoader и команды пересчёта рейтинга.
+Устаревшие записи вытесняет сам бэкенд кэша по таймауту.
+
+Бэкенд задаётся псевдонимом API_RESPONSE_CACHE в CACHES (в памяти процесса
+или в файлах). Кэш в памяти сбрасывается только сигналами своего процесса;
+файловый общий для всех процессов на сервере.
+
+Ответы, прочитанные с реплики, не кэшируются: реплика может отставать, и
+устаревший ответ пережил бы сброс поколения до истечения таймаута.
+Такие запросы получают из кэша только ответы, собранные на основной БД.
+"""
+from hashlib import md5
+from time import time_ns
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework import status
+from rest_framework.response import Response
+
+from api_yamdb.metrics import registry
+from api_yamdb.routers import reading_from_replica
+from reviews.models import Category, Genre, GenreTitle, Review, Title
+
+CACHE_ALIAS = getattr(settings, 'API_RESPONSE_CACHE', 'default')
+CACHE_TIMEOUT = getattr(settings, 'API_RESPONSE_CACHE_TIMEOUT', 300)
+
+# Какие закэшированные ответы устаревают при изменении модели.
+CACHE_DEPENDENCIES = {
+    Title: ('titles',),
+    GenreTitle: ('titles',),
+    Review: ('titles',),
+    Genre: ('genres', 'titles'),
+    Category: ('categories', 'titles'),
+}
+
+
+def get_cache():
+    return caches[CACHE_ALIAS]
+
+
+def generation_key(namespace):
+    return f'api:generation:{namespace}'
+
+
+def get_generation(namespace):
+    cache = get_cache()
+    generation = cache.get(generation_key(namespace))
+    if generation is None:
+        # Начинаем со времени, а не с нуля: после вытеснения счётчика
+        # из кэша номера поколений не повторятся.
+        generation = time_ns()
+        if not cache.add(generation_key(namespace), generation, None):
+            generation = cache.get(generation_key(namespace), generation)
+    return generation
+
+
+def invalidate(*namespaces):
+    """Сбрасывает закэшированные ответы пространств имён за O(1)."""
+    cache = get_cache()
+    for namespace in namespaces:
+        try:
+            cache.incr(generation_key(namespace))
+        except ValueError:
+            cache.set(generation_key(namespace), time_ns(), None)
+
+
+def invalidate_models(*models):
+    """Сбрасывает ответы, которые зависят от данных моделей."""
+    invalidate(*{
+        namespace for model in models
+        for namespace in CACHE_DEPENDENCIES.get(model, ())
+    })
+
+
+def response_key(request, namespace):
+    renderer = getattr(request, 'accepted_media_type', '')
+    url = request.build_absolute_uri()
+    digest = md5(f'{renderer}|{url}'.encode()).hexdigest()
+    return f'api:response:{namespace}:{get_generation(namespace)}:{digest}'
+
+
+class CachedResponseMixin:
+    """Кэширует успешные ответы на GET-запросы к list."""
+
+    cache_namespace = None
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        if request.method != 'GET':
+            return handler(request, *args, **kwargs)
+        cache = get_cache()
+        key = response_key(request, self.cache_namespace)
+        data = cache.get(key)
+        registry.inc('api_cache_requests_total', {
+            'namespace': self.cache_namespace,
+            'result': 'miss' if data is None else 'hit',
+        })
+        if data is not None:
+            return Response(data)
+        response = handler(request, *args, **kwargs)
+        if (
+            response.status_code == status.HTTP_200_OK
+            and not reading_from_replica()
+        ):
+            cache.set(key, response.data, CACHE_TIMEOUT)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+
+class CachedDetailResponseMixin(CachedResponseMixin):
+    """Кэширует также ответы retrieve."""
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
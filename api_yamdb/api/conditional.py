@@ -0,0 +1,69 @@
+"""Условные GET-запросы (ETag / Last-Modified).
+
+Валидаторы ответа вычисляются до сериализатора и без загрузки самих
+объектов: по счётчику поколений кэша каталога или по времени изменения
+произведения (Title.changed_at), которое обновляется при любых изменениях
+его отзывов и комментариев и при смене имени их авторов. Если клиент
+прислал совпадающий If-None-Match или If-Modified-Since, сразу
+возвращается 304.
+"""
+from calendar import timegm
+from hashlib import md5
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework import status
+
+
+class ConditionalGetMixin:
+    """
+    Оборачивает list/retrieve вьюсета в проверку условных заголовков.
+
+    Вьюсет возвращает из get_resource_version() пару (версия, время
+    последнего изменения); любое из значений может быть None.
+    """
+
+    def get_resource_version(self):
+        raise NotImplementedError
+
+    def get_etag(self, request, version):
+        media_type = getattr(request, 'accepted_media_type', '')
+        url = request.build_absolute_uri()
+        return quote_etag(
+            md5(f'{version}|{media_type}|{url}'.encode()).hexdigest()
+        )
+
+    def set_validators(self, response, etag, last_modified):
+        if etag is not None:
+            response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return handler(request, *args, **kwargs)
+        version, changed_at = self.get_resource_version()
+        etag = None if version is None else self.get_etag(request, version)
+        last_modified = None
+        if changed_at is not None:
+            last_modified = timegm(changed_at.utctimetuple())
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is not None:
+            return self.set_validators(response, etag, last_modified)
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            self.set_validators(response, etag, last_modified)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
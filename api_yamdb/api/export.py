@@ -0,0 +1,115 @@
+"""Потоковая выгрузка каталога и отзывов.
+
+Строки читаются курсором (iterator(chunk_size=...)) и сразу отдаются
+клиенту через StreamingHttpResponse, поэтому память не зависит от размера
+таблицы. Колонки совпадают с CSV-файлами, которые загружает add_data:
+выгрузку CSV можно положить в static/data и загрузить обратно, а строки
+NDJSON — передать в BulkLoader.load_rows().
+"""
+import csv
+import datetime
+import json
+
+from django.utils.text import compress_sequence
+
+from reviews.models import Category, Comment, Genre, GenreTitle, Review, Title
+
+# Ресурс -> (модель, колонки в порядке файлов static/data).
+EXPORTS = {
+    'categories': (Category, ('id', 'name', 'slug')),
+    'genres': (Genre, ('id', 'name', 'slug')),
+    'titles': (
+        Title, ('id', 'name', 'year', 'category_id', 'description')
+    ),
+    'genre_title': (GenreTitle, ('id', 'title_id', 'genre_id')),
+    'reviews': (
+        Review, ('id', 'title_id', 'text', 'author_id', 'score', 'pub_date')
+    ),
+    'comments': (
+        Comment, ('id', 'review_id', 'text', 'author_id', 'pub_date')
+    ),
+}
+
+CONTENT_TYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+}
+
+DEFAULT_CHUNK_SIZE = 2000
+
+
+def format_value(value):
+    """Дата и время — в ISO 8601, как в исходных CSV."""
+    if isinstance(value, datetime.datetime):
+        value = value.isoformat()
+        if value.endswith('+00:00'):
+            value = value[:-6] + 'Z'
+    return value
+
+
+class LineBuffer:
+    """Файлоподобный объект для csv.writer, собирающий строки в список."""
+
+    def __init__(self):
+        self.lines = []
+
+    def write(self, line):
+        self.lines.append(line)
+
+    def pop(self):
+        data, self.lines = ''.join(self.lines), []
+        return data
+
+
+def csv_lines(columns, rows, chunk_size):
+    buffer = LineBuffer()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for number, row in enumerate(rows, 1):
+        writer.writerow(
+            '' if value is None else format_value(value) for value in row
+        )
+        if number % chunk_size == 0:
+            yield buffer.pop()
+    yield buffer.pop()
+
+
+def ndjson_lines(columns, rows, chunk_size):
+    lines = []
+    for row in rows:
+        lines.append(json.dumps(
+            dict(zip(columns, map(format_value, row))), ensure_ascii=False
+        ))
+        lines.append('\n')
+        if len(lines) >= 2 * chunk_size:
+            yield ''.join(lines)
+            lines = []
+    yield ''.join(lines)
+
+
+WRITERS = {
+    'csv': csv_lines,
+    'ndjson': ndjson_lines,
+}
+
+
+def export_rows(resource, using=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Кортежи значений колонок ресурса в порядке id."""
+    model, columns = EXPORTS[resource]
+    queryset = model._default_manager.order_by('pk')
+    if using is not None:
+        queryset = queryset.using(using)
+    return queryset.values_list(*columns).iterator(chunk_size=chunk_size)
+
+
+def stream_export(resource, export_format, using=None, compress=False,
+                  chunk_size=DEFAULT_CHUNK_SIZE):
+    """Генератор байтов выгрузки; compress — сжатие gzip на лету."""
+    _, columns = EXPORTS[resource]
+    lines = WRITERS[export_format](
+        columns, export_rows(resource, using, chunk_size), chunk_size
+    )
+    data = (line.encode() for line in lines if line)
+    if compress:
+        return compress_sequence(data)
+    return data
@@ -0,0 +1,223 @@
+"""Быстрая сериализация списков без ModelSerializer.
+
+Вместо создания объектов моделей и прохода по полям сериализатора для
+каждого из них страница выбирается через values(), а представление
+строится из словарей по заранее составленному плану. План выводится из
+полей того же сериализатора (включая ?fields= и ?expand=), поэтому ответ
+совпадает с обычным. Связи многие-ко-многим (жанры) загружаются одним
+запросом на страницу и группируются по объектам.
+
+Если у сериализатора есть поле, которое план не умеет строить (например,
+SerializerMethodField), используется обычный путь.
+"""
+from collections import defaultdict
+
+from django.core.exceptions import FieldDoesNotExist
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+# Поля, значения которых из БД уже имеют нужный тип.
+PLAIN_FIELDS = (serializers.IntegerField, serializers.CharField)
+
+
+class UnsupportedField(Exception):
+    pass
+
+
+def get_model_field(model, field):
+    if '.' in field.source or field.source == '*':
+        raise UnsupportedField(field.field_name)
+    try:
+        return model._meta.get_field(field.source)
+    except FieldDoesNotExist:
+        raise UnsupportedField(field.field_name)
+
+
+def get_converter(field):
+    """None — значение отдаётся как есть."""
+    if type(field) in PLAIN_FIELDS:
+        return None
+    if type(field) is serializers.DateTimeField:
+        return get_datetime_converter(field)
+    return field.to_representation
+
+
+def get_datetime_converter(field):
+    """
+    То же, что DateTimeField.to_representation для формата ISO 8601, но
+    часовой пояс определяется один раз, а не для каждого значения.
+    """
+    output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+    field_timezone = getattr(field, 'timezone', field.default_timezone())
+    if (
+        output_format is None or field_timezone is None
+        or output_format.lower() != ISO_8601
+    ):
+        return field.to_representation
+
+    def convert(value):
+        if isinstance(value, str) or timezone.is_naive(value):
+            return field.to_representation(value)
+        value = value.astimezone(field_timezone).isoformat()
+        if value.endswith('+00:00'):
+            value = value[:-6] + 'Z'
+        return value
+
+    return convert
+
+
+class RowPlan:
+    """Плоские поля одной модели: [(имя в ответе, колонка, конвертер)]."""
+
+    def __init__(self, model, fields, prefix=''):
+        self.items = []
+        for name, field in fields.items():
+            model_field = get_model_field(model, field)
+            if model_field.is_relation:
+                raise UnsupportedField(name)
+            self.items.append(
+                (name, prefix + model_field.attname, get_converter(field))
+            )
+
+    @property
+    def columns(self):
+        return [column for _, column, _ in self.items]
+
+    def build(self, row):
+        result = {}
+        for name, column, convert in self.items:
+            value = row[column]
+            if value is not None and convert is not None:
+                value = convert(value)
+            result[name] = value
+        return result
+
+
+class RowSerializer:
+    """Представление объектов сериализатора из строк values()."""
+
+    def __init__(self, serializer):
+        self.model = serializer.Meta.model
+        self.pk = self.model._meta.pk.attname
+        self.columns = {self.pk}
+        self.plan = []
+        self.many = {}
+        for name, field in serializer.fields.items():
+            self.add_field(name, field)
+
+    def add_field(self, name, field):
+        model_field = get_model_field(self.model, field)
+        if model_field.many_to_many:
+            self.add_many(name, field, model_field)
+        elif model_field.one_to_many or model_field.one_to_one:
+            raise UnsupportedField(name)
+        elif not model_field.is_relation:
+            self.add_value(name, model_field.attname, get_converter(field))
+        elif isinstance(field, serializers.SlugRelatedField):
+            self.add_value(name, f'{model_field.name}__{field.slug_field}')
+        elif isinstance(field, serializers.Serializer):
+            plan = RowPlan(
+                model_field.related_model, field.fields,
+                prefix=f'{model_field.name}__'
+            )
+            self.columns.update(plan.columns)
+            self.columns.add(model_field.attname)
+            self.plan.append(('nested', name, (model_field.attname, plan)))
+        else:
+            raise UnsupportedField(name)
+
+    def add_value(self, name, column, convert=None):
+        self.columns.add(column)
+        self.plan.append(('value', name, (column, convert)))
+
+    def add_many(self, name, field, model_field):
+        related = model_field.related_model
+        lookup = model_field.related_query_name()
+        if isinstance(field, serializers.ListSerializer):
+            child = field.child
+            if not isinstance(child, serializers.Serializer):
+                raise UnsupportedField(name)
+            plan = RowPlan(related, child.fields)
+        elif (
+            isinstance(field, serializers.ManyRelatedField)
+            and isinstance(field.child_relation,
+                           serializers.SlugRelatedField)
+        ):
+            plan = field.child_relation.slug_field
+        else:
+            raise UnsupportedField(name)
+        self.many[name] = (related, lookup, plan)
+        self.plan.append(('many', name, None))
+
+    def load_many(self, ids):
+        """{поле: {id объекта: [представления]}} одним запросом на поле."""
+        result = {}
+        for name, (related, lookup, plan) in self.many.items():
+            columns = plan.columns if isinstance(plan, RowPlan) else [plan]
+            # Порядок — ordering связанной модели, как у prefetch_related.
+            rows = related._default_manager.filter(
+                **{f'{lookup}__in': ids}
+            ).values(lookup, *columns)
+            groups = defaultdict(list)
+            for row in rows:
+                groups[row[lookup]].append(
+                    plan.build(row) if isinstance(plan, RowPlan)
+                    else row[plan]
+                )
+            result[name] = groups
+        return result
+
+    def serialize(self, rows):
+        many = self.load_many([row[self.pk] for row in rows])
+        data = []
+        for row in rows:
+            item = {}
+            for kind, name, options in self.plan:
+                if kind == 'value':
+                    column, convert = options
+                    value = row[column]
+                    if value is not None and convert is not None:
+                        value = convert(value)
+                elif kind == 'nested':
+                    column, plan = options
+                    value = None if row[column] is None else plan.build(row)
+                else:
+                    value = many[name].get(row[self.pk], [])
+                item[name] = value
+            data.append(item)
+        return data
+
+
+class FastListMixin:
+    """Отдаёт list через RowSerializer, когда это возможно."""
+
+    def get_row_serializer(self):
+        try:
+            return RowSerializer(self.get_serializer())
+        except UnsupportedField:
+            return None
+
+    def list(self, request, *args, **kwargs):
+        row_serializer = self.get_row_serializer()
+        if row_serializer is None:
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        # Колонки extra(select=...) (например, ранг поиска) и ключ
+        # сортировки курсора нужны для пагинации, даже если их нет среди
+        # выбранных полей.
+        columns = dict.fromkeys((
+            *row_serializer.columns,
+            *(field.lstrip('-') for field in getattr(
+                self, 'keyset_ordering', ()
+            )),
+            *queryset.query.extra_select,
+        ))
+        queryset = queryset.prefetch_related(None).values(*columns)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(
+                row_serializer.serialize(page)
+            )
+        return Response(row_serializer.serialize(list(queryset)))
@@ -1,19 +1,41 @@
+from django.db.models import Exists, OuterRef
 from django_filters import rest_framework as filters
+from rest_framework.filters import BaseFilterBackend
 
-from reviews.models import Title
+from reviews.models import GenreTitle, Title
+from reviews.search import search_titles
+
+
+class SlugInFilter(filters.BaseInFilter, filters.CharFilter):
+    """Точное совпадение со слагом или списком слагов: ?genre=rock,jazz."""
 
 
 class TitleFilter(filters.FilterSet):
     """Фильтрация по указанным полям произведения."""
 
     name = filters.CharFilter(field_name='name', lookup_expr='icontains')
-    category = filters.CharFilter(
-        field_name='category__slug', lookup_expr='icontains'
-    )
-    genre = filters.CharFilter(
-        field_name='genre__slug', lookup_expr='icontains'
-    )
+    category = SlugInFilter(field_name='category__slug', lookup_expr='in')
+    genre = SlugInFilter(method='filter_genre')
 
     class Meta:
         model = Title
         fields = ('year', 'genre', 'category', 'name')
+
+    def filter_genre(self, queryset, name, value):
+        # EXISTS вместо JOIN: произведение с несколькими подходящими
+        # жанрами не попадёт в выдачу дважды.
+        return queryset.filter(Exists(GenreTitle.objects.filter(
+            title=OuterRef('pk'), genre__slug__in=value
+        )))
+
+
+class TitleSearchFilter(BaseFilterBackend):
+    """Полнотекстовый поиск по названию и описанию: ?search=..."""
+
+    search_param = 'search'
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, '')
+        if not query.strip():
+            return queryset
+        return search_titles(queryset, query)
@@ -0,0 +1,68 @@
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError
+
+from api_yamdb.profiler import hottest_functions, load_profiles
+from api_yamdb.querybudget import fingerprint
+
+
+class Command(BaseCommand):
+    help = (
+        'Команда показывает самые медленные запросы, функции и SQL по '
+        'сохранённым профилям (api_yamdb.profiler)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path', default=getattr(settings, 'PROFILER_DIR', None),
+            help='Каталог с профилями.'
+        )
+        parser.add_argument(
+            '--view', help='Только профили вьюсета, например '
+            'TitleViewSet.list.'
+        )
+        parser.add_argument(
+            '--sort', choices=('self', 'total'), default='self',
+            help='Собственное время функции или вместе с вызванными.'
+        )
+        parser.add_argument('--limit', type=int, default=20)
+
+    def handle(self, *args, **options):
+        if not options['path']:
+            raise CommandError('Не задан каталог профилей (PROFILER_DIR).')
+        profiles = load_profiles(options['path'], options['view'])
+        if not profiles:
+            raise CommandError(f'Нет профилей в {options["path"]}')
+        limit = options['limit']
+        self.stdout.write(f'Профилей: {len(profiles)}')
+
+        self.stdout.write(self.style.MIGRATE_HEADING('Медленные запросы'))
+        slowest = sorted(
+            profiles, key=lambda profile: -profile['request']['duration_ms']
+        )
+        for profile in slowest[:min(limit, 10)]:
+            request = profile['request']
+            self.stdout.write(
+                f'{request["duration_ms"]:10.1f} мс  {request["method"]} '
+                f'{request["path"]} ({request["view"]}, '
+                f'{len(profile["sql"])} SQL)'
+            )
+
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f'Функции ({options["sort"]})'
+        ))
+        for label, value, seen in hottest_functions(
+            profiles, options['sort'], limit
+        ):
+            self.stdout.write(f'{value:10.1f} мс  {seen:5}  {label}')
+
+        self.stdout.write(self.style.MIGRATE_HEADING('SQL'))
+        queries = {}
+        for profile in profiles:
+            for query in profile['sql']:
+                key = fingerprint(query['sql'])
+                total, calls = queries.get(key, (0.0, 0))
+                queries[key] = (total + query['duration_ms'], calls + 1)
+        for sql, (total, calls) in sorted(
+            queries.items(), key=lambda item: -item[1][0]
+        )[:limit]:
+            self.stdout.write(f'{total:10.1f} мс  {calls:5}  {sql[:200]}')
@@ -0,0 +1,25 @@
+from rest_framework.negotiation import DefaultContentNegotiation
+
+
+def is_available(component):
+    check = getattr(component, 'is_available', None)
+    return check is None or check()
+
+
+class AvailableContentNegotiation(DefaultContentNegotiation):
+    """
+    Согласование формата, которое пропускает рендереры и парсеры без
+    установленной библиотеки (например, MessagePack без msgpack).
+    """
+
+    def select_parser(self, request, parsers):
+        return super().select_parser(
+            request, [parser for parser in parsers if is_available(parser)]
+        )
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return super().select_renderer(
+            request,
+            [renderer for renderer in renderers if is_available(renderer)],
+            format_suffix
+        )
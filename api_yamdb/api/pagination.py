@@ -0,0 +1,151 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import date, datetime
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class OptionalKeysetPagination(LimitOffsetPagination):
+    """
+    Пагинация limit/offset с курсорным (keyset) режимом по запросу.
+
+    По умолчанию ответ не меняется. С параметром `?pagination=cursor`
+    страницы выбираются условием по ключу сортировки вьюсета
+    (`keyset_ordering`) без COUNT(*) и OFFSET, а в ответе вместо `count`
+    приходят непрозрачные курсоры в ссылках `next` и `previous`.
+    """
+
+    mode_query_param = 'pagination'
+    mode_query_value = 'cursor'
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Некорректный курсор.'
+    keyset_template = 'rest_framework/pagination/previous_and_next.html'
+
+    def is_keyset_mode(self, request):
+        return (
+            request.query_params.get(self.mode_query_param)
+            == self.mode_query_value
+            or self.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.is_keyset_mode(request):
+            self.keyset = False
+            return super().paginate_queryset(queryset, request, view)
+        self.keyset = True
+        self.request = request
+        self.limit = self.get_limit(request) or self.default_limit
+        self.ordering = [
+            (field.lstrip('-'), field.startswith('-'))
+            for field in view.keyset_ordering
+        ]
+        self.model = queryset.model
+        position, reverse = self.decode_cursor(request)
+
+        ordering = [
+            (field, descending != reverse)
+            for field, descending in self.ordering
+        ]
+        queryset = queryset.order_by(*(
+            f'-{field}' if descending else field
+            for field, descending in ordering
+        ))
+        if position is not None:
+            queryset = queryset.filter(self.keyset_filter(ordering, position))
+        results = list(queryset[:self.limit + 1])
+        has_more = len(results) > self.limit
+        results = results[:self.limit]
+        if reverse:
+            results.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+        self.page = results
+        if self.template is not None:
+            self.template = self.keyset_template
+            self.display_page_controls = True
+        return results
+
+    def keyset_filter(self, ordering, position):
+        condition = Q()
+        equal = Q()
+        for (field, descending), value in zip(ordering, position):
+            lookup = 'lt' if descending else 'gt'
+            condition |= equal & Q(**{f'{field}__{lookup}': value})
+            equal &= Q(**{field: value})
+        return condition
+
+    def get_position(self, obj):
+        # Строки values() (см. api.fast) — словари.
+        if isinstance(obj, dict):
+            return [obj[field] for field, _ in self.ordering]
+        return [getattr(obj, field) for field, _ in self.ordering]
+
+    def encode_cursor(self, obj, reverse=False):
+        position = [
+            value.isoformat() if isinstance(value, (date, datetime))
+            else value
+            for value in self.get_position(obj)
+        ]
+        payload = json.dumps({'p': position, 'r': int(reverse)})
+        token = urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(
+            url, self.mode_query_param, self.mode_query_value
+        )
+        url = remove_query_param(url, self.offset_query_param)
+        return replace_query_param(url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None, False
+        try:
+            token += '=' * (-len(token) % 4)
+            payload = json.loads(urlsafe_b64decode(token.encode()))
+            position = payload['p']
+            if len(position) != len(self.ordering):
+                raise ValueError
+            position = [
+                self.model._meta.get_field(field).to_python(value)
+                for (field, _), value in zip(self.ordering, position)
+            ]
+            return position, bool(payload.get('r'))
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_next_link(self):
+        if not self.keyset:
+            return super().get_next_link()
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1])
+
+    def get_previous_link(self):
+        if not self.keyset:
+            return super().get_previous_link()
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_html_context(self):
+        if not self.keyset:
+            return super().get_html_context()
+        return {
+            'previous_url': self.get_previous_link(),
+            'next_url': self.get_next_link()
+        }
+
+    def get_paginated_response(self, data):
+        if not self.keyset:
+            return super().get_paginated_response(data)
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data
+        })
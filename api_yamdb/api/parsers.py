@@ -0,0 +1,74 @@
+"""Парсеры тел запросов: JSON через orjson, MessagePack и CBOR.
+
+Без orjson FastJSONParser работает как JSONParser DRF. Бинарные парсеры
+доступны, только если установлены msgpack и cbor2 (см. api.negotiation).
+"""
+import codecs
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+
+from api.renderers import (
+    CBORRenderer, FastJSONRenderer, MessagePackRenderer, cbor2, msgpack,
+    orjson
+)
+
+
+class FastJSONParser(JSONParser):
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None:
+            return super().parse(stream, media_type, parser_context)
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        data = stream.read()
+        if codecs.lookup(encoding).name != 'utf-8':
+            data = data.decode(encoding)
+        try:
+            # orjson, как и JSONParser со STRICT_JSON, не принимает NaN.
+            return orjson.loads(data)
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f'JSON parse error - {exc}')
+
+
+class BinaryParser(BaseParser):
+    """Базовый парсер бинарного формата."""
+
+    @classmethod
+    def is_available(cls):
+        return cls.renderer_class.is_available()
+
+    def get_errors(self):
+        return ValueError
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return self.loads(stream.read())
+        except self.get_errors() as exc:
+            raise ParseError(
+                f'{self.renderer_class.format} parse error - {exc}'
+            )
+
+
+class MessagePackParser(BinaryParser):
+    media_type = 'application/msgpack'
+    renderer_class = MessagePackRenderer
+
+    def get_errors(self):
+        return ValueError, TypeError, msgpack.UnpackException
+
+    def loads(self, data):
+        return msgpack.unpackb(data)
+
+
+class CBORParser(BinaryParser):
+    media_type = 'application/cbor'
+    renderer_class = CBORRenderer
+
+    def get_errors(self):
+        return ValueError, cbor2.CBORDecodeError
+
+    def loads(self, data):
+        return cbor2.loads(data)
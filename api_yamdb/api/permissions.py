@@ -20,7 +20,7 @@ class AdminModeratorAuthorPermission(permissions.IsAuthenticatedOrReadOnly):
             request.method in permissions.SAFE_METHODS
             or request.user.is_moderator
             or request.user.is_admin
-            or obj.author == request.user
+            or obj.author_id == request.user.id
         )
 
 
@@ -0,0 +1,117 @@
+"""Рендереры ответов: быстрый JSON и бинарные MessagePack и CBOR.
+
+FastJSONRenderer — JSON через orjson.
+Если orjson не установлен, а также для вывода с отступами (браузерный
+API, `Accept: application/json; indent=4`) и нестандартных настроек
+UNICODE_JSON/COMPACT_JSON используется обычный JSONRenderer DRF. Типы,
+которых orjson не знает (Decimal, ленивые строки, datetime), кодируются
+JSONEncoder из DRF, поэтому ответ совпадает с ответом стандартного
+рендерера. Отличие одно: NaN и Infinity orjson кодирует как null.
+
+MessagePackRenderer и CBORRenderer (Accept: application/msgpack,
+application/cbor) отдают ту же структуру данных, что и JSON: типы без
+аналога в JSON приводятся тем же JSONEncoder. Они доступны, только если
+установлены msgpack и cbor2 соответственно (см. api.negotiation).
+"""
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import cbor2
+except ImportError:
+    cbor2 = None
+
+# U+2028 и U+2029 экранируются, как в JSONRenderer, чтобы ответ оставался
+# корректным JavaScript.
+LINE_SEPARATORS = (
+    ('\u2028'.encode(), b'\\u2028'),
+    ('\u2029'.encode(), b'\\u2029'),
+)
+
+
+class FastJSONRenderer(JSONRenderer):
+
+    def __init__(self):
+        self.encoder = self.encoder_class()
+        if orjson is not None:
+            self.options = (
+                orjson.OPT_PASSTHROUGH_DATETIME
+                | orjson.OPT_NON_STR_KEYS
+            )
+
+    def is_accelerated(self, indent):
+        return (
+            orjson is not None
+            and indent is None
+            and not self.ensure_ascii
+            and self.compact
+        )
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if not self.is_accelerated(indent):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            result = orjson.dumps(
+                data, default=self.encoder.default, option=self.options
+            )
+        except orjson.JSONEncodeError:
+            # Например, целые больше 64 бит: их кодирует только json.
+            return super().render(data, accepted_media_type, renderer_context)
+        for separator, escaped in LINE_SEPARATORS:
+            if separator in result:
+                result = result.replace(separator, escaped)
+        return result
+
+
+class BinaryRenderer(BaseRenderer):
+    """Базовый рендерер бинарного формата со структурой данных JSON."""
+
+    charset = None
+    render_style = 'binary'
+    encoder_class = JSONRenderer.encoder_class
+    library = None
+
+    def __init__(self):
+        self.encoder = self.encoder_class()
+
+    @classmethod
+    def is_available(cls):
+        return cls.library is not None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return self.dumps(data)
+
+
+class MessagePackRenderer(BinaryRenderer):
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    library = msgpack
+
+    def dumps(self, data):
+        return msgpack.packb(data, default=self.encoder.default)
+
+
+class CBORRenderer(BinaryRenderer):
+    media_type = 'application/cbor'
+    format = 'cbor'
+    library = cbor2
+
+    def dumps(self, data):
+        return cbor2.dumps(data, default=self.encode_default)
+
+    def encode_default(self, encoder, value):
+        encoder.encode(self.encoder.default(value))
@@ -0,0 +1,64 @@
+"""Чтение с реплик БД для вьюсетов.
+
+Безопасные запросы (GET, HEAD, OPTIONS) выполняются на реплике. После
+успешного изменяющего запроса клиент на DATABASE_REPLICA_PIN_SECONDS
+секунд закрепляется за основной БД, чтобы сразу видеть свои изменения:
+ответ содержит cookie и заголовок X-Primary-Pin со временем окончания
+закрепления. Клиенты без cookie могут присылать этот заголовок сами.
+
+Значение подписано SECRET_KEY и не может заканчиваться позже чем через
+DATABASE_REPLICA_PIN_SECONDS секунд, поэтому клиент не может сам
+закрепиться за основной БД и нагружать её.
+"""
+from time import time
+
+from django.conf import settings
+from django.core.signing import BadSignature, Signer
+from rest_framework.permissions import SAFE_METHODS
+
+from api_yamdb.routers import replica_reads
+
+PIN_COOKIE = 'primary_pin'
+PIN_HEADER = 'X-Primary-Pin'
+PIN_SECONDS = getattr(settings, 'DATABASE_REPLICA_PIN_SECONDS', 10)
+
+signer = Signer(salt='api.replicas.primary_pin')
+
+
+def is_pinned(request):
+    value = request.COOKIES.get(PIN_COOKIE) or request.headers.get(
+        PIN_HEADER
+    )
+    if not value:
+        return False
+    try:
+        expires = int(signer.unsign(value))
+    except (BadSignature, ValueError):
+        return False
+    now = time()
+    return now < expires <= now + PIN_SECONDS
+
+
+def pin_to_primary(response):
+    value = signer.sign(str(int(time()) + PIN_SECONDS))
+    response.set_cookie(
+        PIN_COOKIE, value, max_age=PIN_SECONDS, httponly=True,
+        samesite='Lax'
+    )
+    response[PIN_HEADER] = value
+    return response
+
+
+class ReplicaReadMixin:
+    """Направляет чтение вьюсета на реплику, а запись — на основную БД."""
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in SAFE_METHODS:
+            response = super().dispatch(request, *args, **kwargs)
+            if response.status_code < 400:
+                pin_to_primary(response)
+            return response
+        if is_pinned(request):
+            return super().dispatch(request, *args, **kwargs)
+        with replica_reads():
+            return super().dispatch(request, *args, **kwargs)
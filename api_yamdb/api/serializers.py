@@ -1,13 +1,14 @@
-from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.tokens import default_token_generator
 from django.core.exceptions import ValidationError
-from django.core.mail import send_mail
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
+from django.db.models import prefetch_related_objects
 from django.shortcuts import get_object_or_404
 from rest_framework import serializers
 
+from api.sparse import SparseFieldsSerializerMixin
 from users.models import MAX_LEN_EMAIL, MAX_LEN_NAME
+from users.outbox import enqueue_mail
 from users.validators import username_validator
 from reviews.models import Category, Genre, Title, Comment, Review
 
@@ -30,16 +31,54 @@ class GenreSerializer(serializers.ModelSerializer):
         model = Genre
 
 
-class TitleReadSerializer(serializers.ModelSerializer):
+class SlugManyRelatedField(serializers.ManyRelatedField):
+    """Список слагов, который загружает все объекты одним запросом."""
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, '__iter__'):
+            self.fail('not_a_list', input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail('empty')
+        child = self.child_relation
+        if not all(isinstance(slug, str) for slug in data):
+            child.fail('invalid')
+        objects = {
+            getattr(obj, child.slug_field): obj
+            for obj in child.get_queryset().filter(
+                **{f'{child.slug_field}__in': data}
+            )
+        }
+        for slug in data:
+            if slug not in objects:
+                child.fail(
+                    'does_not_exist', slug_name=child.slug_field, value=slug
+                )
+        return [objects[slug] for slug in data]
+
+
+class TitleReadSerializer(
+    SparseFieldsSerializerMixin, serializers.ModelSerializer
+):
     """Сериализатор для чтения информации о произведении."""
 
     genre = GenreSerializer(read_only=True, many=True)
     category = CategorySerializer(read_only=True)
-    rating = serializers.IntegerField(read_only=True, default=None)
+    compact_fields = {
+        'genre': lambda: serializers.SlugRelatedField(
+            slug_field='slug', many=True, read_only=True
+        ),
+        'category': lambda: serializers.SlugRelatedField(
+            slug_field='slug', read_only=True
+        ),
+    }
+    review_count = serializers.IntegerField(
+        source='rating_count', read_only=True
+    )
 
     class Meta:
         fields = (
-            'id', 'name', 'year', 'rating', 'description', 'genre', 'category'
+            'id', 'name', 'year', 'rating', 'review_count', 'description',
+            'genre', 'category'
         )
         model = Title
 
@@ -47,8 +86,10 @@ class TitleReadSerializer(serializers.ModelSerializer):
 class TitleWriteSerializer(serializers.ModelSerializer):
     """Сериализатор для записи информации о произведении."""
 
-    genre = serializers.SlugRelatedField(
-        slug_field='slug', queryset=Genre.objects.all(), many=True,
+    genre = SlugManyRelatedField(
+        child_relation=serializers.SlugRelatedField(
+            slug_field='slug', queryset=Genre.objects.all()
+        ),
         allow_null=False, allow_empty=False
     )
     category = serializers.SlugRelatedField(
@@ -60,11 +101,16 @@ class TitleWriteSerializer(serializers.ModelSerializer):
         model = Title
 
     def to_representation(self, instance):
+        # После create()/update() кэш жанров сброшен: загружаем их одним
+        # запросом, как это делает prefetch_related во вьюсете.
+        prefetch_related_objects([instance], 'genre')
         serializer = TitleReadSerializer(instance)
         return serializer.data
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(
+    SparseFieldsSerializerMixin, serializers.ModelSerializer
+):
     """Сериализатор для модели комментарии."""
 
     author = serializers.SlugRelatedField(
@@ -77,7 +123,9 @@ class CommentSerializer(serializers.ModelSerializer):
         model = Comment
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(
+    SparseFieldsSerializerMixin, serializers.ModelSerializer
+):
     """Сериализатор для модели отзывы."""
 
     author = serializers.SlugRelatedField(
@@ -85,17 +133,6 @@ class ReviewSerializer(serializers.ModelSerializer):
         read_only=True
     )
 
-    def validate(self, data):
-        if not self.context.get('request').method == 'POST':
-            return data
-        author = self.context.get('request').user
-        title_id = self.context.get('view').kwargs.get('title_id')
-        if Review.objects.filter(author=author, title=title_id).exists():
-            raise serializers.ValidationError(
-                'Вы уже оставляли отзыв на это произведение'
-            )
-        return data
-
     class Meta:
         exclude = ('title',)
         model = Review
@@ -125,18 +162,20 @@ class SignUpSerializer(serializers.Serializer):
         username = validated_data.get('username')
         email = validated_data.get('email')
         try:
-            user, create = User.objects.get_or_create(**validated_data)
+            with transaction.atomic():
+                user, create = User.objects.get_or_create(**validated_data)
+                confirmation_code = default_token_generator.make_token(user)
+                # Письмо уходит через очередь: запрос не ждёт почтовый сервер.
+                enqueue_mail(
+                    subject='Регистрация на сайте api_yamdb',
+                    message=f'Проверочный код: {confirmation_code}',
+                    recipient_list=[email]
+                )
         except IntegrityError:
             raise serializers.ValidationError(
                 {'detail': f'пользователь с именем "{username}" '
                  f'или почтой "{email}" уже существует'}
             )
-        confirmation_code = default_token_generator.make_token(user)
-        send_mail(subject='Регистрация на сайте api_yamdb',
-                  message=f'Проверочный код: {confirmation_code}',
-                  from_email=settings.DEFAULT_FROM_EMAIL,
-                  recipient_list=[email],
-                  fail_silently=True, )
         return user
 
 
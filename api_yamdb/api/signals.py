@@ -0,0 +1,34 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from api.authentication import user_states
+from api.cache import CACHE_DEPENDENCIES, invalidate_models
+from reviews.models import Title
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def reset_user_state(sender, instance, **kwargs):
+    user_states.invalidate(instance.pk)
+
+
+def reset_response_cache(sender, using=None, **kwargs):
+    # Поколение меняется только после фиксации: иначе параллельный запрос
+    # успел бы прочитать старые строки и закэшировать их под новым
+    # поколением.
+    transaction.on_commit(lambda: invalidate_models(sender), using=using)
+
+
+for model in CACHE_DEPENDENCIES:
+    post_save.connect(reset_response_cache, sender=model)
+    post_delete.connect(reset_response_cache, sender=model)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def reset_title_genres_cache(sender, action, using=None, **kwargs):
+    if action.startswith('post_'):
+        transaction.on_commit(lambda: invalidate_models(Title), using=using)
@@ -0,0 +1,129 @@
+"""Выборочные поля ответа: ?fields=id,name,rating и ?expand=genre.
+
+Без `fields` ответ не меняется (`expand` без `fields` ничего не
+сворачивает). С `fields` в ответе остаются только перечисленные поля, а
+связанные объекты вместо вложенных словарей отдаются слагами, если их нет
+в `expand`. Запрос к БД строится по
+итоговому набору полей сериализатора: только нужные колонки (only()),
+select_related и prefetch_related — только для запрошенных связей.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+
+
+class SparseFieldsSerializerMixin:
+    """
+    Сериализатор, который оставляет поля из context['fields'] и сворачивает
+    связи из compact_fields, не указанные в context['expand']. Без
+    context['fields'] сериализатор не меняется.
+    """
+
+    # Поле -> фабрика компактного представления связи.
+    compact_fields = {}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fields = self.context.get('fields')
+        expand = self.context.get('expand')
+        if fields is None:
+            # expand только добавляет подробности к сокращённому ответу.
+            return
+        for name in set(self.fields) - set(fields):
+            self.fields.pop(name)
+        for name, compact in self.compact_fields.items():
+            if name in self.fields and name not in (expand or ()):
+                self.fields[name] = compact()
+
+
+class SparseFieldsetMixin:
+    """Разбирает ?fields= и ?expand= и сужает queryset list/retrieve."""
+
+    fields_param = 'fields'
+    expand_param = 'expand'
+
+    def get_param_values(self, param):
+        value = self.request.query_params.get(param)
+        if value is None:
+            return None
+        return [name.strip() for name in value.split(',') if name.strip()]
+
+    def get_sparse_params(self):
+        """Возвращает (fields, expand); оба None — обычный ответ."""
+        if self.action not in ('list', 'retrieve'):
+            return None, None
+        if not hasattr(self, '_sparse_params'):
+            fields = self.get_param_values(self.fields_param)
+            expand = self.get_param_values(self.expand_param)
+            serializer_class = self.get_serializer_class()
+            errors = {}
+            if fields == []:
+                errors[self.fields_param] = 'Укажите хотя бы одно поле.'
+            elif fields is not None:
+                unknown = set(fields) - set(serializer_class().fields)
+                if unknown:
+                    errors[self.fields_param] = (
+                        f'Неизвестные поля: {", ".join(sorted(unknown))}'
+                    )
+            if expand is not None:
+                compact = getattr(serializer_class, 'compact_fields', {})
+                unknown = set(expand) - set(compact)
+                if unknown:
+                    errors[self.expand_param] = (
+                        'Нельзя раскрыть поля: '
+                        f'{", ".join(sorted(unknown))}'
+                    )
+            if errors:
+                raise ValidationError(errors)
+            self._sparse_params = fields, expand
+        return self._sparse_params
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['fields'], context['expand'] = self.get_sparse_params()
+        return context
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        fields, _ = self.get_sparse_params()
+        if fields is None:
+            return queryset
+        return self.prune_queryset(queryset, self.get_serializer().fields)
+
+    def prune_queryset(self, queryset, fields):
+        opts = queryset.model._meta
+        only = {opts.pk.name}
+        only.update(
+            field.lstrip('-') for field in getattr(self, 'keyset_ordering', ())
+        )
+        select_related, prefetch_related = set(), set()
+        for field in fields.values():
+            try:
+                model_field = opts.get_field(field.source.split('.')[0])
+            except FieldDoesNotExist:
+                # Вычисляемое поле: неизвестно, какие колонки ему нужны.
+                return queryset
+            name = model_field.name
+            if model_field.many_to_many or model_field.one_to_many:
+                prefetch_related.add(name)
+            elif not model_field.is_relation:
+                only.add(name)
+            elif isinstance(field, serializers.SlugRelatedField):
+                select_related.add(name)
+                only.update((name, f'{name}__{field.slug_field}'))
+            elif isinstance(field, serializers.BaseSerializer):
+                select_related.add(name)
+                only.add(name)
+                only.update(
+                    f'{name}__{child.source}'
+                    for child in field.fields.values()
+                )
+            else:
+                only.add(name)
+        queryset = queryset.select_related(None).prefetch_related(
+            None
+        ).only(*only).prefetch_related(*prefetch_related)
+        if select_related:
+            # select_related() без аргументов выбрал бы все связи.
+            queryset = queryset.select_related(*select_related)
+        return queryset
@@ -0,0 +1,15 @@
+from rest_framework_simplejwt.tokens import AccessToken
+
+# Поля пользователя, которых достаточно для проверки прав в api.permissions.
+USER_CLAIMS = ('username', 'role', 'is_staff', 'is_superuser', 'is_active')
+
+
+class ClaimsAccessToken(AccessToken):
+    """Access-токен, который несёт в себе роль и флаги пользователя."""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        for claim in USER_CLAIMS:
+            token[claim] = getattr(user, claim)
+        return token
@@ -1,9 +1,9 @@
-from django.urls import include, path
+from django.urls import include, path, re_path
 from rest_framework.routers import DefaultRouter
 
 from api.views import (TitleViewSet, GenreViewSet, CategoryViewSet,
                        ReviewViewSet, CommentViewSet, UserViewSet,
-                       get_token, signup)
+                       ExportView, get_token, signup)
 
 app_name = 'api'
 
@@ -28,4 +28,8 @@ urlpatterns = [
     path('v1/', include(router_v_1.urls)),
     path('v1/auth/signup/', signup, name='signup'),
     path('v1/auth/token/', get_token, name='get_token'),
+    re_path(
+        r'^v1/export/(?P<resource>\w+)\.(?P<export_format>csv|ndjson)$',
+        ExportView.as_view(), name='export'
+    ),
 ]
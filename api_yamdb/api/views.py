@@ -1,16 +1,30 @@
+from time import time
+
 from django_filters.rest_framework import DjangoFilterBackend
 from django.contrib.auth import get_user_model
-from django.db.models import Avg
+from django.db import IntegrityError, router
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action, api_view, permission_classes
-from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import AccessToken
+from rest_framework.settings import api_settings
+from rest_framework.views import APIView
 
-from api.baseviews import CategoryGenreBaseViewSet
-from api.filters import TitleFilter
+from api.baseviews import CategoryGenreBaseViewSet, NestedResourceMixin
+from api.cache import (
+    CACHE_TIMEOUT, CachedDetailResponseMixin, get_generation
+)
+from api.conditional import ConditionalGetMixin
+from api.export import CONTENT_TYPES, EXPORTS, stream_export
+from api.fast import FastListMixin
+from api.filters import TitleFilter, TitleSearchFilter
+from api.pagination import OptionalKeysetPagination
+from api.replicas import ReplicaReadMixin
+from api.sparse import SparseFieldsetMixin
+from api.tokens import ClaimsAccessToken
 from api.permissions import (
     IsAdminOrReadOnly, AdminModeratorAuthorPermission, AdminOnly
 )
@@ -19,22 +33,42 @@ from api.serializers import (
     GenreSerializer, SignUpSerializer, TokenSerializer,
     UserSerializer, TitleReadSerializer, TitleWriteSerializer
 )
-from reviews.models import Title, Category, Genre, Review
+from reviews.models import Title, Category, Comment, Genre, Review
 
 User = get_user_model()
 
 
-class TitleViewSet(viewsets.ModelViewSet):
+def get_title_version(title):
+    """Версия отзывов и комментариев произведения для ETag."""
+    return f'{title.pk}:{title.changed_at.isoformat()}', title.changed_at
+
+
+class TitleViewSet(
+    ReplicaReadMixin, ConditionalGetMixin, CachedDetailResponseMixin,
+    SparseFieldsetMixin, FastListMixin, viewsets.ModelViewSet
+):
     """Вьюсет для модели Title."""
 
     http_method_names = ('get', 'post', 'patch', 'delete')
-    queryset = Title.objects.annotate(
-        rating=Avg('reviews__score')
-    ).all().order_by('name')
-    pagination_class = LimitOffsetPagination
-    filter_backends = (DjangoFilterBackend,)
+    queryset = Title.objects.select_related(
+        'category'
+    ).prefetch_related('genre').order_by('name')
+    pagination_class = OptionalKeysetPagination
+    keyset_ordering = ('name', 'id')
+    filter_backends = (DjangoFilterBackend, TitleSearchFilter)
     permission_classes = (IsAdminOrReadOnly,)
     filterset_class = TitleFilter
+    cache_namespace = 'titles'
+    # Наибольшее число запросов к БД (api_yamdb.querybudget).
+    query_budget = {'list': 4, 'retrieve': 3}
+
+    def get_resource_version(self):
+        # Кэш в памяти не видит изменений из других процессов, поэтому
+        # ETag, как и закэшированный ответ, живёт не дольше его таймаута.
+        return (
+            f'{get_generation(self.cache_namespace)}:'
+            f'{int(time() // CACHE_TIMEOUT)}'
+        ), None
 
     def get_serializer_class(self):
         if self.action in ('list', 'retrieve'):
@@ -47,6 +81,7 @@ class CategoryViewSet(CategoryGenreBaseViewSet):
 
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
+    cache_namespace = 'categories'
 
 
 class GenreViewSet(CategoryGenreBaseViewSet):
@@ -54,50 +89,86 @@ class GenreViewSet(CategoryGenreBaseViewSet):
 
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
+    cache_namespace = 'genres'
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(
+    ReplicaReadMixin, ConditionalGetMixin, NestedResourceMixin,
+    SparseFieldsetMixin, FastListMixin, viewsets.ModelViewSet
+):
     """Вьюсет для модели Comment."""
 
     serializer_class = CommentSerializer
     http_method_names = ('get', 'post', 'patch', 'delete')
     permission_classes = (AdminModeratorAuthorPermission,)
-
-    def get_review(self):
-        review_id = self.kwargs.get('review_id')
-        title_id = self.kwargs.get('title_id')
-        return get_object_or_404(Review, pk=review_id, title_id=title_id)
+    pagination_class = OptionalKeysetPagination
+    keyset_ordering = ('-pub_date', 'id')
+    parent_queryset = Review.objects.select_related('title').only(
+        'id', 'title__id', 'title__changed_at'
+    )
+    parent_lookups = {'pk': 'review_id', 'title_id': 'title_id'}
+    query_budget = {'list': 4, 'retrieve': 3}
 
     def get_queryset(self):
-        return self.get_review().comments.all()
+        return Comment.objects.filter(
+            review_id=self.kwargs.get('review_id'),
+            review__title_id=self.kwargs.get('title_id')
+        ).select_related('author').only(
+            'id', 'text', 'pub_date', 'review', 'author__username'
+        )
+
+    def get_resource_version(self):
+        return get_title_version(self.get_parent().title)
 
     def perform_create(self, serializer):
         serializer.save(
             author=self.request.user,
-            review=self.get_review()
+            review=self.get_parent()
         )
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(
+    ReplicaReadMixin, ConditionalGetMixin, NestedResourceMixin,
+    SparseFieldsetMixin, FastListMixin, viewsets.ModelViewSet
+):
     """Вьюсет для модели Review."""
 
     serializer_class = ReviewSerializer
     http_method_names = ('get', 'post', 'patch', 'delete')
     permission_classes = (AdminModeratorAuthorPermission,)
-
-    def get_title(self):
-        title_id = self.kwargs.get('title_id')
-        return get_object_or_404(Title, pk=title_id)
+    pagination_class = OptionalKeysetPagination
+    keyset_ordering = ('pub_date', 'id')
+    parent_queryset = Title.objects.only('id', 'changed_at')
+    parent_lookups = {'pk': 'title_id'}
+    query_budget = {'list': 4, 'retrieve': 3}
 
     def get_queryset(self):
-        return self.get_title().reviews.all()
+        return Review.objects.filter(
+            title_id=self.kwargs.get('title_id')
+        ).select_related('author').only(
+            'id', 'text', 'score', 'pub_date', 'comment_count', 'title',
+            'author__username'
+        )
 
-    def perform_create(self, serializer):
+    def get_resource_version(self):
+        return get_title_version(self.get_parent())
 
-        serializer.save(
-            author=self.request.user,
-            title=self.get_title()
-        )
+    def perform_create(self, serializer):
+        title = self.get_parent()
+        try:
+            serializer.save(author=self.request.user, title=title)
+        except IntegrityError:
+            # Повторный отзыв отсекает ограничение `unique review`;
+            # Review.save() откатывает свою точку сохранения сам.
+            if Review.objects.filter(
+                title=title, author=self.request.user
+            ).exists():
+                raise ValidationError({
+                    api_settings.NON_FIELD_ERRORS_KEY: [
+                        'Вы уже оставляли отзыв на это произведение'
+                    ]
+                })
+            raise
 
 
 class UserViewSet(viewsets.ModelViewSet):
@@ -110,6 +181,9 @@ class UserViewSet(viewsets.ModelViewSet):
     filter_backends = (filters.SearchFilter,)
     search_fields = ('username',)
     lookup_field = 'username'
+    # При смене имени update_user обновляет changed_at произведений
+    # с отзывами и комментариями пользователя.
+    query_budget = {'list': 4, 'retrieve': 3, 'update_user': 4}
 
     @action(
         methods=['get', 'patch'],
@@ -147,5 +221,38 @@ def get_token(request):
     user = get_object_or_404(
         User, username=serializer.validated_data.get('username')
     )
-    token = AccessToken.for_user(user)
+    token = ClaimsAccessToken.for_user(user)
     return Response({'token': str(token)}, status=status.HTTP_200_OK)
+
+
+class ExportView(ReplicaReadMixin, APIView):
+    """Потоковая выгрузка ресурса в CSV или NDJSON для администратора."""
+
+    permission_classes = (AdminOnly,)
+
+    def perform_content_negotiation(self, request, force=False):
+        # Формат выгрузки задан в URL; Accept влияет только на ошибки.
+        return super().perform_content_negotiation(request, force=True)
+
+    def get(self, request, resource, export_format):
+        if resource not in EXPORTS:
+            raise NotFound(f'Неизвестный ресурс: {resource}')
+        compress = request.query_params.get('compress')
+        if compress not in (None, 'gzip'):
+            raise ValidationError({'compress': 'Поддерживается только gzip'})
+        model, _ = EXPORTS[resource]
+        # Ответ читается уже после выхода из dispatch, поэтому БД
+        # выбирается сейчас, пока действует маршрутизация на реплику.
+        response = StreamingHttpResponse(
+            stream_export(
+                resource, export_format, using=router.db_for_read(model),
+                compress=compress == 'gzip'
+            ),
+            content_type=CONTENT_TYPES[export_format]
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="{resource}.{export_format}"'
+        )
+        if compress:
+            response['Content-Encoding'] = compress
+        return response
@@ -0,0 +1,36 @@
+"""Настройка соединений с БД.
+
+SQLite: на каждом новом соединении выполняются PRAGMA из SQLITE_PRAGMAS.
+Постоянные соединения (CONN_MAX_AGE > 0): в начале запроса проверяется,
+что соединение живо, и разорванное закрывается — Django откроет новое
+при первом запросе к БД вместо ошибки посреди обработки.
+"""
+from django.conf import settings
+from django.core.signals import request_started
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+
+@receiver(connection_created)
+def configure_sqlite(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite':
+        return
+    pragmas = getattr(settings, 'SQLITE_PRAGMAS', {})
+    # Напрямую через соединение DB-API: служебные запросы не должны
+    # попадать в execute_wrapper и счётчики запросов к БД.
+    for name, value in pragmas.items():
+        connection.connection.execute(f'PRAGMA {name} = {value}')
+
+
+@receiver(request_started)
+def check_connections(**kwargs):
+    if not getattr(settings, 'DATABASE_HEALTH_CHECKS', False):
+        return
+    for connection in connections.all():
+        if (
+            connection.connection is not None
+            and not connection.in_atomic_block
+            and not connection.is_usable()
+        ):
+            connection.close()
@@ -0,0 +1,370 @@
+"""Метрики сервиса в текстовом формате Prometheus.
+
+Счётчики и гистограммы хранятся в памяти процесса (registry). Чтобы
+работать под WSGI-сервером с несколькими процессами, каждый процесс не
+чаще раза в METRICS_FLUSH_INTERVAL секунд записывает свои значения в файл
+METRICS_DIR/<pid>.json, а /metrics складывает файлы всех процессов.
+Значения других процессов поэтому отстают не больше чем на этот интервал.
+Файлы завершившихся процессов переносятся в METRICS_DIR/aggregate.json,
+поэтому счётчики не уменьшаются при перезапуске воркеров. Без METRICS_DIR
+учитывается только текущий процесс.
+
+Метрики запросов помечаются вьюсетом и действием DRF
+(`TitleViewSet.list`), число запросов к БД берётся из
+api_yamdb.querybudget. Доля попаданий в кэш ответов и глубина очереди
+писем вычисляются при чтении /metrics.
+"""
+import json
+import os
+import threading
+from collections import defaultdict
+from hmac import compare_digest
+from pathlib import Path
+from time import monotonic, perf_counter
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+from django.conf import settings
+from django.db.models import Count
+from django.http import Http404, HttpResponse, HttpResponseForbidden
+
+METRICS_DIR = getattr(settings, 'METRICS_DIR', None)
+FLUSH_INTERVAL = getattr(settings, 'METRICS_FLUSH_INTERVAL', 5)
+METRICS_TOKEN = getattr(settings, 'METRICS_TOKEN', None)
+
+AGGREGATE_NAME = 'aggregate'
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Имя -> (тип, описание).
+METRICS = {
+    'http_requests_total': (
+        'counter', 'HTTP requests by view, method and status.'
+    ),
+    'http_request_duration_seconds': (
+        'histogram', 'HTTP request latency by view.'
+    ),
+    'db_queries_total': ('counter', 'Database queries by view.'),
+    'db_query_duration_seconds_total': (
+        'counter', 'Time spent in database queries by view.'
+    ),
+    'api_cache_requests_total': (
+        'counter', 'Response cache lookups by namespace and result.'
+    ),
+    'api_cache_hit_ratio': (
+        'gauge', 'Share of response cache lookups that were hits.'
+    ),
+    'mail_outbox_messages': ('gauge', 'Outgoing emails by status.'),
+}
+
+
+class Registry:
+    """Счётчики и гистограммы процесса."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.pid = os.getpid()
+        self.counters = defaultdict(float)
+        # (имя, метки) -> [счётчики корзин..., сумма, количество]
+        self.histograms = {}
+        self.flushed_at = monotonic()
+
+    def check_fork(self):
+        # После fork дочерний процесс не должен повторно отдавать
+        # значения родителя под своим pid.
+        if self.pid != os.getpid():
+            self.reset()
+
+    def inc(self, name, labels, value=1):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.check_fork()
+            self.counters[key] += value
+
+    def observe(self, name, labels, value):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.check_fork()
+            histogram = self.histograms.setdefault(
+                key, [0] * len(BUCKETS) + [0.0, 0]
+            )
+            for index, bound in enumerate(BUCKETS):
+                if value <= bound:
+                    histogram[index] += 1
+            histogram[-2] += value
+            histogram[-1] += 1
+
+    def snapshot(self):
+        with self.lock:
+            self.check_fork()
+            return {
+                'counters': [
+                    [name, list(labels), value]
+                    for (name, labels), value in self.counters.items()
+                ],
+                'histograms': [
+                    [name, list(labels), list(values)]
+                    for (name, labels), values in self.histograms.items()
+                ],
+            }
+
+    def flush(self, directory=None, force=False):
+        """Записывает значения процесса в файл, если пришло время."""
+        directory = directory or METRICS_DIR
+        if directory is None:
+            return
+        if not force and monotonic() - self.flushed_at < FLUSH_INTERVAL:
+            return
+        self.flushed_at = monotonic()
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        write_snapshot(directory / f'{os.getpid()}.json', self.snapshot())
+
+
+registry = Registry()
+
+
+def is_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def read_snapshot(path):
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        # Файл процесса удалён или повреждён — пропускаем.
+        return None
+
+
+def write_snapshot(path, snapshot):
+    temporary = path.with_suffix('.tmp')
+    temporary.write_text(json.dumps(snapshot))
+    # Читатель видит либо старый, либо новый файл целиком.
+    os.replace(temporary, path)
+
+
+def fold_dead(directory, paths):
+    """Переносит значения завершившихся процессов в aggregate.json.
+
+    Счётчики и гистограммы должны только расти: если просто удалить файл
+    процесса, Prometheus увидит сброс счётчика и rate() исказится.
+    """
+    with open(directory / f'{AGGREGATE_NAME}.lock', 'w') as lock:
+        if fcntl is not None:
+            # Файлы может переносить одновременно несколько процессов.
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        aggregate_path = directory / f'{AGGREGATE_NAME}.json'
+        snapshots = [read_snapshot(aggregate_path)]
+        dead = [path for path in paths if path.exists()]
+        snapshots.extend(read_snapshot(path) for path in dead)
+        if dead:
+            counters, histograms = merge(filter(None, snapshots))
+            write_snapshot(aggregate_path, {
+                'counters': [
+                    [name, list(labels), value]
+                    for (name, labels), value in counters.items()
+                ],
+                'histograms': [
+                    [name, list(labels), values]
+                    for (name, labels), values in histograms.items()
+                ],
+            })
+            for path in dead:
+                path.unlink(missing_ok=True)
+
+
+def collect(directory=None):
+    """Сумма значений всех процессов: (счётчики, гистограммы)."""
+    directory = directory or METRICS_DIR
+    snapshots = []
+    if directory is not None:
+        registry.flush(directory, force=True)
+        directory = Path(directory)
+        dead = [
+            path for path in directory.glob('*.json')
+            if path.stem.isdigit() and not is_alive(int(path.stem))
+        ]
+        if dead:
+            fold_dead(directory, dead)
+        for path in directory.glob('*.json'):
+            snapshots.append(read_snapshot(path))
+    else:
+        snapshots.append(registry.snapshot())
+    return merge(filter(None, snapshots))
+
+
+def merge(snapshots):
+    counters = defaultdict(float)
+    histograms = {}
+    for snapshot in snapshots:
+        for name, labels, value in snapshot['counters']:
+            counters[(name, tuple(map(tuple, labels)))] += value
+        for name, labels, values in snapshot['histograms']:
+            key = (name, tuple(map(tuple, labels)))
+            if key in histograms:
+                histograms[key] = [
+                    old + new for old, new in zip(histograms[key], values)
+                ]
+            else:
+                histograms[key] = values
+    return counters, histograms
+
+
+def cache_hit_ratios(counters):
+    lookups = defaultdict(lambda: {'hit': 0, 'miss': 0})
+    for (name, labels), value in counters.items():
+        if name == 'api_cache_requests_total':
+            labels = dict(labels)
+            lookups[labels['namespace']][labels['result']] += value
+    return {
+        (('namespace', namespace),): results['hit'] / (
+            results['hit'] + results['miss']
+        )
+        for namespace, results in lookups.items()
+        if results['hit'] + results['miss']
+    }
+
+
+def outbox_depth():
+    from users.models import OutgoingEmail
+
+    Status = OutgoingEmail.Status
+    depth = {
+        status: 0 for status in (Status.PENDING, Status.SENDING, Status.FAILED)
+    }
+    depth.update(
+        OutgoingEmail.objects.filter(status__in=list(depth)).values_list(
+            'status'
+        ).annotate(count=Count('id')).order_by()
+    )
+    return {
+        (('status', str(status)),): count for status, count in depth.items()
+    }
+
+
+def format_labels(labels):
+    if not labels:
+        return ''
+    escaped = (
+        (name, str(value).replace('\\', r'\\').replace('"', r'\"').replace(
+            '\n', r'\n'
+        ))
+        for name, value in labels
+    )
+    return '{' + ','.join(f'{name}="{value}"' for name, value in escaped) + '}'
+
+
+def format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render(counters, histograms, gauges):
+    """Текстовый формат Prometheus 0.0.4."""
+    series = defaultdict(list)
+    for (name, labels), value in sorted(counters.items()):
+        series[name].append(f'{name}{format_labels(labels)} '
+                            f'{format_value(value)}')
+    for (name, labels), values in sorted(histograms.items()):
+        for bound, count in zip(BUCKETS, values):
+            series[name].append(
+                f'{name}_bucket{format_labels(labels + (("le", bound),))} '
+                f'{count}'
+            )
+        series[name].append(
+            f'{name}_bucket{format_labels(labels + (("le", "+Inf"),))} '
+            f'{values[-1]}'
+        )
+        series[name].append(
+            f'{name}_sum{format_labels(labels)} {format_value(values[-2])}'
+        )
+        series[name].append(f'{name}_count{format_labels(labels)} '
+                            f'{values[-1]}')
+    for name, values in gauges.items():
+        for labels, value in sorted(values.items()):
+            series[name].append(f'{name}{format_labels(labels)} '
+                                f'{format_value(value)}')
+    lines = []
+    for name, (kind, help_text) in METRICS.items():
+        if name not in series:
+            continue
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        lines.extend(series[name])
+    return '\n'.join(lines) + '\n'
+
+
+def metrics_view(request):
+    if not METRICS_TOKEN:
+        # Без токена метрики открыты только при отладке: в них пути,
+        # имена вьюсетов и объём очереди писем.
+        if not settings.DEBUG:
+            raise Http404
+    elif not compare_digest(
+        request.headers.get('Authorization', '').encode(),
+        f'Bearer {METRICS_TOKEN}'.encode()
+    ):
+        return HttpResponseForbidden()
+    counters, histograms = collect()
+    gauges = {
+        'api_cache_hit_ratio': cache_hit_ratios(counters),
+        'mail_outbox_messages': outbox_depth(),
+    }
+    return HttpResponse(
+        render(counters, histograms, gauges), content_type=CONTENT_TYPE
+    )
+
+
+def get_view_name(view_func, action=None):
+    view_class = getattr(view_func, 'cls', None)
+    if view_class is None:
+        return getattr(view_func, '__name__', 'unknown')
+    return '.'.join(filter(None, (view_class.__name__, action)))
+
+
+class MetricsMiddleware:
+    """Время, статус и запросы к БД каждого HTTP-запроса."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started = perf_counter()
+        response = self.get_response(request)
+        elapsed = perf_counter() - started
+        view = getattr(request, 'metrics_view', 'unmatched')
+        if view == 'metrics_view':
+            return response
+        registry.inc('http_requests_total', {
+            'view': view, 'method': request.method,
+            'status': str(response.status_code),
+        })
+        registry.observe(
+            'http_request_duration_seconds', {'view': view}, elapsed
+        )
+        stats = getattr(request, 'query_stats', None)
+        if stats is not None:
+            registry.inc('db_queries_total', {'view': view}, stats.count)
+            registry.inc(
+                'db_query_duration_seconds_total', {'view': view},
+                stats.duration
+            )
+        registry.flush()
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        actions = getattr(view_func, 'actions', None) or {}
+        request.metrics_view = get_view_name(
+            view_func, actions.get(request.method.lower())
+        )
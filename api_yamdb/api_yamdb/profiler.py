@@ -0,0 +1,287 @@
+"""Профилирование медленных запросов.
+
+ProfilerMiddleware включается настройкой PROFILER_ENABLED. Профиль
+сохраняется для запросов дольше PROFILER_THRESHOLD_MS и для каждого
+PROFILER_SAMPLE_RATE-го запроса (0 — без выборки) в каталог PROFILER_DIR;
+там хранятся не больше PROFILER_MAX_FILES последних профилей.
+
+Бэкенды (PROFILER_BACKEND):
+
+- `sampling` — фоновый поток раз в PROFILER_INTERVAL_MS снимает стеки
+  потоков, которые обрабатывают запросы. Накладные расходы малы, поэтому
+  профилируется каждый запрос, а сохраняются только медленные и выбранные.
+- `cprofile` — точный cProfile, но заметно замедляет запрос, поэтому
+  включается только для выбранных запросов (нужен PROFILER_SAMPLE_RATE).
+
+Профиль — JSON с данными запроса, списком SQL с временем и функциями
+(собственное и полное время, мс); у sampling также свёрнутые стеки для
+flamegraph. Самые затратные функции по всем профилям показывает команда
+`python manage.py profile_summary`.
+"""
+import json
+import os
+import sys
+import threading
+from collections import Counter, defaultdict
+from contextlib import ExitStack
+from datetime import datetime, timezone
+from itertools import count
+from pathlib import Path
+from time import perf_counter, sleep
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from api_yamdb.metrics import get_view_name
+
+BACKENDS = ('sampling', 'cprofile')
+MAX_SQL = 500
+
+
+def short_path(filename):
+    """Путь к файлу относительно каталога из sys.path."""
+    for path in sorted(sys.path, key=len, reverse=True):
+        if path and filename.startswith(path + os.sep):
+            return filename[len(path) + 1:]
+    return filename
+
+
+def frame_label(code):
+    return (
+        f'{code.co_name} ({short_path(code.co_filename)}:'
+        f'{code.co_firstlineno})'
+    )
+
+
+class Sampler:
+    """Снимает стеки зарегистрированных потоков раз в interval секунд."""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.active = {}
+        self.pid = None
+
+    def ensure_running(self):
+        # После fork поток-сэмплер остаётся только в родителе.
+        if self.pid != os.getpid():
+            self.pid = os.getpid()
+            threading.Thread(
+                target=self.run, name='profiler-sampler', daemon=True
+            ).start()
+
+    def start(self, ident):
+        with self.lock:
+            self.ensure_running()
+            self.active[ident] = Counter()
+
+    def stop(self, ident):
+        with self.lock:
+            return self.active.pop(ident, Counter())
+
+    def run(self):
+        own = threading.get_ident()
+        while True:
+            sleep(self.interval)
+            with self.lock:
+                idents = [ident for ident in self.active if ident != own]
+            if not idents:
+                continue
+            frames = sys._current_frames()
+            for ident in idents:
+                frame = frames.get(ident)
+                stack = []
+                while frame is not None:
+                    stack.append(frame_label(frame.f_code))
+                    frame = frame.f_back
+                if not stack:
+                    continue
+                with self.lock:
+                    if ident in self.active:
+                        self.active[ident][tuple(reversed(stack))] += 1
+
+
+_samplers = {}
+_samplers_lock = threading.Lock()
+
+
+def get_sampler(interval):
+    # Один поток-сэмплер на процесс, сколько бы раз ни создавался
+    # обработчик запросов.
+    with _samplers_lock:
+        if interval not in _samplers:
+            _samplers[interval] = Sampler(interval)
+        return _samplers[interval]
+
+
+def sampled_functions(stacks, interval):
+    """{функция: {'self': мс, 'total': мс}} по снятым стекам."""
+    functions = defaultdict(lambda: {'self': 0.0, 'total': 0.0})
+    step = interval * 1000
+    for stack, samples in stacks.items():
+        functions[stack[-1]]['self'] += samples * step
+        # Рекурсивная функция учитывается в полном времени один раз.
+        for label in set(stack):
+            functions[label]['total'] += samples * step
+    return functions
+
+
+def cprofile_functions(profile):
+    import pstats
+
+    functions = {}
+    for (filename, line, name), row in pstats.Stats(profile).stats.items():
+        _, calls, self_time, total_time, _ = row
+        label = f'{name} ({short_path(filename)}:{line})'
+        functions[label] = {
+            'self': self_time * 1000, 'total': total_time * 1000,
+            'calls': calls,
+        }
+    return functions
+
+
+class SQLLog:
+    """Запросы к БД с временем выполнения."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            if len(self.queries) < MAX_SQL:
+                self.queries.append({
+                    'sql': sql,
+                    'duration_ms': round(
+                        (perf_counter() - started) * 1000, 3
+                    ),
+                })
+
+
+class ProfilerMiddleware:
+    """Сохраняет профили медленных и выбранных запросов."""
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'PROFILER_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.backend = getattr(settings, 'PROFILER_BACKEND', 'sampling')
+        if self.backend not in BACKENDS:
+            raise ValueError(f'Неизвестный PROFILER_BACKEND: {self.backend}')
+        self.threshold = getattr(settings, 'PROFILER_THRESHOLD_MS', 1000)
+        self.sample_rate = getattr(settings, 'PROFILER_SAMPLE_RATE', 0)
+        self.interval = getattr(settings, 'PROFILER_INTERVAL_MS', 5) / 1000
+        self.directory = Path(settings.PROFILER_DIR)
+        self.max_files = getattr(settings, 'PROFILER_MAX_FILES', 200)
+        self.counter = count(1)
+        self.sampler = get_sampler(self.interval)
+
+    def is_sampled(self):
+        return bool(self.sample_rate) and (
+            next(self.counter) % self.sample_rate == 0
+        )
+
+    def __call__(self, request):
+        sampled = self.is_sampled()
+        if self.backend == 'cprofile' and not sampled:
+            return self.get_response(request)
+        sql = SQLLog()
+        ident = threading.get_ident()
+        profile = None
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(sql))
+            if self.backend == 'cprofile':
+                # cProfile и pstats нужны только этому бэкенду.
+                import cProfile
+
+                profile = cProfile.Profile()
+                profile.enable()
+            else:
+                self.sampler.start(ident)
+            started = perf_counter()
+            try:
+                response = self.get_response(request)
+            finally:
+                elapsed = (perf_counter() - started) * 1000
+                if profile is not None:
+                    profile.disable()
+                else:
+                    stacks = self.sampler.stop(ident)
+        if elapsed < self.threshold and not sampled:
+            return response
+        if profile is not None:
+            data = {'functions': cprofile_functions(profile)}
+        else:
+            data = {
+                'functions': sampled_functions(stacks, self.interval),
+                'interval_ms': self.interval * 1000,
+                'stacks': {
+                    ';'.join(stack): samples
+                    for stack, samples in stacks.most_common()
+                },
+            }
+        data.update(
+            backend=self.backend,
+            request={
+                'method': request.method,
+                'path': request.get_full_path(),
+                'view': getattr(request, 'profiler_view', None),
+                'status': response.status_code,
+                'user_id': getattr(getattr(request, 'user', None), 'pk', None),
+                'duration_ms': round(elapsed, 3),
+                'reason': 'slow' if elapsed >= self.threshold else 'sampled',
+                'pid': os.getpid(),
+                'time': datetime.now(timezone.utc).isoformat(),
+            },
+            sql=sql.queries,
+        )
+        self.save(data)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        actions = getattr(view_func, 'actions', None) or {}
+        request.profiler_view = get_view_name(
+            view_func, actions.get(request.method.lower())
+        )
+
+    def save(self, data):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S%f')
+        view = data['request']['view'] or 'unmatched'
+        name = f'{stamp}-{os.getpid()}-{threading.get_ident()}-{view}.json'
+        path = self.directory / name
+        temporary = path.with_suffix('.tmp')
+        temporary.write_text(json.dumps(data, ensure_ascii=False))
+        os.replace(temporary, path)
+        # Имена начинаются со времени: старые профили идут первыми.
+        files = sorted(self.directory.glob('*.json'))
+        for old in files[:max(0, len(files) - self.max_files)]:
+            old.unlink(missing_ok=True)
+
+
+def load_profiles(directory, view=None):
+    profiles = []
+    for path in sorted(Path(directory).glob('*.json')):
+        try:
+            profile = json.loads(path.read_text())
+        except (OSError, ValueError):
+            continue
+        if view is None or profile['request']['view'] == view:
+            profiles.append(profile)
+    return profiles
+
+
+def hottest_functions(profiles, key='self', limit=20):
+    """[(функция, мс по всем профилям, в скольких профилях)]."""
+    totals = defaultdict(float)
+    seen = Counter()
+    for profile in profiles:
+        for label, timing in profile['functions'].items():
+            totals[label] += timing[key]
+            seen[label] += 1
+    hottest = sorted(totals.items(), key=lambda item: -item[1])[:limit]
+    return [(label, value, seen[label]) for label, value in hottest]
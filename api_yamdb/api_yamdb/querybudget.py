@@ -0,0 +1,159 @@
+"""Учёт запросов к БД на каждый HTTP-запрос.
+
+QueryBudgetMiddleware считает запросы ко всем БД, их суммарное время и
+повторяющиеся запросы (одинаковый SQL с точностью до параметров — типичный
+след N+1). С QUERY_BUDGET_SERVER_TIMING (по умолчанию — при DEBUG) это
+отдаётся в заголовке Server-Timing:
+
+    Server-Timing: db;dur=3.52;desc="4 queries", db-duplicates;desc="2"
+
+Вьюсет может объявить бюджет — наибольшее число запросов:
+
+    query_budget = 4                            # для всех действий
+    query_budget = {'list': 4, 'retrieve': 3}   # по действиям
+
+Превышение пишется в лог и в список `violations`; в тестах фикстура из
+tests/fixtures/fixture_query_budget.py превращает его в ошибку. Запросы,
+выполненные при чтении потокового ответа, не учитываются.
+"""
+import logging
+import re
+import threading
+from collections import Counter
+from contextlib import ExitStack
+from time import perf_counter
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+# Сколько последних превышений хранить в памяти процесса.
+MAX_VIOLATIONS = 1000
+
+_violations_lock = threading.Lock()
+violations = []
+
+FINGERPRINT_RULES = (
+    (re.compile(r"'(?:[^']|'')*'"), '?'),
+    (re.compile(r'\b\d+\b'), '?'),
+    (re.compile(r'%s'), '?'),
+    # IN (?, ?, ?) разной длины — один и тот же запрос.
+    (re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)'), '(...)'),
+    (re.compile(r'\s+'), ' '),
+)
+
+
+def fingerprint(sql):
+    """SQL без значений параметров и литералов."""
+    for pattern, replacement in FINGERPRINT_RULES:
+        sql = pattern.sub(replacement, sql)
+    return sql.strip()
+
+
+class QueryStats:
+    """Запросы к БД, выполненные в пределах одного HTTP-запроса."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        # Отпечатки считаются только по запросу: на каждом запросе к БД
+        # дёшево лишь посчитать одинаковые строки SQL.
+        self.statements = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += perf_counter() - started
+            self.count += 1
+            self.statements[sql] += 1
+
+    @property
+    def fingerprints(self):
+        fingerprints = Counter()
+        for sql, count in self.statements.items():
+            fingerprints[fingerprint(sql)] += count
+        return fingerprints
+
+    @property
+    def duplicates(self):
+        """{отпечаток: сколько раз выполнен}, если больше одного."""
+        return {
+            sql: count for sql, count in self.fingerprints.items()
+            if count > 1
+        }
+
+    def server_timing(self):
+        metrics = [
+            f'db;dur={self.duration * 1000:.2f};desc="{self.count} queries"'
+        ]
+        duplicates = sum(count - 1 for count in self.duplicates.values())
+        if duplicates:
+            metrics.append(f'db-duplicates;desc="{duplicates}"')
+        return ', '.join(metrics)
+
+
+def get_budget(view_class, action):
+    budget = getattr(view_class, 'query_budget', None)
+    if isinstance(budget, dict):
+        return budget.get(action)
+    return budget
+
+
+def record_violation(violation):
+    with _violations_lock:
+        violations.append(violation)
+        del violations[:-MAX_VIOLATIONS]
+
+
+class QueryBudgetMiddleware:
+    """Считает запросы к БД и проверяет бюджет вьюсета."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.server_timing = getattr(
+            settings, 'QUERY_BUDGET_SERVER_TIMING', False
+        )
+
+    def __call__(self, request):
+        stats = request.query_stats = QueryStats()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(stats))
+            response = self.get_response(request)
+        if self.server_timing:
+            response['Server-Timing'] = stats.server_timing()
+        self.check_budget(request, stats)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, 'cls', None)
+        if view_class is not None:
+            actions = getattr(view_func, 'actions', None) or {}
+            request.query_budget_view = (
+                view_class, actions.get(request.method.lower())
+            )
+
+    def check_budget(self, request, stats):
+        view_class, action = getattr(
+            request, 'query_budget_view', (None, None)
+        )
+        budget = get_budget(view_class, action)
+        if budget is None or stats.count <= budget:
+            return
+        violation = {
+            'view': '.'.join(filter(None, (view_class.__name__, action))),
+            'method': request.method,
+            'path': request.get_full_path(),
+            'queries': stats.count,
+            'budget': budget,
+            'duration_ms': round(stats.duration * 1000, 2),
+            'duplicates': stats.duplicates,
+        }
+        record_violation(violation)
+        logger.warning(
+            '%(view)s: %(queries)s запросов к БД при бюджете %(budget)s '
+            '(%(method)s %(path)s)', violation
+        )
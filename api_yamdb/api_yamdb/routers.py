@@ -0,0 +1,56 @@
+"""Маршрутизация запросов между основной БД и репликами.
+
+Чтение уходит на реплику (DATABASE_REPLICAS) только внутри replica_reads():
+его включают вьюсеты каталога для безопасных запросов. Всё остальное, в том
+числе любая запись, выполняется на основной БД.
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+_use_replica = ContextVar('use_replica', default=False)
+
+
+@contextmanager
+def replica_reads():
+    token = _use_replica.set(True)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+def reading_from_replica():
+    """Уходит ли сейчас чтение на реплику."""
+    return bool(getattr(settings, 'DATABASE_REPLICAS', ())) and (
+        _use_replica.get()
+    )
+
+
+class ReplicaRouter:
+
+    def get_replicas(self):
+        return getattr(settings, 'DATABASE_REPLICAS', ())
+
+    def db_for_read(self, model, **hints):
+        if reading_from_replica():
+            return random.choice(self.get_replicas())
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        # Явно, иначе Django запишет объект в БД, из которой он загружен.
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        pool = {DEFAULT_DB_ALIAS, *self.get_replicas()}
+        if obj1._state.db in pool and obj2._state.db in pool:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in self.get_replicas():
+            return False
+        return None
@@ -1,3 +1,4 @@
+import os
 from datetime import timedelta
 from pathlib import Path
 
@@ -30,6 +31,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api_yamdb.profiler.ProfilerMiddleware',
+    'api_yamdb.metrics.MetricsMiddleware',
+    'api_yamdb.querybudget.QueryBudgetMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -63,13 +67,117 @@ WSGI_APPLICATION = 'api_yamdb.wsgi.application'
 
 # Database
 
-DATABASES = {
-    'default': {
+# Профиль БД выбирается переменной окружения DB_PROFILE: sqlite или
+# postgresql. Соединения переиспользуются между запросами CONN_MAX_AGE
+# секунд.
+DATABASE_PROFILES = {
+    'sqlite': {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'NAME': os.getenv('DB_NAME', BASE_DIR / 'db.sqlite3'),
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', 60)),
+    },
+    'postgresql': {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': os.getenv('DB_NAME', 'api_yamdb'),
+        'USER': os.getenv('DB_USER', 'postgres'),
+        'PASSWORD': os.getenv('DB_PASSWORD', ''),
+        'HOST': os.getenv('DB_HOST', 'localhost'),
+        'PORT': os.getenv('DB_PORT', '5432'),
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', 600)),
+    },
+}
+
+DB_PROFILE = os.getenv('DB_PROFILE', 'sqlite')
+
+DATABASES = {
+    'default': DATABASE_PROFILES[DB_PROFILE],
+}
+
+# Реплики для чтения: DB_REPLICAS через запятую — файлы БД для SQLite или
+# хосты для PostgreSQL. Получают имена replica_1, replica_2, ...
+# Ответы, прочитанные с реплики, не попадают в кэш ответов API: кэш
+# наполняют только запросы к основной БД.
+DATABASE_REPLICAS = []
+for index, replica in enumerate(
+    filter(None, os.getenv('DB_REPLICAS', '').split(',')), 1
+):
+    DATABASES[f'replica_{index}'] = {
+        **DATABASES['default'],
+        'HOST' if DB_PROFILE == 'postgresql' else 'NAME': replica.strip(),
+        'TEST': {'MIRROR': 'default'},
     }
+    DATABASE_REPLICAS.append(f'replica_{index}')
+
+DATABASE_ROUTERS = ['api_yamdb.routers.ReplicaRouter']
+
+# Сколько секунд после изменяющего запроса клиент читает с основной БД.
+DATABASE_REPLICA_PIN_SECONDS = 10
+
+# PRAGMA, которые выполняются на каждом новом соединении с SQLite.
+# WAL позволяет читать во время записи, а busy_timeout (мс) заставляет
+# писателей ждать блокировку вместо ошибки "database is locked".
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -20000,
+    'temp_store': 'MEMORY',
 }
 
+# Проверять постоянные соединения в начале запроса и переоткрывать
+# разорванные (например, после перезапуска PostgreSQL).
+DATABASE_HEALTH_CHECKS = True
+
+# Отдавать число и время запросов к БД в заголовке Server-Timing. Заголовок
+# раскрывает внутренности сервиса, поэтому по умолчанию только с DEBUG.
+QUERY_BUDGET_SERVER_TIMING = os.getenv(
+    'QUERY_BUDGET_SERVER_TIMING', str(DEBUG)
+) == 'True'
+
+# Метрики /metrics. При нескольких процессах сервера задайте METRICS_DIR:
+# каталог, куда процессы раз в METRICS_FLUSH_INTERVAL секунд пишут свои
+# значения. METRICS_TOKEN — токен Bearer для доступа к /metrics; без него
+# /metrics отвечает 404, если не включён DEBUG.
+METRICS_DIR = os.getenv('METRICS_DIR')
+METRICS_FLUSH_INTERVAL = 5
+METRICS_TOKEN = os.getenv('METRICS_TOKEN')
+
+# Профилирование медленных запросов (api_yamdb/profiler.py): сохраняются
+# запросы дольше PROFILER_THRESHOLD_MS и каждый PROFILER_SAMPLE_RATE-й.
+PROFILER_ENABLED = os.getenv('PROFILER_ENABLED', 'False') == 'True'
+PROFILER_BACKEND = os.getenv('PROFILER_BACKEND', 'sampling')
+PROFILER_THRESHOLD_MS = 1000
+PROFILER_SAMPLE_RATE = 0
+PROFILER_INTERVAL_MS = 5
+PROFILER_DIR = BASE_DIR / 'profiles'
+PROFILER_MAX_FILES = 200
+
+
+# Cache
+
+API_CACHE_BACKENDS = {
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'api-responses',
+    },
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache',
+    },
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'api': API_CACHE_BACKENDS[os.getenv('API_CACHE_BACKEND', 'locmem')],
+}
+
+# Кэш ответов на GET-запросы к произведениям, жанрам и категориям.
+API_RESPONSE_CACHE = 'api'
+API_RESPONSE_CACHE_TIMEOUT = 300
+
 
 # Password validation
 
@@ -117,8 +225,24 @@ REST_FRAMEWORK = {
     ],
 
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.StatelessJWTAuthentication',
+    ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+        'api.renderers.MessagePackRenderer',
+        'api.renderers.CBORRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'api.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+        'api.parsers.MessagePackParser',
+        'api.parsers.CBORParser',
     ],
+    'DEFAULT_CONTENT_NEGOTIATION_CLASS': (
+        'api.negotiation.AvailableContentNegotiation'
+    ),
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination',
     'PAGE_SIZE': 10,
 }
@@ -128,7 +252,17 @@ SIMPLE_JWT = {
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
 
+# Как долго (в секундах) роль и флаги пользователя из токена считаются
+# актуальными без повторной сверки с БД.
+AUTH_USER_STATE_TTL = 30
+# Сколько пользователей хранится в этом кэше в каждом процессе.
+AUTH_USER_STATE_CACHE_SIZE = 10000
+
 
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
 DEFAULT_FROM_EMAIL = 'api_yamdb@localhost.ru'
+
+# Письма ставятся в очередь и отправляются командой send_outbox.
+# С MAIL_OUTBOX_EAGER=True они уходят сразу после фиксации транзакции.
+MAIL_OUTBOX_EAGER = os.getenv('MAIL_OUTBOX_EAGER', 'False') == 'True'
@@ -0,0 +1,48 @@
+"""Настройки процесса, который обслуживает только API.
+
+    DJANGO_SETTINGS_MODULE=api_yamdb.settings_api gunicorn api_yamdb.wsgi
+
+API авторизует запросы только токенами JWT, поэтому здесь нет админки,
+сессий, сообщений, CSRF, X-Frame-Options, шаблонов и браузерного API:
+процесс быстрее стартует, а каждый запрос проходит меньше middleware.
+Маршруты — api_yamdb.urls_api (/api/ и /metrics). Админка и /redoc/
+доступны с полными настройками api_yamdb.settings, например в отдельном
+процессе за тем же прокси.
+"""
+from api_yamdb.settings import *  # noqa: F401,F403
+from api_yamdb.settings import INSTALLED_APPS, MIDDLEWARE, REST_FRAMEWORK
+
+# Приложения и middleware, которые нужны только браузеру и админке.
+BROWSER_APPS = (
+    'django.contrib.admin',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+)
+BROWSER_MIDDLEWARE = (
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+)
+
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in BROWSER_APPS]
+
+# request.user задаёт аутентификация DRF.
+MIDDLEWARE = [
+    middleware for middleware in MIDDLEWARE
+    if middleware not in BROWSER_MIDDLEWARE
+]
+
+ROOT_URLCONF = 'api_yamdb.urls_api'
+
+TEMPLATES = []
+
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    'DEFAULT_RENDERER_CLASSES': [
+        renderer for renderer in REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES']
+        if renderer != 'rest_framework.renderers.BrowsableAPIRenderer'
+    ],
+}
@@ -1,6 +1,21 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class ReviewsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'reviews'
+
+    def ready(self):
+        from api_yamdb import database  # noqa: F401
+        from reviews import signals  # noqa: F401
+        post_migrate.connect(restore_search_index, sender=self)
+
+
+def restore_search_index(using, **kwargs):
+    # Миграции SQLite пересоздают таблицу произведений без триггеров
+    # полнотекстового индекса.
+    from django.db import connections
+    from reviews.search import ensure_search_index
+
+    ensure_search_index(connections[using])
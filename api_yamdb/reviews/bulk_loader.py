@@ -0,0 +1,265 @@
+"""Потоковая загрузка данных в БД пачками.
+
+Строки читаются из CSV (или любого итерируемого источника словарей)
+и вставляются через bulk_create пачками фиксированного размера, поэтому
+память не зависит от размера файла. Внешние ключи (`category`, `author`,
+`title_id`, ...) принимаются как id или как натуральный ключ (слаг, имя
+пользователя); натуральные ключи разрешаются одним запросом на модель.
+"""
+import csv
+from contextlib import contextmanager
+from itertools import islice
+from time import monotonic
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import FieldDoesNotExist
+from django.core.management.color import no_style
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from api.cache import invalidate_models
+from reviews.models import Category, Comment, Genre, GenreTitle, Review, Title
+
+User = get_user_model()
+
+# Модели в порядке загрузки и CSV-файлы с их данными.
+DATA_FILES = (
+    (Category, 'category.csv'),
+    (Genre, 'genre.csv'),
+    (Title, 'titles.csv'),
+    (GenreTitle, 'genre_title.csv'),
+    (User, 'users.csv'),
+    (Review, 'review.csv'),
+    (Comment, 'comments.csv'),
+)
+
+# Поле, по которому внешний ключ можно указать вместо id.
+NATURAL_KEYS = {
+    Category: 'slug',
+    Genre: 'slug',
+    User: 'username',
+}
+
+DEFAULT_BATCH_SIZE = 5000
+
+
+class LoadStats:
+    """Сколько строк модели загружено и за какое время."""
+
+    def __init__(self, model):
+        self.model = model
+        self.rows = 0
+        self.created = 0
+        self.updated = 0
+        self.started = monotonic()
+        self.elapsed = 0.0
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+
+class BulkLoader:
+    """
+    Загрузчик данных пачками.
+
+    upsert: строки с уже существующим id обновляются через bulk_update,
+    а не вставляются повторно. Вызывающий код сам открывает транзакцию.
+    """
+
+    def __init__(self, batch_size=DEFAULT_BATCH_SIZE, upsert=False,
+                 using=DEFAULT_DB_ALIAS, progress=None):
+        self.batch_size = batch_size
+        self.upsert = upsert
+        self.using = using
+        self.progress = progress
+        self._natural_keys = {}
+
+    @property
+    def connection(self):
+        return connections[self.using]
+
+    def get_columns(self, model, header):
+        """Сопоставляет заголовки с полями модели: [(колонка, поле)]."""
+        columns = []
+        for column in header:
+            try:
+                field = model._meta.get_field(column.strip())
+            except FieldDoesNotExist:
+                field = None
+            if field is None or not field.concrete:
+                raise ValueError(
+                    f'{model._meta.label}: неизвестная колонка "{column}"'
+                )
+            columns.append((column, field))
+        return columns
+
+    def resolve_fk(self, field, value):
+        if value in (None, ''):
+            return None
+        if isinstance(value, int) or str(value).isdigit():
+            return int(value)
+        target = field.related_model
+        key = NATURAL_KEYS.get(target)
+        if key is None:
+            raise ValueError(
+                f'{field.model._meta.label}.{field.name}: '
+                f'ожидается id, получено "{value}"'
+            )
+        if target not in self._natural_keys:
+            # Один запрос на всю загрузку вместо запроса на каждую строку.
+            self._natural_keys[target] = dict(
+                target.objects.using(self.using).values_list(key, 'pk')
+            )
+        try:
+            return self._natural_keys[target][value]
+        except KeyError:
+            raise ValueError(
+                f'{target._meta.label}: не найден объект {key}="{value}"'
+            )
+
+    def build(self, model, columns, row):
+        values = {}
+        for column, field in columns:
+            value = row[column]
+            if field.is_relation:
+                values[field.attname] = self.resolve_fk(field, value)
+            elif value == '' and field.null:
+                values[field.attname] = None
+            else:
+                values[field.attname] = field.to_python(value)
+        return model(**values)
+
+    @contextmanager
+    def keep_auto_now(self, columns):
+        # bulk_create подставляет текущее время в поля с auto_now_add;
+        # если дата есть в данных, сохраняем её как есть.
+        fields = [
+            field for _, field in columns
+            if getattr(field, 'auto_now_add', False)
+            or getattr(field, 'auto_now', False)
+        ]
+        flags = [(field.auto_now, field.auto_now_add) for field in fields]
+        for field in fields:
+            field.auto_now = field.auto_now_add = False
+        try:
+            yield
+        finally:
+            for field, (auto_now, auto_now_add) in zip(fields, flags):
+                field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+    def save_batch(self, model, objects, columns, stats):
+        manager = model.objects.using(self.using)
+        if self.upsert and objects[0].pk is not None:
+            existing = set(manager.filter(
+                pk__in=[obj.pk for obj in objects]
+            ).values_list('pk', flat=True))
+            updated = [obj for obj in objects if obj.pk in existing]
+            objects = [obj for obj in objects if obj.pk not in existing]
+            fields = [
+                field.name for _, field in columns if not field.primary_key
+            ]
+            if updated and fields:
+                manager.bulk_update(updated, fields)
+            stats.updated += len(updated)
+        manager.bulk_create(objects)
+        stats.created += len(objects)
+
+    def load_rows(self, model, rows, header=None):
+        """Загружает словари `rows` пачками и возвращает LoadStats."""
+        rows = iter(rows)
+        stats = LoadStats(model)
+        columns = None
+        if header is not None:
+            columns = self.get_columns(model, header)
+        while True:
+            batch = list(islice(rows, self.batch_size))
+            if not batch:
+                break
+            if columns is None:
+                columns = self.get_columns(model, batch[0].keys())
+            with self.keep_auto_now(columns):
+                objects = [self.build(model, columns, row) for row in batch]
+                self.save_batch(model, objects, columns, stats)
+            stats.rows += len(batch)
+            stats.elapsed = monotonic() - stats.started
+            if self.progress:
+                self.progress(stats)
+        stats.elapsed = monotonic() - stats.started
+        # bulk_create не отправляет сигналы: кэш ответов сбрасываем сами,
+        # когда данные станут видны другим соединениям.
+        transaction.on_commit(
+            lambda: invalidate_models(model), using=self.using
+        )
+        if NATURAL_KEYS.get(model):
+            self._natural_keys.pop(model, None)
+        return stats
+
+    def load_csv(self, model, path):
+        with open(path, 'r', encoding='utf-8-sig', newline='') as csv_data:
+            reader = csv.DictReader(csv_data)
+            return self.load_rows(model, reader, header=reader.fieldnames)
+
+    def tables(self, models):
+        tables = []
+        for model in models:
+            tables.append(model._meta.db_table)
+            tables.extend(
+                field.remote_field.through._meta.db_table
+                for field in model._meta.local_many_to_many
+                if field.remote_field.through._meta.auto_created
+            )
+        return tables
+
+    def truncate(self, models):
+        """Очищает таблицы моделей (и их автоматических m2m-таблиц)."""
+        statements = self.connection.ops.sql_flush(
+            no_style(), self.tables(models), allow_cascade=True
+        )
+        with self.connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+
+    def secondary_indexes(self, table):
+        vendor = self.connection.vendor
+        if vendor == 'sqlite':
+            sql = (
+                "SELECT name, sql FROM sqlite_master WHERE type = 'index' "
+                'AND tbl_name = %s AND sql IS NOT NULL'
+            )
+        elif vendor == 'postgresql':
+            sql = (
+                'SELECT indexname, indexdef FROM pg_indexes '
+                'WHERE tablename = %s AND schemaname = current_schema()'
+            )
+        else:
+            return []
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql, [table])
+            # Уникальные индексы нужны для целостности данных при загрузке.
+            return [
+                (name, definition) for name, definition in cursor.fetchall()
+                if not definition.upper().startswith('CREATE UNIQUE')
+            ]
+
+    @contextmanager
+    def indexes_dropped(self, models):
+        """Удаляет вторичные индексы на время загрузки и создаёт заново."""
+        indexes = []
+        for table in self.tables(models):
+            indexes.extend(self.secondary_indexes(table))
+        quote_name = self.connection.ops.quote_name
+        with self.connection.cursor() as cursor:
+            for name, _ in indexes:
+                cursor.execute(f'DROP INDEX {quote_name(name)}')
+        yield indexes
+        with self.connection.cursor() as cursor:
+            for _, definition in indexes:
+                cursor.execute(definition)
+
+    def reset_sequences(self, models):
+        statements = self.connection.ops.sequence_reset_sql(
+            no_style(), models
+        )
+        with self.connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
@@ -0,0 +1,42 @@
+"""Хранимое количество комментариев к отзывам.
+
+Review.comment_count обновляется сигналами модели Comment атомарным
+F()-запросом, в том числе при каскадном удалении комментариев. Количество
+отзывов произведения хранится в Title.rating_count (см. reviews.ratings).
+"""
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from reviews.models import Comment, Review
+
+
+def _actual_comment_count():
+    comments = Comment.objects.filter(
+        review=OuterRef('pk')
+    ).order_by().values('review')
+    return Coalesce(Subquery(
+        comments.annotate(value=Count('pk')).values('value'),
+        output_field=IntegerField()
+    ), 0)
+
+
+def apply_comment_delta(review_id, delta):
+    return Review.objects.filter(pk=review_id).update(
+        comment_count=F('comment_count') + delta
+    )
+
+
+def rebuild_comment_counts(reviews=None):
+    """Пересчитывает количество комментариев отзывов."""
+    if reviews is None:
+        reviews = Review.objects.all()
+    return reviews.update(comment_count=_actual_comment_count())
+
+
+def find_comment_count_drift(reviews=None):
+    """Возвращает отзывы, у которых счётчик разошёлся с комментариями."""
+    if reviews is None:
+        reviews = Review.objects.all()
+    return reviews.annotate(
+        actual_count=_actual_comment_count()
+    ).exclude(comment_count=F('actual_count'))
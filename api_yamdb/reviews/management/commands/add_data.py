@@ -1,33 +1,95 @@
-import csv
-
 from django.conf import settings
-from django.core.management import BaseCommand
-
-from reviews.models import (
-    Category, Genre, Title, GenreTitle, Review, Comment, User
-)
-
-RATIO_DATA = {
-    Category: 'category.csv',
-    Genre: 'genre.csv',
-    Title: 'titles.csv',
-    GenreTitle: 'genre_title.csv',
-    User: 'users.csv',
-    Review: 'review.csv',
-    Comment: 'comments.csv',
+from django.core.management import BaseCommand, CommandError
+from django.db import IntegrityError, transaction
 
-}
+from api.cache import invalidate_models
+from reviews.bulk_loader import DATA_FILES, DEFAULT_BATCH_SIZE, BulkLoader
+from reviews.counters import rebuild_comment_counts
+from reviews.models import Title
+from reviews.ratings import rebuild_ratings
 
 
 class Command(BaseCommand):
     help = 'Команда добавляет данные в БД из csv файлов'
 
-    def handle(self, *args, **kwargs):
-        for model, file in RATIO_DATA.items():
-            with open(
-                f'{settings.BASE_DIR}/static/data/{file}',
-                'r', encoding='utf-8'
-            ) as csv_data:
-                reader = csv.DictReader(csv_data)
-                model.objects.bulk_create(model(**data) for data in reader)
-            self.stdout.write(self.style.SUCCESS('Загрузка прошла успешно'))
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path', default=settings.BASE_DIR / 'static' / 'data',
+            help='Каталог с csv файлами.'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+            help='Сколько строк вставлять одним запросом.'
+        )
+        parser.add_argument(
+            '--truncate', action='store_true',
+            help='Очистить таблицы перед загрузкой.'
+        )
+        parser.add_argument(
+            '--upsert', action='store_true',
+            help='Обновлять записи с уже существующим id.'
+        )
+        parser.add_argument(
+            '--drop-indexes', action='store_true',
+            help='Удалить вторичные индексы на время загрузки.'
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Загрузить данные и откатить транзакцию.'
+        )
+
+    def progress(self, stats):
+        if self.verbosity > 1:
+            self.stdout.write(
+                f'  {stats.model._meta.verbose_name_plural}: '
+                f'{stats.rows} строк'
+            )
+
+    def handle(self, *args, **options):
+        self.verbosity = options['verbosity']
+        loader = BulkLoader(
+            batch_size=options['batch_size'],
+            upsert=options['upsert'],
+            progress=self.progress
+        )
+        models = [model for model, _ in DATA_FILES]
+        try:
+            with transaction.atomic():
+                if options['truncate']:
+                    loader.truncate(reversed(models))
+                if options['drop_indexes']:
+                    with loader.indexes_dropped(models):
+                        self.load(loader, options['path'])
+                else:
+                    self.load(loader, options['path'])
+                # bulk_create не отправляет сигналы, поэтому рейтинг
+                # и счётчики считаем заново.
+                rebuild_ratings()
+                rebuild_comment_counts()
+                transaction.on_commit(lambda: invalidate_models(Title))
+                loader.reset_sequences(models)
+                if options['dry_run']:
+                    transaction.set_rollback(True)
+        except (OSError, ValueError) as error:
+            raise CommandError(error)
+        except IntegrityError as error:
+            raise CommandError(
+                f'{error}. Данные уже загружены: используйте --upsert '
+                'или --truncate.'
+            )
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING(
+                'Пробный запуск: изменения отменены'
+            ))
+
+    def load(self, loader, path):
+        for model, file in DATA_FILES:
+            stats = loader.load_csv(model, f'{path}/{file}')
+            if not self.verbosity:
+                continue
+            self.stdout.write(self.style.SUCCESS(
+                f'{model._meta.verbose_name_plural}: загружено {stats.rows} '
+                f'строк (новых {stats.created}, обновлено {stats.updated}) '
+                f'за {stats.elapsed:.2f} с, '
+                f'{stats.rows_per_second:.0f} строк/с'
+            ))
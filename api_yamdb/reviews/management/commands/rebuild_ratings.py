@@ -0,0 +1,40 @@
+from django.core.management import BaseCommand, CommandError
+from django.db import transaction
+
+from api.cache import invalidate_models
+from reviews.models import Title
+from reviews.ratings import find_rating_drift, rebuild_ratings
+
+
+class Command(BaseCommand):
+    help = (
+        'Команда пересчитывает хранимый рейтинг произведений по отзывам '
+        'или, с флагом --check, только проверяет его на расхождения'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check', action='store_true',
+            help='Только найти расхождения, ничего не изменяя.'
+        )
+
+    def handle(self, *args, **options):
+        drift = list(
+            find_rating_drift().values_list('pk', flat=True)[:100]
+        )
+        if options['check']:
+            if drift:
+                raise CommandError(
+                    'Рейтинг расходится с отзывами у произведений: '
+                    + ', '.join(map(str, drift))
+                )
+            self.stdout.write(self.style.SUCCESS('Расхождений не найдено'))
+            return
+        with transaction.atomic():
+            updated = rebuild_ratings()
+        # update() не отправляет сигналы.
+        invalidate_models(Title)
+        self.stdout.write(self.style.SUCCESS(
+            f'Рейтинг пересчитан для {updated} произведений, '
+            f'исправлено расхождений: {len(drift)}'
+        ))
@@ -0,0 +1,48 @@
+from django.core.management import BaseCommand, CommandError
+from django.db import transaction
+
+from api.cache import invalidate_models
+from reviews.counters import find_comment_count_drift, rebuild_comment_counts
+from reviews.models import Title
+from reviews.ratings import find_rating_drift, rebuild_ratings
+
+
+class Command(BaseCommand):
+    help = (
+        'Команда сверяет хранимые счётчики (рейтинг и количество отзывов '
+        'произведений, количество комментариев отзывов) с данными и '
+        'исправляет расхождения'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check', action='store_true',
+            help='Только найти расхождения, ничего не изменяя.'
+        )
+
+    def handle(self, *args, **options):
+        if options['check']:
+            titles = list(
+                find_rating_drift().values_list('pk', flat=True)[:100]
+            )
+            reviews = list(
+                find_comment_count_drift().values_list('pk', flat=True)[:100]
+            )
+            if titles or reviews:
+                raise CommandError(
+                    'Счётчики расходятся с данными. Произведения: '
+                    f'{", ".join(map(str, titles)) or "-"}; отзывы: '
+                    f'{", ".join(map(str, reviews)) or "-"}'
+                )
+            self.stdout.write(self.style.SUCCESS('Расхождений не найдено'))
+            return
+        # Пересчитываются только разошедшиеся строки, остальные не
+        # блокируются и не переписываются.
+        with transaction.atomic():
+            titles = rebuild_ratings(find_rating_drift())
+            reviews = rebuild_comment_counts(find_comment_count_drift())
+        # update() не отправляет сигналы.
+        invalidate_models(Title)
+        self.stdout.write(self.style.SUCCESS(
+            f'Исправлено произведений: {titles}, отзывов: {reviews}'
+        ))
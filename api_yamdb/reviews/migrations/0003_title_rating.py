@@ -0,0 +1,45 @@
+# Generated by Django 3.2 on 2026-10-18 20:47
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def fill_ratings(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    Review = apps.get_model('reviews', 'Review')
+    db_alias = schema_editor.connection.alias
+    stats = Review.objects.using(db_alias).order_by().values(
+        'title_id'
+    ).annotate(rating_sum=Sum('score'), rating_count=Count('pk'))
+    for row in stats.iterator():
+        Title.objects.using(db_alias).filter(pk=row['title_id']).update(
+            rating_sum=row['rating_sum'],
+            rating_count=row['rating_count'],
+            rating=row['rating_sum'] // row['rating_count']
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='rating',
+            field=models.PositiveSmallIntegerField(default=None, editable=False, null=True, verbose_name='Рейтинг'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество оценок'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Сумма оценок'),
+        ),
+        migrations.RunPython(fill_ratings, migrations.RunPython.noop),
+    ]
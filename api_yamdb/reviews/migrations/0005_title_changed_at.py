@@ -0,0 +1,20 @@
+# Generated by Django 3.2 on 2026-10-18 21:30
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0004_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='changed_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, verbose_name='Дата изменения'),
+            preserve_default=False,
+        ),
+    ]
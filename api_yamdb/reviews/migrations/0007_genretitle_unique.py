@@ -0,0 +1,27 @@
+from django.db import migrations, models
+from django.db.models import Min
+
+
+def remove_duplicates(apps, schema_editor):
+    GenreTitle = apps.get_model('reviews', 'GenreTitle')
+    keep = GenreTitle.objects.values('genre', 'title').annotate(
+        first_id=Min('id')
+    ).values('first_id')
+    GenreTitle.objects.exclude(id__in=keep).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_title_search_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='genretitle',
+            constraint=models.UniqueConstraint(
+                fields=('genre', 'title'), name='unique genre title'
+            ),
+        ),
+    ]
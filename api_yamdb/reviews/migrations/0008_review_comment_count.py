@@ -0,0 +1,31 @@
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_comment_counts(apps, schema_editor):
+    Comment = apps.get_model('reviews', 'Comment')
+    Review = apps.get_model('reviews', 'Review')
+    comments = Comment.objects.filter(
+        review=OuterRef('pk')
+    ).order_by().values('review')
+    Review.objects.update(comment_count=Coalesce(Subquery(
+        comments.annotate(value=Count('pk')).values('value'),
+        output_field=IntegerField()
+    ), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0007_genretitle_unique'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='review',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='количество комментариев'),
+        ),
+        migrations.RunPython(fill_comment_counts, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,5 @@
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.db import models, transaction
 
 from reviews.consts import LENGTH_TEXT, MAX_LEN_NAME, SCORE_VALIDATOR
 from reviews.validators import validate_year
@@ -39,7 +39,35 @@ class Genre(CategoryGenreModel):
         verbose_name_plural = 'Жанры'
 
 
-class Title(models.Model):
+class StoredCountersModel(models.Model):
+    """
+    Модель с хранимыми счётчиками.
+
+    Счётчики меняются только атомарными F()-запросами в сигналах, поэтому
+    save() существующего объекта их не перезаписывает: иначе устаревшее
+    значение из памяти затёрло бы изменения параллельных запросов.
+    """
+
+    counter_fields = ()
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        if (
+            not self._state.adding
+            and kwargs.get('update_fields') is None
+            and not kwargs.get('force_insert')
+        ):
+            skip = set(self.counter_fields) | self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.attname not in skip
+            ]
+        super().save(*args, **kwargs)
+
+
+class Title(StoredCountersModel):
     """Модель для произведения."""
 
     name = models.CharField(verbose_name='Название', max_length=MAX_LEN_NAME)
@@ -56,11 +84,29 @@ class Title(models.Model):
     description = models.TextField(
         verbose_name='Описание', blank=True
     )
+    rating_sum = models.PositiveIntegerField(
+        verbose_name='Сумма оценок', default=0, editable=False
+    )
+    rating_count = models.PositiveIntegerField(
+        verbose_name='Количество оценок', default=0, editable=False
+    )
+    rating = models.PositiveSmallIntegerField(
+        verbose_name='Рейтинг', null=True, default=None, editable=False
+    )
+    changed_at = models.DateTimeField(
+        verbose_name='Дата изменения', auto_now=True
+    )
+
+    # rating_count — это и есть количество отзывов произведения.
+    counter_fields = ('rating_sum', 'rating_count', 'rating')
 
     class Meta:
         verbose_name = 'произведение'
         verbose_name_plural = 'Произведения'
         ordering = ('name',)
+        indexes = (
+            models.Index(fields=('name', 'id'), name='title_name_id_idx'),
+        )
 
     def __str__(self):
         return self.name[:LENGTH_TEXT]
@@ -74,11 +120,20 @@ class GenreTitle(models.Model):
     )
     title = models.ForeignKey(Title, on_delete=models.CASCADE)
 
+    class Meta:
+        # Уникальный индекс (genre_id, title_id) заодно обслуживает
+        # фильтрацию произведений по жанру.
+        constraints = [
+            models.UniqueConstraint(
+                fields=('genre', 'title'),
+                name='unique genre title'
+            )]
+
     def __str__(self):
         return f'{self.genre} {self.title}'[:LENGTH_TEXT]
 
 
-class Review(models.Model):
+class Review(StoredCountersModel):
     title = models.ForeignKey(
         Title,
         on_delete=models.CASCADE,
@@ -102,6 +157,11 @@ class Review(models.Model):
         auto_now_add=True,
         db_index=True
     )
+    comment_count = models.PositiveIntegerField(
+        'количество комментариев', default=0, editable=False
+    )
+
+    counter_fields = ('comment_count',)
 
     class Meta:
         verbose_name = 'Отзыв'
@@ -111,11 +171,23 @@ class Review(models.Model):
                 fields=('title', 'author',),
                 name='unique review'
             )]
+        indexes = (
+            models.Index(
+                fields=('title', 'pub_date', 'id'),
+                name='review_title_pub_date_idx'
+            ),
+        )
         ordering = ('pub_date',)
 
     def __str__(self):
         return self.text[:LENGTH_TEXT]
 
+    def save(self, *args, **kwargs):
+        # Рейтинг произведения пересчитывается в сигнале post_save,
+        # поэтому он должен попасть в одну транзакцию с самим отзывом.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
 
 class Comment(models.Model):
     """Класс комментариев."""
@@ -145,6 +217,12 @@ class Comment(models.Model):
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
         ordering = ('-pub_date',)
+        indexes = (
+            models.Index(
+                fields=('review', '-pub_date', 'id'),
+                name='comment_review_pub_date_idx'
+            ),
+        )
 
     def __str__(self):
         return self.text[:LENGTH_TEXT]
@@ -0,0 +1,87 @@
+"""Хранимый рейтинг произведений.
+
+Рейтинг не считается на лету через Avg('reviews__score'): у произведения
+хранятся сумма и количество оценок, а сам рейтинг выводится из них.
+Поля обновляются сигналами модели Review, а функции ниже позволяют
+пересчитать их с нуля и найти расхождения.
+"""
+from django.db.models import (
+    Case, Count, F, IntegerField, OuterRef, Q, Subquery, Sum, When
+)
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from reviews.models import Review, Title
+
+
+def _review_stats(expression):
+    reviews = Review.objects.filter(
+        title=OuterRef('pk')
+    ).order_by().values('title')
+    return Subquery(
+        reviews.annotate(value=expression).values('value'),
+        output_field=IntegerField()
+    )
+
+
+def _actual_sum():
+    return Coalesce(_review_stats(Sum('score')), 0)
+
+
+def _actual_count():
+    return Coalesce(_review_stats(Count('pk')), 0)
+
+
+def _actual_rating():
+    return _review_stats(Sum('score') / Count('pk'))
+
+
+def apply_rating_delta(title_id, score_delta=0, count_delta=0):
+    """
+    Атомарно сдвигает сумму и количество оценок произведения и отмечает
+    время его изменения (changed_at).
+    """
+    rating_sum = F('rating_sum') + score_delta
+    rating_count = F('rating_count') + count_delta
+    return Title.objects.filter(pk=title_id).update(
+        changed_at=timezone.now(),
+        rating_sum=rating_sum,
+        rating_count=rating_count,
+        # В UPDATE все выражения видят старые значения строки.
+        rating=Case(
+            When(
+                rating_count__gt=-count_delta,
+                then=rating_sum / rating_count
+            ),
+            default=None,
+            output_field=IntegerField()
+        )
+    )
+
+
+def rebuild_ratings(titles=None):
+    """Пересчитывает рейтинг произведений по таблице отзывов."""
+    if titles is None:
+        titles = Title.objects.all()
+    return titles.update(
+        rating_sum=_actual_sum(),
+        rating_count=_actual_count(),
+        rating=_actual_rating()
+    )
+
+
+def find_rating_drift(titles=None):
+    """Возвращает произведения, у которых рейтинг разошёлся с отзывами."""
+    if titles is None:
+        titles = Title.objects.all()
+    return titles.annotate(
+        actual_sum=_actual_sum(),
+        actual_count=_actual_count(),
+        actual_rating=Coalesce(_actual_rating(), 0)
+    ).exclude(
+        Q(rating_sum=F('actual_sum'))
+        & Q(rating_count=F('actual_count'))
+        & Q(rating__isnull=False, rating=F('actual_rating'))
+        | Q(rating__isnull=True, actual_count=0)
+        & Q(rating_sum=0, rating_count=0)
+    )
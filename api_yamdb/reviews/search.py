@@ -0,0 +1,123 @@
+"""Полнотекстовый поиск произведений.
+
+На SQLite используется виртуальная таблица FTS5 `reviews_title_fts` по
+названию и описанию произведения. Она хранит только индекс (content=
+reviews_title) и синхронизируется триггерами, поэтому изменения через
+bulk_create и update() тоже попадают в поиск. Миграции SQLite пересоздают
+таблицу произведений вместе с её триггерами, поэтому ensure_search_index()
+вызывается после каждого migrate и восстанавливает их.
+
+На других СУБД поиск сводится к icontains по тем же полям.
+"""
+import re
+
+from django.db import connections
+from django.db.models import Q
+
+FTS_TABLE = 'reviews_title_fts'
+TITLE_TABLE = 'reviews_title'
+# Вес совпадения в названии относительно совпадения в описании.
+NAME_WEIGHT = 10.0
+MAX_TERMS = 10
+
+TRIGGERS = {
+    f'{FTS_TABLE}_insert': f'''
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_insert
+        AFTER INSERT ON {TITLE_TABLE} BEGIN
+            INSERT INTO {FTS_TABLE}(rowid, name, description)
+            VALUES (new.id, new.name, new.description);
+        END
+    ''',
+    f'{FTS_TABLE}_delete': f'''
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete
+        AFTER DELETE ON {TITLE_TABLE} BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description)
+            VALUES ('delete', old.id, old.name, old.description);
+        END
+    ''',
+    f'{FTS_TABLE}_update': f'''
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_update
+        AFTER UPDATE OF name, description ON {TITLE_TABLE} BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description)
+            VALUES ('delete', old.id, old.name, old.description);
+            INSERT INTO {FTS_TABLE}(rowid, name, description)
+            VALUES (new.id, new.name, new.description);
+        END
+    ''',
+}
+
+
+def is_supported(connection):
+    return connection.vendor == 'sqlite'
+
+
+def ensure_search_index(connection):
+    """Создаёт FTS-таблицу и триггеры, если их нет, и заполняет индекс."""
+    if not is_supported(connection):
+        return
+    names = [TITLE_TABLE, FTS_TABLE, *TRIGGERS]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT name FROM sqlite_master WHERE name IN ({})'.format(
+                ', '.join(['%s'] * len(names))
+            ),
+            names
+        )
+        existing = {name for name, in cursor.fetchall()}
+        if TITLE_TABLE not in existing or existing.issuperset(names):
+            return
+        cursor.execute(
+            f'CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5('
+            f"name, description, content='{TITLE_TABLE}', "
+            "content_rowid='id', tokenize='unicode61 remove_diacritics 2')"
+        )
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE}({FTS_TABLE}, rank) VALUES '
+            f"('rank', 'bm25({NAME_WEIGHT}, 1.0)')"
+        )
+        for sql in TRIGGERS.values():
+            cursor.execute(sql)
+        # Пока триггеров не было, индекс мог разойтись с таблицей.
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"
+        )
+
+
+def drop_search_index(connection):
+    if not is_supported(connection):
+        return
+    with connection.cursor() as cursor:
+        for name in TRIGGERS:
+            cursor.execute(f'DROP TRIGGER IF EXISTS {name}')
+        cursor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+def get_terms(query):
+    return re.findall(r'\w+', query)[:MAX_TERMS]
+
+
+def search_titles(queryset, query):
+    """
+    Отбирает произведения, в названии или описании которых есть все слова
+    запроса (как префиксы), и сортирует их по релевантности.
+    """
+    terms = get_terms(query)
+    if not terms:
+        return queryset
+    if not is_supported(connections[queryset.db]):
+        condition = Q()
+        for term in terms:
+            condition &= (
+                Q(name__icontains=term) | Q(description__icontains=term)
+            )
+        return queryset.filter(condition)
+    match = ' '.join(f'"{term}"*' for term in terms)
+    return queryset.extra(
+        tables=[FTS_TABLE],
+        where=[
+            f'{FTS_TABLE}.rowid = {TITLE_TABLE}.id',
+            f'{FTS_TABLE} MATCH %s',
+        ],
+        params=[match],
+        select={'search_rank': f'{FTS_TABLE}.rank'},
+    ).order_by('search_rank', 'name', 'id')
@@ -0,0 +1,92 @@
+from django.db.models.signals import post_delete, post_init, post_save
+from django.db.models import Q
+from django.dispatch import receiver
+from django.utils import timezone
+
+from reviews.counters import apply_comment_delta
+from reviews.models import Comment, Review, Title, User
+from reviews.ratings import apply_rating_delta, rebuild_ratings
+
+
+def _remember_rating(review):
+    # Отложенные через only()/defer() поля не читаем, чтобы не получить
+    # лишний запрос к БД на каждый загруженный отзыв.
+    review._rating_snapshot = (
+        review.__dict__.get('title_id'), review.__dict__.get('score')
+    )
+
+
+@receiver(post_init, sender=Review)
+def review_loaded(sender, instance, **kwargs):
+    _remember_rating(instance)
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, created, **kwargs):
+    title_id, score = instance.title_id, instance.score
+    if created:
+        apply_rating_delta(title_id, score, 1)
+    else:
+        old_title_id, old_score = instance._rating_snapshot
+        if old_title_id is None or old_score is None:
+            rebuild_ratings(Title.objects.filter(pk=title_id))
+            apply_rating_delta(title_id)
+        elif old_title_id != title_id:
+            apply_rating_delta(old_title_id, -old_score, -1)
+            apply_rating_delta(title_id, score, 1)
+        else:
+            # Даже без смены оценки отмечаем изменение произведения:
+            # от changed_at зависят ETag и Last-Modified списка отзывов.
+            apply_rating_delta(title_id, score - old_score)
+    _remember_rating(instance)
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    # Вызывается и при каскадном удалении отзывов вместе с пользователем
+    # или произведением: Collector отправляет post_delete для каждого.
+    title_id, score = instance._rating_snapshot
+    if score is None:
+        rebuild_ratings(Title.objects.filter(pk=title_id))
+        apply_rating_delta(title_id)
+    else:
+        apply_rating_delta(title_id, -score, -1)
+
+
+def _touch_title(comment):
+    Title.objects.filter(reviews=comment.review_id).update(
+        changed_at=timezone.now()
+    )
+
+
+@receiver(post_save, sender=Comment)
+def comment_saved(sender, instance, created, **kwargs):
+    if created:
+        apply_comment_delta(instance.review_id, 1)
+    _touch_title(instance)
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, **kwargs):
+    # При каскадном удалении отзыва обновляется строка, которая сразу
+    # после этого будет удалена; это дешевле, чем отличать такой случай.
+    apply_comment_delta(instance.review_id, -1)
+    _touch_title(instance)
+
+
+@receiver(post_init, sender=User)
+def user_loaded(sender, instance, **kwargs):
+    instance._username_snapshot = instance.__dict__.get('username')
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created, **kwargs):
+    # Имя автора входит в ответы отзывов и комментариев, а их ETag
+    # зависит только от changed_at произведения.
+    old_username = instance._username_snapshot
+    if not created and old_username not in (None, instance.username):
+        Title.objects.filter(
+            Q(reviews__author=instance)
+            | Q(reviews__comments__author=instance)
+        ).update(changed_at=timezone.now())
+    instance._username_snapshot = instance.username
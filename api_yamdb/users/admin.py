@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 
-from .models import User
+from .models import OutgoingEmail, User
 
 
 class UserAdmin(BaseUserAdmin):
@@ -20,3 +20,14 @@ class UserAdmin(BaseUserAdmin):
 
 
 admin.site.register(User, UserAdmin)
+
+
+@admin.register(OutgoingEmail)
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    list_display = (
+        'to', 'subject', 'status', 'attempts', 'next_attempt_at', 'sent_at'
+    )
+    list_filter = ('status',)
+    search_fields = ('to',)
+    # Текст письма содержит код подтверждения.
+    exclude = ('message',)
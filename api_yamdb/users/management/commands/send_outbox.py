@@ -0,0 +1,55 @@
+from time import monotonic, sleep
+
+from django.core.management import BaseCommand
+from django.db import close_old_connections
+
+from users.outbox import MAX_ATTEMPTS, outbox_executor, process_batch
+
+
+class Command(BaseCommand):
+    help = 'Команда отправляет письма из очереди исходящих писем'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=100,
+            help='Сколько писем забирать из очереди за раз.'
+        )
+        parser.add_argument(
+            '--threads', type=int, default=4,
+            help='Сколько писем отправлять параллельно.'
+        )
+        parser.add_argument(
+            '--max-attempts', type=int, default=MAX_ATTEMPTS,
+            help='После скольких неудачных попыток письмо не отправлять.'
+        )
+        parser.add_argument(
+            '--poll-interval', type=float, default=5,
+            help='Пауза в секундах, когда очередь пуста.'
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Разобрать очередь и завершиться.'
+        )
+
+    def handle(self, *args, **options):
+        sent = failed = 0
+        started = monotonic()
+        with outbox_executor(options['threads']) as executor:
+            while True:
+                close_old_connections()
+                batch_sent, batch_failed = process_batch(
+                    options['batch_size'],
+                    executor=executor,
+                    max_attempts=options['max_attempts']
+                )
+                sent += batch_sent
+                failed += batch_failed
+                if batch_sent or batch_failed:
+                    continue
+                if options['once']:
+                    break
+                sleep(options['poll_interval'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Отправлено писем: {sent}, ошибок: {failed} '
+            f'за {monotonic() - started:.1f} с'
+        ))
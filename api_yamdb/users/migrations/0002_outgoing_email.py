@@ -0,0 +1,41 @@
+# Generated by Django 3.2 on 2026-10-18 20:54
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutgoingEmail',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('subject', models.CharField(max_length=255, verbose_name='Тема')),
+                ('message', models.TextField(verbose_name='Текст')),
+                ('from_email', models.EmailField(max_length=254, verbose_name='Отправитель')),
+                ('to', models.EmailField(max_length=254, verbose_name='Получатель')),
+                ('status', models.CharField(choices=[('pending', 'В очереди'), ('sending', 'Отправляется'), ('sent', 'Отправлено'), ('failed', 'Не отправлено')], default='pending', max_length=7, verbose_name='Статус')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Попыток')),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Следующая попытка')),
+                ('lock_token', models.CharField(blank=True, max_length=32, verbose_name='Метка обработчика')),
+                ('locked_until', models.DateTimeField(blank=True, null=True, verbose_name='Заблокировано до')),
+                ('last_error', models.TextField(blank=True, verbose_name='Последняя ошибка')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Создано')),
+                ('sent_at', models.DateTimeField(blank=True, null=True, verbose_name='Отправлено')),
+            ],
+            options={
+                'verbose_name': 'Исходящее письмо',
+                'verbose_name_plural': 'Исходящие письма',
+                'ordering': ('next_attempt_at',),
+            },
+        ),
+        migrations.AddIndex(
+            model_name='outgoingemail',
+            index=models.Index(fields=['status', 'next_attempt_at'], name='outgoing_email_due_idx'),
+        ),
+    ]
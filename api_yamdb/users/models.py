@@ -1,5 +1,6 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.utils import timezone
 
 from . import validators
 
@@ -42,6 +43,14 @@ class User(AbstractUser):
     def __str__(self):
         return str(self.username)
 
+    def refresh_from_db(self, using=None, fields=None):
+        # Пользователь из JWT загружен частично: при обращении к любому
+        # отложенному полю подгружаем их все одним запросом.
+        deferred_fields = self.get_deferred_fields()
+        if fields and deferred_fields.issuperset(fields):
+            fields = deferred_fields
+        super().refresh_from_db(using, fields)
+
     @property
     def is_admin(self):
         return (self.role == self.UserRole.ADMIN
@@ -51,3 +60,52 @@ class User(AbstractUser):
     @property
     def is_moderator(self):
         return self.role == self.UserRole.MODERATOR
+
+
+class OutgoingEmail(models.Model):
+    """Письмо в очереди на отправку (outbox)."""
+
+    class Status(models.TextChoices):
+
+        PENDING = 'pending', 'В очереди'
+        SENDING = 'sending', 'Отправляется'
+        SENT = 'sent', 'Отправлено'
+        FAILED = 'failed', 'Не отправлено'
+
+    subject = models.CharField('Тема', max_length=255)
+    message = models.TextField('Текст')
+    from_email = models.EmailField('Отправитель', max_length=MAX_LEN_EMAIL)
+    to = models.EmailField('Получатель', max_length=MAX_LEN_EMAIL)
+    status = models.CharField(
+        'Статус',
+        choices=Status.choices,
+        max_length=max(len(status) for status in Status.values),
+        default=Status.PENDING
+    )
+    attempts = models.PositiveSmallIntegerField('Попыток', default=0)
+    next_attempt_at = models.DateTimeField(
+        'Следующая попытка', default=timezone.now
+    )
+    lock_token = models.CharField(
+        'Метка обработчика', max_length=32, blank=True
+    )
+    locked_until = models.DateTimeField(
+        'Заблокировано до', null=True, blank=True
+    )
+    last_error = models.TextField('Последняя ошибка', blank=True)
+    created_at = models.DateTimeField('Создано', auto_now_add=True)
+    sent_at = models.DateTimeField('Отправлено', null=True, blank=True)
+
+    class Meta:
+        verbose_name = 'Исходящее письмо'
+        verbose_name_plural = 'Исходящие письма'
+        ordering = ('next_attempt_at',)
+        indexes = (
+            models.Index(
+                fields=('status', 'next_attempt_at'),
+                name='outgoing_email_due_idx'
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.to}: {self.subject}'
@@ -0,0 +1,139 @@
+"""Очередь исходящих писем.
+
+Запрос только записывает письмо в таблицу OutgoingEmail, а отправляет его
+обработчик `python manage.py send_outbox`. С настройкой MAIL_OUTBOX_EAGER
+письма отправляются сразу после фиксации транзакции, в том же процессе.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from users.models import OutgoingEmail
+
+Status = OutgoingEmail.Status
+
+MAX_ATTEMPTS = 5
+RETRY_DELAY = timedelta(seconds=30)
+MAX_RETRY_DELAY = timedelta(hours=1)
+LEASE = timedelta(minutes=5)
+
+
+def enqueue_mail(subject, message, recipient_list, from_email=None):
+    """Ставит письмо каждому получателю в очередь и возвращает записи."""
+    emails = [
+        OutgoingEmail.objects.create(
+            subject=subject,
+            message=message,
+            from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+            to=recipient
+        )
+        for recipient in recipient_list
+    ]
+    if getattr(settings, 'MAIL_OUTBOX_EAGER', False):
+        ids = [email.pk for email in emails]
+        transaction.on_commit(lambda: process_batch(len(ids), ids=ids))
+    return emails
+
+
+def claim_batch(batch_size, lease=LEASE, ids=None):
+    """
+    Забирает пачку писем, готовых к отправке.
+
+    Письма помечаются уникальной меткой одним UPDATE с повторной проверкой
+    условий, поэтому несколько обработчиков не получат одно письмо дважды.
+    Письма, чья аренда истекла (обработчик упал), забираются повторно.
+    """
+    now = timezone.now()
+    due = (
+        Q(status=Status.PENDING, next_attempt_at__lte=now)
+        | Q(status=Status.SENDING, locked_until__lt=now)
+    )
+    if ids is not None:
+        due &= Q(pk__in=ids)
+    ids = list(
+        OutgoingEmail.objects.filter(due).order_by(
+            'next_attempt_at'
+        ).values_list('pk', flat=True)[:batch_size]
+    )
+    if not ids:
+        return []
+    token = uuid4().hex
+    OutgoingEmail.objects.filter(due, pk__in=ids).update(
+        status=Status.SENDING, lock_token=token, locked_until=now + lease
+    )
+    return list(OutgoingEmail.objects.filter(lock_token=token))
+
+
+def deliver(email):
+    """Отправляет одно письмо и возвращает текст ошибки или None."""
+    try:
+        with get_connection() as connection:
+            EmailMessage(
+                subject=email.subject,
+                body=email.message,
+                from_email=email.from_email,
+                to=[email.to],
+                connection=connection
+            ).send()
+    except Exception as error:
+        return f'{type(error).__name__}: {error}'
+    return None
+
+
+def retry_delay(attempts):
+    return min(RETRY_DELAY * 2 ** (attempts - 1), MAX_RETRY_DELAY)
+
+
+def process_batch(batch_size, executor=None, max_attempts=MAX_ATTEMPTS,
+                  ids=None):
+    """
+    Отправляет одну пачку писем и сохраняет результат.
+
+    Неудачные письма откладываются с экспоненциальной задержкой, а после
+    `max_attempts` попыток помечаются как неотправленные. У отправленных и
+    неотправленных писем текст стирается: в нём коды подтверждения.
+    Возвращает пару (отправлено, ошибок).
+    """
+    emails = claim_batch(batch_size, ids=ids)
+    if not emails:
+        return 0, 0
+    if executor is None:
+        errors = [deliver(email) for email in emails]
+    else:
+        errors = list(executor.map(deliver, emails))
+    now = timezone.now()
+    for email, error in zip(emails, errors):
+        email.attempts += 1
+        email.lock_token = ''
+        email.locked_until = None
+        if error is None:
+            email.status = Status.SENT
+            email.sent_at = now
+            email.last_error = ''
+            email.message = ''
+        elif email.attempts >= max_attempts:
+            email.status = Status.FAILED
+            email.last_error = error
+            email.message = ''
+        else:
+            email.status = Status.PENDING
+            email.next_attempt_at = now + retry_delay(email.attempts)
+            email.last_error = error
+    OutgoingEmail.objects.bulk_update(emails, (
+        'status', 'attempts', 'lock_token', 'locked_until', 'sent_at',
+        'next_attempt_at', 'last_error', 'message'
+    ))
+    failed = sum(error is not None for error in errors)
+    return len(emails) - failed, failed
+
+
+def outbox_executor(threads):
+    return ThreadPoolExecutor(
+        max_workers=threads, thread_name_prefix='outbox'
+    )
@@ -0,0 +1,298 @@
+"""Синтетические данные для нагрузочных тестов.
+
+Создаёт категории, жанры, пользователей, произведения, отзывы и комментарии
+с неравномерным, как в жизни, распределением: популярность произведений,
+отзывов и активность пользователей подчиняются закону Ципфа, оценки смещены
+к высоким, годы выпуска — к недавним. Данные загружаются через BulkLoader
+пачками и генерируются на лету, поэтому объём (от 10 тыс. до 10 млн строк)
+ограничен только диском. При одном и том же --seed данные одинаковы.
+
+    python benchmarks/datagen.py --rows 100000 --db bench.sqlite3
+    DB_NAME=api_yamdb_bench python benchmarks/datagen.py --profile postgresql
+
+Таблицы должны быть пустыми; --truncate очищает их перед загрузкой.
+"""
+import argparse
+import random
+import sys
+from datetime import datetime, timedelta, timezone
+from math import ceil, floor
+from pathlib import Path
+from time import perf_counter
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.db_writes import PROFILES, setup_django  # noqa
+
+# Доли строк каждой таблицы от общего объёма.
+SHARES = {
+    'users': 0.04,
+    'titles': 0.04,
+    'genre_title': 0.08,
+    'reviews': 0.5,
+    'comments': 0.34,
+}
+CATEGORIES = (
+    ('Фильм', 'movie', 40), ('Книга', 'book', 30), ('Музыка', 'music', 15),
+    ('Сериал', 'series', 8), ('Игра', 'game', 4), ('Спектакль', 'play', 3),
+)
+GENRES = 30
+# Относительная частота оценок 1..10.
+SCORE_WEIGHTS = (2, 1, 2, 3, 5, 8, 12, 16, 14, 10)
+WORDS = (
+    'мастер', 'маргарита', 'война', 'мир', 'преступление', 'наказание',
+    'идиот', 'братья', 'отцы', 'дети', 'тихий', 'дон', 'белая', 'гвардия',
+    'собачье', 'сердце', 'золотой', 'телёнок', 'двенадцать', 'стульев',
+    'мёртвые', 'души', 'герой', 'нашего', 'времени', 'капитанская', 'дочка',
+    'вишнёвый', 'сад', 'чайка', 'гроза', 'обломов', 'анна', 'каренина',
+)
+TITLE_EXPONENT = 1.1
+REVIEW_EXPONENT = 1.2
+USER_EXPONENT = 0.8
+GENRE_EXPONENT = 1.0
+PERIOD = timedelta(days=3 * 365)
+# Доля произведений, которую один пользователь может оценить.
+MAX_USER_SHARE = 0.05
+
+
+def zipf_rank(rng, n, exponent):
+    """Ранг 0..n-1 с вероятностью ~ 1 / (ранг + 1) ** exponent."""
+    u = rng.random()
+    if exponent == 1:
+        x = (n + 1) ** u
+    else:
+        a = 1 - exponent
+        x = (1 + u * ((n + 1) ** a - 1)) ** (1 / a)
+    return min(int(x) - 1, n - 1)
+
+
+def scatter(rank, n):
+    """
+    Переводит ранг популярности в id 1..n так, чтобы популярные объекты
+    не шли подряд.
+    """
+    step = 7919 if n % 7919 else 104729
+    return rank * step % n + 1
+
+
+def get_counts(rows):
+    counts = {
+        name: max(1, int(rows * share)) for name, share in SHARES.items()
+    }
+    counts['genre_title'] = max(counts['titles'], counts['genre_title'])
+    return counts
+
+
+class DataGenerator:
+    """Генераторы строк для BulkLoader.load_rows() по таблицам."""
+
+    def __init__(self, rows, seed=0, now=None):
+        self.counts = get_counts(rows)
+        self.rng = random.Random(seed)
+        self.now = now or datetime.now(timezone.utc).replace(microsecond=0)
+        self.started = self.now - PERIOD
+        self.review_total = 0
+
+    def text(self, words):
+        return ' '.join(self.rng.choices(WORDS, k=words)).capitalize()
+
+    def review_date(self, review_id):
+        # Равномерно по периоду без хранения дат: комментарию нужна дата
+        # его отзыва.
+        return self.started + PERIOD * ((review_id * 0.6180339887) % 1)
+
+    def categories(self):
+        for number, (name, slug, _) in enumerate(CATEGORIES, 1):
+            yield {'id': number, 'name': name, 'slug': slug}
+
+    def genres(self):
+        for number in range(1, GENRES + 1):
+            yield {
+                'id': number, 'name': f'Жанр {number}',
+                'slug': f'genre-{number}'
+            }
+
+    def users(self):
+        for number in range(1, self.counts['users'] + 1):
+            if number == 1:
+                role = 'admin'
+            elif number % 100 == 0:
+                role = 'moderator'
+            else:
+                role = 'user'
+            yield {
+                'id': number, 'username': f'user{number}',
+                'email': f'user{number}@bench.yamdb.fake', 'role': role,
+            }
+
+    def titles(self):
+        weights = [weight for _, _, weight in CATEGORIES]
+        categories = range(1, len(CATEGORIES) + 1)
+        year = self.now.year
+        for number in range(1, self.counts['titles'] + 1):
+            age = min(int(self.rng.expovariate(1 / 15)), 120)
+            yield {
+                'id': number,
+                'name': f'{self.text(self.rng.randint(1, 3))} {number}',
+                'year': year - age,
+                'category': self.rng.choices(categories, weights)[0],
+                'description': (
+                    self.text(self.rng.randint(5, 40))
+                    if self.rng.random() < 0.7 else ''
+                ),
+            }
+
+    def genre_title(self):
+        titles = self.counts['titles']
+        # В среднем столько жанров на произведение, чтобы получить
+        # заданное число связей.
+        mean = self.counts['genre_title'] / titles
+        number = 0
+        for title in range(1, titles + 1):
+            genres = set()
+            for _ in range(max(1, round(self.rng.gauss(mean, 0.7)))):
+                genres.add(zipf_rank(self.rng, GENRES, GENRE_EXPONENT) + 1)
+            for genre in sorted(genres):
+                number += 1
+                yield {'id': number, 'title_id': title, 'genre_id': genre}
+
+    def user_review_counts(self):
+        """Число отзывов пользователя по его рангу активности."""
+        users = self.counts['users']
+        weights = [(rank + 1) ** -USER_EXPONENT for rank in range(users)]
+        titles = self.counts['titles']
+        # На малых объёмах доля произведений слишком мала: не меньше
+        # четырёх средних, иначе отзывов не хватит.
+        average = ceil(self.counts['reviews'] / users)
+        limit = min(titles, max(int(titles * MAX_USER_SHARE), 4 * average))
+        # Самые активные упираются в limit; подбираем множитель так, чтобы
+        # остальные добрали заданное число отзывов.
+        low, high = 0.0, float(limit / weights[-1])
+        for _ in range(50):
+            scale = (low + high) / 2
+            total = sum(min(limit, scale * weight) for weight in weights)
+            if total < self.counts['reviews']:
+                low = scale
+            else:
+                high = scale
+        for rank, weight in enumerate(weights):
+            count = min(limit, high * weight)
+            count = floor(count) + (self.rng.random() < count % 1)
+            yield scatter(rank, users), count
+
+    def reviews(self):
+        titles = self.counts['titles']
+        number = 0
+        for author, count in self.user_review_counts():
+            # Один отзыв на произведение от автора (`unique review`).
+            chosen = set()
+            while len(chosen) < count:
+                chosen.add(
+                    scatter(zipf_rank(self.rng, titles, TITLE_EXPONENT),
+                            titles)
+                )
+            for title in chosen:
+                number += 1
+                yield {
+                    'id': number, 'title_id': title, 'author_id': author,
+                    'text': self.text(self.rng.randint(3, 60)),
+                    'score': self.rng.choices(
+                        range(1, 11), SCORE_WEIGHTS
+                    )[0],
+                    'pub_date': self.review_date(number),
+                }
+        self.review_total = number
+
+    def comments(self):
+        reviews = self.review_total or self.counts['reviews']
+        users = self.counts['users']
+        for number in range(1, self.counts['comments'] + 1):
+            review = scatter(
+                zipf_rank(self.rng, reviews, REVIEW_EXPONENT), reviews
+            )
+            published = self.review_date(review)
+            yield {
+                'id': number, 'review_id': review,
+                'author_id': scatter(
+                    zipf_rank(self.rng, users, USER_EXPONENT), users
+                ),
+                'text': self.text(self.rng.randint(2, 30)),
+                'pub_date': published + (self.now - published) * (
+                    self.rng.random() ** 3
+                ),
+            }
+
+
+def generate(rows, seed=0, batch_size=5000, truncate=False, progress=None):
+    """Загружает данные в БД по умолчанию и возвращает [LoadStats]."""
+    from django.contrib.auth import get_user_model
+    from django.db import transaction
+
+    from reviews.bulk_loader import BulkLoader
+    from reviews.counters import rebuild_comment_counts
+    from reviews.models import Category, Comment, Genre, GenreTitle, Review
+    from reviews.models import Title
+    from reviews.ratings import rebuild_ratings
+
+    User = get_user_model()
+    generator = DataGenerator(rows, seed)
+    tables = (
+        (Category, generator.categories),
+        (Genre, generator.genres),
+        (User, generator.users),
+        (Title, generator.titles),
+        (GenreTitle, generator.genre_title),
+        (Review, generator.reviews),
+        (Comment, generator.comments),
+    )
+    models = [model for model, _ in tables]
+    loader = BulkLoader(batch_size=batch_size, progress=progress)
+    stats = []
+    with transaction.atomic():
+        if truncate:
+            loader.truncate(reversed(models))
+        elif any(model.objects.exists() for model in models):
+            raise ValueError(
+                'Таблицы не пустые: используйте --truncate или новую БД.'
+            )
+        for model, rows_of in tables:
+            stats.append(loader.load_rows(model, rows_of()))
+        rebuild_ratings()
+        rebuild_comment_counts()
+        loader.reset_sequences(models)
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10000,
+                        help='Примерное общее число строк.')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--batch-size', type=int, default=5000)
+    parser.add_argument('--profile', choices=PROFILES[1:], default='sqlite')
+    parser.add_argument('--db', default='bench.sqlite3',
+                        help='Файл БД SQLite.')
+    parser.add_argument('--truncate', action='store_true')
+    options = parser.parse_args(argv)
+    setup_django(options.profile, str(Path(options.db).resolve()))
+    from django.core.management import call_command
+
+    call_command('migrate', verbosity=0)
+    started = perf_counter()
+    try:
+        stats = generate(
+            options.rows, options.seed, options.batch_size, options.truncate
+        )
+    except ValueError as error:
+        parser.exit(1, f'{error}\n')
+    for table in stats:
+        print(
+            f'{str(table.model._meta.verbose_name_plural):20} {table.rows:10} '
+            f'строк  {table.rows_per_second:10.0f} строк/с'
+        )
+    print(f'всего: {sum(table.rows for table in stats)} строк за '
+          f'{perf_counter() - started:.1f} с')
+
+
+if __name__ == '__main__':
+    main()
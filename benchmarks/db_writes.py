@@ -0,0 +1,143 @@
+"""Пропускная способность конкурентной записи при разных профилях БД.
+
+Несколько потоков параллельно создают комментарии к одному отзыву: каждая
+запись — это INSERT комментария и UPDATE счётчика отзыва и времени изменения
+произведения в сигналах, то есть обычный путь записи API.
+
+    python benchmarks/db_writes.py --profile sqlite-default
+    python benchmarks/db_writes.py --profile sqlite
+    DB_NAME=api_yamdb_bench python benchmarks/db_writes.py --profile postgresql
+
+Для SQLite создаётся временный файл БД. Для PostgreSQL используется БД из
+переменных окружения DB_* (см. settings.py); тестовые данные удаляются в
+конце.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+from pathlib import Path
+from time import perf_counter
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent / 'api_yamdb'
+PROFILES = ('sqlite-default', 'sqlite', 'postgresql')
+
+
+def setup_django(profile, path):
+    sys.path.insert(0, str(PROJECT_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+    os.environ['DB_PROFILE'] = (
+        'postgresql' if profile == 'postgresql' else 'sqlite'
+    )
+    if profile != 'postgresql':
+        os.environ['DB_NAME'] = path
+    import django
+    from django.conf import settings
+
+    django.setup()
+    if profile == 'sqlite-default':
+        # Настройки SQLite по умолчанию: журнал отката, synchronous=FULL.
+        settings.SQLITE_PRAGMAS = {}
+
+
+def create_fixtures():
+    from django.contrib.auth import get_user_model
+
+    from reviews.models import Category, Review, Title
+
+    user = get_user_model().objects.create(
+        username='bench_writer', email='bench_writer@example.com'
+    )
+    category = Category.objects.create(name='Бенчмарк', slug='bench-writes')
+    title = Title.objects.create(name='Бенчмарк', year=2000,
+                                 category=category)
+    review = Review.objects.create(title=title, author=user, text='-',
+                                   score=5)
+    return user, review
+
+
+def writer(user, review, writes, stats, barrier):
+    from django.db import OperationalError, connection
+
+    from reviews.models import Comment
+
+    done = errors = 0
+    barrier.wait()
+    try:
+        for _ in range(writes):
+            try:
+                Comment.objects.create(review=review, author=user, text='-')
+                done += 1
+            except OperationalError:
+                # "database is locked" и т.п.
+                errors += 1
+    finally:
+        connection.close()
+    with stats['lock']:
+        stats['done'] += done
+        stats['errors'] += errors
+
+
+def run(threads, writes):
+    from django.core.management import call_command
+    from django.db import connection
+
+    call_command('migrate', verbosity=0)
+    user, review = create_fixtures()
+    mode = 'n/a'
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA journal_mode')
+            mode = cursor.fetchone()[0]
+    connection.close()
+    stats = {'done': 0, 'errors': 0, 'lock': threading.Lock()}
+    barrier = threading.Barrier(threads + 1)
+    workers = [
+        threading.Thread(
+            target=writer, args=(user, review, writes, stats, barrier)
+        )
+        for _ in range(threads)
+    ]
+    for worker in workers:
+        worker.start()
+    barrier.wait()
+    started = perf_counter()
+    for worker in workers:
+        worker.join()
+    elapsed = perf_counter() - started
+    review.refresh_from_db()
+    consistent = review.comment_count == stats['done']
+    user.delete()
+    review.title.category.delete()
+    review.title.delete()
+    return {
+        'vendor': connection.vendor,
+        'journal_mode': mode,
+        'writes': stats['done'],
+        'errors': stats['errors'],
+        'seconds': elapsed,
+        'writes_per_second': stats['done'] / elapsed if elapsed else 0.0,
+        'counter_consistent': consistent,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--profile', choices=PROFILES, default='sqlite')
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--writes', type=int, default=200,
+                        help='Записей на поток.')
+    options = parser.parse_args(argv)
+    with tempfile.TemporaryDirectory() as directory:
+        setup_django(options.profile, os.path.join(directory, 'bench.sqlite3'))
+        result = run(options.threads, options.writes)
+    print(f'profile: {options.profile}, threads: {options.threads}')
+    for key, value in result.items():
+        if isinstance(value, float):
+            value = f'{value:.2f}'
+        print(f'  {key}: {value}')
+
+
+if __name__ == '__main__':
+    main()
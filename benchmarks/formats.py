@@ -0,0 +1,63 @@
+"""Размер и скорость кодирования/декодирования JSON, MessagePack и CBOR.
+
+Страницы из 1000 произведений и отзывов (как в benchmarks/render.py)
+кодируются рендерерами API и декодируются соответствующими парсерами.
+
+    python benchmarks/formats.py [--items 1000] [--repeat 30]
+"""
+import argparse
+import io
+import sys
+from pathlib import Path
+from timeit import repeat
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.render import review_page, setup_django, title_page  # noqa
+
+
+def best_time(func, times):
+    return min(repeat(func, number=1, repeat=times)) * 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--items', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=30)
+    options = parser.parse_args(argv)
+    setup_django()
+    from api.negotiation import is_available
+    from api.parsers import CBORParser, FastJSONParser, MessagePackParser
+    from api.renderers import (
+        CBORRenderer, FastJSONRenderer, MessagePackRenderer
+    )
+
+    formats = [
+        ('json', FastJSONRenderer(), FastJSONParser()),
+        ('msgpack', MessagePackRenderer(), MessagePackParser()),
+        ('cbor', CBORRenderer(), CBORParser()),
+    ]
+    pages = {
+        'titles': title_page(options.items),
+        'reviews': review_page(options.items),
+    }
+    print(f'{"":8} {"формат":8} {"размер":>10} {"encode":>10} {"decode":>10}')
+    for page_name, data in pages.items():
+        for name, renderer, format_parser in formats:
+            if not is_available(renderer):
+                print(f'{page_name:8} {name:8} библиотека не установлена')
+                continue
+            content = renderer.render(data)
+            encode = best_time(lambda: renderer.render(data), options.repeat)
+            decode = best_time(
+                lambda: format_parser.parse(io.BytesIO(content)),
+                options.repeat
+            )
+            print(
+                f'{page_name:8} {name:8} {len(content) / 1024:7.0f} KiB '
+                f'{encode:7.2f} ms {decode:7.2f} ms'
+            )
+
+
+if __name__ == '__main__':
+    main()
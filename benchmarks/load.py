@@ -0,0 +1,471 @@
+"""Нагрузочный прогон всех маршрутов API.
+
+Запросы выполняются в несколько потоков либо внутри процесса через
+тестовый клиент Django, либо к запущенному серверу (--url). Для каждого
+сценария считаются p50/p95/p99 времени ответа, ошибки и число запросов к
+БД на запрос (только внутри процесса), а также общая пропускная
+способность. Результат — JSON, который можно сравнить с прошлым прогоном.
+
+    python benchmarks/datagen.py --rows 100000 --db bench.sqlite3
+    python benchmarks/load.py --db bench.sqlite3 --output before.json
+    python benchmarks/load.py --db bench.sqlite3 --compare before.json
+
+Для прогона против сервера он должен работать с той же БД:
+
+    DB_NAME=bench.sqlite3 python api_yamdb/manage.py runserver --noreload
+    python benchmarks/load.py --db bench.sqlite3 --url http://127.0.0.1:8000
+
+Изменяющие запросы (регистрация, комментарии, удаление жанров и
+категорий) выполняются только с --writes.
+"""
+import argparse
+import json
+import queue
+import random
+import sys
+import threading
+import urllib.error
+import urllib.request
+from collections import Counter, defaultdict
+from contextlib import ExitStack
+from math import ceil
+from pathlib import Path
+from statistics import mean
+from time import perf_counter
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.db_writes import PROFILES, setup_django  # noqa
+
+API = '/api/v1/'
+SAMPLE_SIZE = 200
+PERCENTILES = (50, 95, 99)
+
+
+class Scenario:
+    """
+    Запрос к маршруту `route` (имя из api/urls.py).
+
+    build(context, rng) возвращает (метод, путь, тело); всё, что нужно
+    подготовить в БД, build делает сам — это время не измеряется.
+    """
+
+    def __init__(self, name, route, build, auth=None, write=False):
+        self.name = name
+        self.route = route
+        self.build = build
+        self.auth = auth
+        self.write = write
+
+
+def get(path):
+    return lambda context, rng: ('GET', path.format(**context.pick(rng)), None)
+
+
+def signup(context, rng):
+    number = rng.getrandbits(48)
+    return 'POST', f'{API}auth/signup/', {
+        'username': f'load{number}', 'email': f'load{number}@bench.fake'
+    }
+
+
+def get_token(context, rng):
+    return 'POST', f'{API}auth/token/', {
+        'username': context.user.username,
+        'confirmation_code': context.confirmation_code,
+    }
+
+
+def create_comment(context, rng):
+    values = context.pick(rng)
+    return (
+        'POST',
+        f'{API}titles/{values["title"]}/reviews/{values["review"]}/comments/',
+        {'text': 'Комментарий нагрузочного теста'}
+    )
+
+
+def delete_slug(model_name):
+    def build(context, rng):
+        model = context.models[model_name]
+        slug = f'load-{rng.getrandbits(48)}'
+        model.objects.create(name=slug, slug=slug)
+        return 'DELETE', f'{API}{model_name}/{slug}/', None
+    return build
+
+
+SCENARIOS = (
+    Scenario('api-root', 'api-root', get(API), auth='user'),
+    Scenario('titles-list', 'titles-list',
+             get(API + 'titles/?offset={offset}')),
+    Scenario('titles-cursor', 'titles-list',
+             get(API + 'titles/?pagination=cursor&limit=20')),
+    Scenario('titles-filter', 'titles-list',
+             get(API + 'titles/?genre={genre}&year={year}')),
+    Scenario('titles-search', 'titles-list',
+             get(API + 'titles/?search={word}')),
+    Scenario('titles-fields', 'titles-list',
+             get(API + 'titles/?fields=id,name,rating,genre&limit=100')),
+    Scenario('titles-detail', 'titles-detail',
+             get(API + 'titles/{title}/')),
+    Scenario('genres-list', 'genres-list', get(API + 'genres/')),
+    Scenario('categories-list', 'categories-list',
+             get(API + 'categories/')),
+    Scenario('reviews-list', 'reviews-list',
+             get(API + 'titles/{title}/reviews/')),
+    Scenario('reviews-detail', 'reviews-detail',
+             get(API + 'titles/{title}/reviews/{review}/')),
+    Scenario('comments-list', 'comments-list',
+             get(API + 'titles/{title}/reviews/{review}/comments/')),
+    Scenario('comments-detail', 'comments-detail',
+             get(API + 'titles/{comment_title}/reviews/{comment_review}/'
+                 'comments/{comment}/')),
+    Scenario('users-list', 'users-list', get(API + 'users/'), auth='admin'),
+    Scenario('users-detail', 'users-detail',
+             get(API + 'users/{username}/'), auth='admin'),
+    Scenario('users-me', 'users-update-user', get(API + 'users/me/'),
+             auth='user'),
+    Scenario('get-token', 'get_token', get_token),
+    Scenario('export', 'export', get(API + 'export/genres.ndjson'),
+             auth='admin'),
+    Scenario('signup', 'signup', signup, write=True),
+    Scenario('comments-create', 'comments-list', create_comment,
+             auth='user', write=True),
+    Scenario('genres-delete', 'genres-detail', delete_slug('genres'),
+             auth='admin', write=True),
+    Scenario('categories-delete', 'categories-detail',
+             delete_slug('categories'), auth='admin', write=True),
+)
+
+
+def route_names():
+    """Имена всех маршрутов api/urls.py."""
+    from api.urls import urlpatterns
+
+    names = set()
+    patterns = list(urlpatterns)
+    while patterns:
+        pattern = patterns.pop()
+        if hasattr(pattern, 'url_patterns'):
+            patterns.extend(pattern.url_patterns)
+        elif pattern.name:
+            names.add(pattern.name)
+    return names
+
+
+class Context:
+    """Случайные существующие объекты для подстановки в пути запросов."""
+
+    def __init__(self):
+        from django.contrib.auth import get_user_model
+        from django.contrib.auth.tokens import default_token_generator
+
+        from api.tokens import ClaimsAccessToken
+        from reviews.models import Category, Comment, Genre, Review, Title
+        from reviews.search import get_terms
+
+        User = get_user_model()
+        self.models = {'genres': Genre, 'categories': Category}
+        admin = User.objects.filter(role='admin').first()
+        self.user = User.objects.filter(role='user').first()
+        if admin is None or self.user is None or not Title.objects.exists():
+            raise ValueError(
+                'В БД нет данных: заполните её через benchmarks/datagen.py.'
+            )
+        self.tokens = {
+            'admin': str(ClaimsAccessToken.for_user(admin)),
+            'user': str(ClaimsAccessToken.for_user(self.user)),
+        }
+        self.confirmation_code = default_token_generator.make_token(
+            self.user
+        )
+        self.titles = Title.objects.count()
+        self.reviews = self.sample(Review, 'id', 'title_id')
+        self.comments = self.sample(Comment, 'id', 'review_id',
+                                    'review__title_id')
+        self.usernames = [
+            username for username, in self.sample(User, 'username')
+        ]
+        self.genres = list(Genre.objects.values_list('slug', flat=True))
+        self.years = list(
+            Title.objects.values_list('year', flat=True).distinct()
+        )
+        self.words = []
+        for name, in self.sample(Title, 'name'):
+            self.words.extend(get_terms(name))
+
+    def sample(self, model, *fields):
+        # Случайные id из диапазона вместо ORDER BY RANDOM() по всей таблице.
+        ids = model.objects.order_by('-pk').values_list('pk', flat=True)
+        last = ids.first() or 0
+        pks = random.Random(last).sample(
+            range(1, last + 1), min(last, SAMPLE_SIZE * 2)
+        )
+        rows = list(model.objects.filter(pk__in=pks).values_list(*fields))
+        return rows or list(model.objects.values_list(*fields)[:SAMPLE_SIZE])
+
+    def pick(self, rng):
+        review, title = rng.choice(self.reviews)
+        comment, comment_review, comment_title = rng.choice(self.comments)
+        return {
+            'offset': rng.randrange(0, max(1, self.titles - 10)),
+            'title': title,
+            'review': review,
+            'comment': comment,
+            'comment_review': comment_review,
+            'comment_title': comment_title,
+            'username': rng.choice(self.usernames),
+            'genre': rng.choice(self.genres),
+            'year': rng.choice(self.years),
+            'word': rng.choice(self.words),
+        }
+
+
+class InProcessClient:
+    """Тестовый клиент Django; считает запросы к БД всех псевдонимов."""
+
+    def __init__(self):
+        from django.test import Client
+
+        self.client = Client()
+
+    def request(self, method, path, data, token):
+        from django.db import connections
+
+        queries = 0
+
+        def count(execute, sql, params, many, context):
+            nonlocal queries
+            queries += 1
+            return execute(sql, params, many, context)
+
+        extra = {'HTTP_AUTHORIZATION': f'Bearer {token}'} if token else {}
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(count))
+            started = perf_counter()
+            response = self.client.generic(
+                method, path, json.dumps(data) if data else '',
+                content_type='application/json', **extra
+            )
+            if response.streaming:
+                b''.join(response.streaming_content)
+            elapsed = perf_counter() - started
+        return response.status_code, elapsed, queries
+
+    def close(self):
+        from django.db import connections
+
+        connections.close_all()
+
+
+class HTTPClient:
+    """Запросы к запущенному серверу; число запросов к БД неизвестно."""
+
+    def __init__(self, url):
+        self.url = url.rstrip('/')
+
+    def request(self, method, path, data, token):
+        headers = {'Content-Type': 'application/json'}
+        if token:
+            headers['Authorization'] = f'Bearer {token}'
+        request = urllib.request.Request(
+            self.url + path, method=method, headers=headers,
+            data=json.dumps(data).encode() if data else None
+        )
+        started = perf_counter()
+        try:
+            with urllib.request.urlopen(request) as response:
+                response.read()
+                status = response.status
+        except urllib.error.HTTPError as error:
+            error.read()
+            status = error.code
+        return status, perf_counter() - started, None
+
+    def close(self):
+        from django.db import connections
+
+        connections.close_all()
+
+
+def percentile(values, percent):
+    ordered = sorted(values)
+    return ordered[max(0, ceil(percent / 100 * len(ordered)) - 1)]
+
+
+def summarize(samples):
+    timings = [elapsed * 1000 for _, elapsed, _ in samples]
+    statuses = Counter(str(status) for status, _, _ in samples)
+    queries = [count for _, _, count in samples if count is not None]
+    result = {
+        'requests': len(samples),
+        'errors': sum(1 for status, _, _ in samples if status >= 400),
+        'status': dict(sorted(statuses.items())),
+        'mean_ms': round(mean(timings), 3),
+    }
+    for percent in PERCENTILES:
+        result[f'p{percent}_ms'] = round(percentile(timings, percent), 3)
+    result['queries_per_request'] = (
+        round(mean(queries), 2) if queries else None
+    )
+    return result
+
+
+def worker(make_client, context, tasks, samples, seed):
+    client = make_client()
+    rng = random.Random(seed)
+    try:
+        while True:
+            try:
+                scenario, measured = tasks.get_nowait()
+            except queue.Empty:
+                break
+            method, path, data = scenario.build(context, rng)
+            token = context.tokens.get(scenario.auth)
+            sample = client.request(method, path, data, token)
+            if measured:
+                samples[scenario.name].append(sample)
+    finally:
+        client.close()
+
+
+def run(scenarios, make_client, requests, concurrency, warmup=1, seed=0):
+    context = Context()
+    rng = random.Random(seed)
+    tasks = queue.Queue()
+    for measured, count in ((False, warmup), (True, requests)):
+        batch = [
+            (scenario, measured) for scenario in scenarios
+            for _ in range(count)
+        ]
+        rng.shuffle(batch)
+        for task in batch:
+            tasks.put(task)
+    samples = defaultdict(list)
+    threads = [
+        threading.Thread(
+            target=worker,
+            args=(make_client, context, tasks, samples, seed + number)
+        )
+        for number in range(concurrency)
+    ]
+    started = perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = perf_counter() - started
+    routes = {
+        scenario.name: summarize(samples[scenario.name])
+        for scenario in scenarios if samples[scenario.name]
+    }
+    total = sum(route['requests'] for route in routes.values())
+    return {
+        'total': {
+            'requests': total,
+            'errors': sum(route['errors'] for route in routes.values()),
+            'seconds': round(elapsed, 3),
+            # Вместе с прогревом: он идёт в тех же потоках.
+            'requests_per_second': round(
+                (total + warmup * len(scenarios)) / elapsed, 1
+            ),
+        },
+        'routes': routes,
+    }
+
+
+def compare(result, baseline, tolerance):
+    """Сценарии, у которых p95 или число запросов к БД выросли."""
+    regressions = []
+    for name, route in result['routes'].items():
+        old = baseline['routes'].get(name)
+        if old is None:
+            continue
+        ratio = route['p95_ms'] / old['p95_ms'] if old['p95_ms'] else 1.0
+        queries = route['queries_per_request']
+        old_queries = old['queries_per_request']
+        more_queries = (
+            queries is not None and old_queries is not None
+            and queries > old_queries
+        )
+        print(
+            f'{name:20} p95 {old["p95_ms"]:9.2f} -> {route["p95_ms"]:9.2f} ms'
+            f'  x{ratio:.2f}  запросов к БД {old_queries} -> {queries}'
+        )
+        if ratio > 1 + tolerance or more_queries:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--profile', choices=PROFILES[1:], default='sqlite')
+    parser.add_argument('--db', default='bench.sqlite3',
+                        help='Файл БД SQLite.')
+    parser.add_argument('--url', help='Адрес запущенного сервера.')
+    parser.add_argument('--requests', type=int, default=50,
+                        help='Запросов на сценарий.')
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--warmup', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--writes', action='store_true',
+                        help='Выполнять также изменяющие запросы.')
+    parser.add_argument('--only', help='Сценарии через запятую.')
+    parser.add_argument('--output', help='Файл для результата в JSON.')
+    parser.add_argument('--compare', help='JSON прошлого прогона.')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='Допустимый рост p95 при сравнении.')
+    options = parser.parse_args(argv)
+    setup_django(options.profile, str(Path(options.db).resolve()))
+    from django.conf import settings
+
+    settings.DEBUG = False
+    scenarios = [
+        scenario for scenario in SCENARIOS
+        if options.writes or not scenario.write
+    ]
+    if options.only:
+        names = options.only.split(',')
+        scenarios = [
+            scenario for scenario in scenarios if scenario.name in names
+        ]
+    uncovered = route_names() - {scenario.route for scenario in SCENARIOS}
+    if uncovered:
+        print(f'Маршруты без сценариев: {", ".join(sorted(uncovered))}',
+              file=sys.stderr)
+    if options.url:
+        def make_client():
+            return HTTPClient(options.url)
+    else:
+        make_client = InProcessClient
+    try:
+        result = run(
+            scenarios, make_client, options.requests, options.concurrency,
+            options.warmup, options.seed
+        )
+    except ValueError as error:
+        parser.exit(1, f'{error}\n')
+    from django.db import connection
+
+    result['meta'] = {
+        'target': options.url or 'in-process',
+        'vendor': connection.vendor,
+        'concurrency': options.concurrency,
+        'requests_per_scenario': options.requests,
+        'seed': options.seed,
+    }
+    output = json.dumps(result, ensure_ascii=False, indent=2)
+    if options.output:
+        Path(options.output).write_text(output + '\n', encoding='utf-8')
+    else:
+        print(output)
+    if options.compare:
+        baseline = json.loads(Path(options.compare).read_text())
+        regressions = compare(result, baseline, options.tolerance)
+        if regressions:
+            parser.exit(1, f'Регрессии: {", ".join(regressions)}\n')
+
+
+if __name__ == '__main__':
+    main()
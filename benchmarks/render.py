@@ -0,0 +1,97 @@
+"""Время рендеринга JSON для страниц из 1000 произведений и отзывов.
+
+Сравнивает JSONRenderer DRF (json из стандартной библиотеки) и
+FastJSONRenderer (orjson) на данных той же формы, что отдают
+TitleReadSerializer и ReviewSerializer.
+
+    python benchmarks/render.py [--items 1000] [--repeat 50]
+"""
+import argparse
+import os
+import sys
+from collections import OrderedDict
+from pathlib import Path
+from timeit import repeat
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent / 'api_yamdb'
+
+
+def setup_django():
+    sys.path.insert(0, str(PROJECT_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+    import django
+
+    django.setup()
+
+
+def title_page(items):
+    return OrderedDict(
+        count=items, next=None, previous=None,
+        results=[OrderedDict(
+            id=idx,
+            name=f'Произведение {idx}',
+            year=1900 + idx % 120,
+            rating=idx % 10 + 1,
+            review_count=idx % 50,
+            description='Описание произведения ' * 5,
+            genre=[
+                OrderedDict(name='Драма', slug='drama'),
+                OrderedDict(name='Комедия', slug='comedy'),
+            ],
+            category=OrderedDict(name='Фильм', slug='movie'),
+        ) for idx in range(items)]
+    )
+
+
+def review_page(items):
+    return OrderedDict(
+        count=items, next=None, previous=None,
+        results=[OrderedDict(
+            id=idx,
+            text='Текст отзыва, достаточно длинный для реального. ' * 4,
+            author=f'user{idx}',
+            score=idx % 10 + 1,
+            pub_date='2023-02-01T10:20:30.123456Z',
+            comment_count=idx % 7,
+        ) for idx in range(items)]
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--items', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=50)
+    options = parser.parse_args(argv)
+    setup_django()
+    from rest_framework.renderers import JSONRenderer
+
+    from api.renderers import FastJSONRenderer, orjson
+
+    if orjson is None:
+        print('orjson не установлен: FastJSONRenderer использует json')
+    pages = {
+        'titles': title_page(options.items),
+        'reviews': review_page(options.items),
+    }
+    renderers = {
+        'JSONRenderer': JSONRenderer(),
+        'FastJSONRenderer': FastJSONRenderer(),
+    }
+    for page_name, data in pages.items():
+        timings = {}
+        for renderer_name, renderer in renderers.items():
+            best = min(repeat(
+                lambda: renderer.render(data), number=1,
+                repeat=options.repeat
+            ))
+            timings[renderer_name] = best
+            print(
+                f'{page_name:8} {renderer_name:17} {best * 1000:8.2f} ms  '
+                f'{len(renderer.render(data)) / 1024:.0f} KiB'
+            )
+        speedup = timings['JSONRenderer'] / timings['FastJSONRenderer']
+        print(f'{page_name:8} ускорение: x{speedup:.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""Сериализация страницы из 1000 произведений и отзывов: обычный путь DRF
+и быстрый путь api.fast (values() + группировка жанров).
+
+Данные создаются во временной БД SQLite. Время включает запросы к БД.
+
+    python benchmarks/serializers.py [--items 1000] [--repeat 10]
+"""
+import argparse
+import os
+import sys
+import tempfile
+from pathlib import Path
+from timeit import repeat
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.db_writes import setup_django  # noqa
+
+
+def create_data(items):
+    from django.contrib.auth import get_user_model
+
+    from reviews.models import Category, Genre, GenreTitle, Review, Title
+
+    User = get_user_model()
+    category = Category.objects.create(name='Фильм', slug='movie')
+    genres = Genre.objects.bulk_create(
+        Genre(name=f'Жанр {idx}', slug=f'genre-{idx}') for idx in range(5)
+    )
+    genres = list(Genre.objects.all())
+    Title.objects.bulk_create(
+        Title(name=f'Произведение {idx:05}', year=2000, category=category,
+              description='Описание произведения ' * 5)
+        for idx in range(items)
+    )
+    titles = list(Title.objects.all())
+    GenreTitle.objects.bulk_create(
+        GenreTitle(title=title, genre=genres[(title.pk + shift) % 5])
+        for title in titles for shift in range(2)
+    )
+    User.objects.bulk_create(
+        User(username=f'user{idx}', email=f'user{idx}@example.com')
+        for idx in range(items)
+    )
+    Review.objects.bulk_create(
+        Review(title=titles[0], author=user, text='Текст отзыва ' * 10,
+               score=user.pk % 10 + 1)
+        for user in User.objects.all()
+    )
+    return titles[0]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--items', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=10)
+    options = parser.parse_args(argv)
+    with tempfile.TemporaryDirectory() as directory:
+        setup_django('sqlite', os.path.join(directory, 'bench.sqlite3'))
+        from django.core.management import call_command
+
+        from api.fast import RowSerializer
+        from api.serializers import ReviewSerializer, TitleReadSerializer
+        from reviews.models import Review, Title
+
+        call_command('migrate', verbosity=0)
+        title = create_data(options.items)
+        cases = {
+            'titles': (
+                TitleReadSerializer,
+                Title.objects.select_related('category').prefetch_related(
+                    'genre'
+                ).order_by('name')[:options.items],
+            ),
+            'reviews': (
+                ReviewSerializer,
+                Review.objects.filter(title=title).select_related(
+                    'author'
+                ).order_by('pub_date')[:options.items],
+            ),
+        }
+        for name, (serializer_class, queryset) in cases.items():
+            row_serializer = RowSerializer(serializer_class())
+            columns = row_serializer.columns
+
+            def slow():
+                return serializer_class(queryset.all(), many=True).data
+
+            def fast():
+                return row_serializer.serialize(
+                    list(queryset.prefetch_related(None).values(*columns))
+                )
+
+            assert [dict(item) for item in slow()] == fast()
+            slow_time = min(repeat(slow, number=1, repeat=options.repeat))
+            fast_time = min(repeat(fast, number=1, repeat=options.repeat))
+            print(
+                f'{name:8} ModelSerializer {slow_time * 1000:8.2f} ms  '
+                f'RowSerializer {fast_time * 1000:7.2f} ms  '
+                f'x{slow_time / fast_time:.1f}'
+            )
+
+
+if __name__ == '__main__':
+    main()
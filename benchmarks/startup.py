@@ -0,0 +1,158 @@
+"""Время запуска и накладные расходы на запрос для разных настроек.
+
+Каждый прогон — отдельный процесс: он импортирует Django, загружает
+приложения, строит WSGI-приложение и отвечает на первый запрос (время до
+первого ответа), а затем повторяет запросы через WSGI-обработчик без
+тестового клиента. Сравниваются полные настройки api_yamdb.settings и
+настройки только для API api_yamdb.settings_api.
+
+    python benchmarks/startup.py [--runs 10] [--requests 2000]
+
+Для запросов создаётся временная БД SQLite с несколькими категориями.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent / 'api_yamdb'
+PROFILES = {
+    'full': 'api_yamdb.settings',
+    'api': 'api_yamdb.settings_api',
+}
+# Маршруты для замера накладных расходов: ответ из кэша, 404 и 401.
+PATHS = (
+    '/api/v1/categories/',
+    '/api/v1/missing/',
+    '/api/v1/users/me/',
+)
+
+
+def environ(path):
+    from io import BytesIO
+
+    return {
+        'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'QUERY_STRING': '',
+        'SERVER_NAME': 'testserver', 'SERVER_PORT': '80',
+        'HTTP_HOST': 'testserver', 'HTTP_ACCEPT': 'application/json',
+        'wsgi.input': BytesIO(), 'wsgi.url_scheme': 'http',
+        'wsgi.errors': sys.stderr, 'wsgi.multithread': False,
+        'wsgi.multiprocess': True, 'wsgi.run_once': False,
+    }
+
+
+def request(application, path):
+    status = []
+    response = application(
+        environ(path), lambda code, headers, *args: status.append(code)
+    )
+    try:
+        b''.join(response)
+    finally:
+        response.close()
+    return status[0]
+
+
+def child(requests):
+    """Замеры в текущем процессе; печатает JSON."""
+    started = perf_counter()
+    import django
+
+    django.setup()
+    from django.core.wsgi import get_wsgi_application
+
+    application = get_wsgi_application()
+    request(application, PATHS[0])
+    startup = perf_counter() - started
+    from django.conf import settings
+
+    settings.DEBUG = False
+    result = {'startup_ms': startup * 1000, 'modules': len(sys.modules)}
+    for path in PATHS:
+        request(application, path)
+        started = perf_counter()
+        for _ in range(requests):
+            request(application, path)
+        result[path] = (perf_counter() - started) / requests * 1e6
+    print(json.dumps(result))
+
+
+def run_child(settings_module, database, requests):
+    env = {
+        **os.environ,
+        'DJANGO_SETTINGS_MODULE': settings_module,
+        'DB_NAME': database,
+        'PYTHONPATH': str(PROJECT_DIR),
+    }
+    output = subprocess.run(
+        [sys.executable, __file__, '--child', '--requests', str(requests)],
+        env=env, check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def prepare(database):
+    script = (
+        'import django; django.setup()\n'
+        'from django.core.management import call_command\n'
+        'call_command("migrate", verbosity=0)\n'
+        'from reviews.models import Category\n'
+        'Category.objects.bulk_create(Category(name=f"Категория {i}", '
+        'slug=f"category-{i}") for i in range(10))\n'
+    )
+    subprocess.run(
+        [sys.executable, '-c', script], check=True,
+        env={
+            **os.environ, 'DJANGO_SETTINGS_MODULE': PROFILES['full'],
+            'DB_NAME': database, 'PYTHONPATH': str(PROJECT_DIR),
+        }
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10,
+                        help='Процессов на профиль настроек.')
+    parser.add_argument('--requests', type=int, default=2000,
+                        help='Запросов на маршрут в каждом процессе.')
+    parser.add_argument('--child', action='store_true',
+                        help=argparse.SUPPRESS)
+    options = parser.parse_args(argv)
+    if options.child:
+        child(options.requests)
+        return
+    with tempfile.TemporaryDirectory() as directory:
+        database = str(Path(directory) / 'startup.sqlite3')
+        prepare(database)
+        results = {name: [] for name in PROFILES}
+        # Профили чередуются, чтобы фоновые колебания нагрузки
+        # сказывались на обоих одинаково.
+        for _ in range(options.runs):
+            for name, settings_module in PROFILES.items():
+                results[name].append(
+                    run_child(settings_module, database, options.requests)
+                )
+    rows = {
+        'startup_ms': 'первый ответ, мс',
+        'modules': 'модулей загружено',
+        **{path: f'{path}, мкс' for path in PATHS},
+    }
+    print(f'{"":28}' + ''.join(f'{name:>10}' for name in PROFILES))
+    for column, title in rows.items():
+        values = [
+            statistics.median(run[column] for run in results[name])
+            for name in PROFILES
+        ]
+        print(
+            f'{title:28}' + ''.join(f'{value:10.0f}' for value in values)
+            + f'   x{values[0] / values[1]:.2f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
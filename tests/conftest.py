@@ -32,4 +32,7 @@ assert get_version() < '4.0.0', 'Пожалуйста, используйте в
 
 pytest_plugins = [
     'tests.fixtures.fixture_user',
+    'tests.fixtures.fixture_mail',
+    'tests.fixtures.fixture_cache',
+    'tests.fixtures.fixture_query_budget',
 ]
@@ -0,0 +1,9 @@
+import pytest
+from django.core.cache import caches
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    # Очистка тестовой БД не отправляет сигналы, сбрасывающие кэш ответов.
+    for cache in caches.all():
+        cache.clear()
@@ -0,0 +1,7 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def mail_outbox_eager(settings):
+    # Тесты регистрации ждут письмо сразу после запроса.
+    settings.MAIL_OUTBOX_EAGER = True
@@ -0,0 +1,36 @@
+import pytest
+
+from api_yamdb import querybudget
+
+session_violations = []
+
+
+@pytest.fixture(autouse=True)
+def check_query_budget():
+    # Запрос, превысивший бюджет вьюсета (query_budget), — ошибка теста.
+    querybudget.violations.clear()
+    yield
+    found = list(querybudget.violations)
+    querybudget.violations.clear()
+    if found:
+        session_violations.extend(found)
+        pytest.fail(
+            'Превышен бюджет запросов к БД:\n' + '\n'.join(
+                f'  {violation["method"]} {violation["path"]} '
+                f'({violation["view"]}): {violation["queries"]} > '
+                f'{violation["budget"]}, повторы: {violation["duplicates"]}'
+                for violation in found
+            ), pytrace=False
+        )
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not session_violations:
+        return
+    terminalreporter.section('Превышения бюджета запросов к БД')
+    for violation in session_violations:
+        terminalreporter.write_line(
+            f'{violation["view"]}: {violation["queries"]} > '
+            f'{violation["budget"]} ({violation["method"]} '
+            f'{violation["path"]})'
+        )
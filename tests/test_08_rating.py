@@ -0,0 +1,109 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def get_rating(self, client, title_id):
+        response = client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        )
+        assert response.status_code == HTTPStatus.OK
+        return response.json().get('rating')
+
+    def test_01_rating_follows_reviews(self, client, admin_client, admin,
+                                       user_client, user, moderator,
+                                       moderator_client):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        reviews, titles = create_reviews(admin_client, author_map)
+        title_id = titles[0]['id']
+        assert self.get_rating(client, title_id) == 5, (
+            'Проверьте, что рейтинг произведения обновляется при создании '
+            'отзыва.'
+        )
+
+        response = user_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=reviews[1]['id']
+            ),
+            data={'score': 8}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert self.get_rating(client, title_id) == 6, (
+            'Проверьте, что рейтинг произведения обновляется при изменении '
+            'оценки в отзыве.'
+        )
+
+        response = admin_client.delete(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=reviews[0]['id']
+            )
+        )
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert self.get_rating(client, title_id) == 6, (
+            'Проверьте, что рейтинг произведения обновляется при удалении '
+            'отзыва.'
+        )
+
+        user.delete()
+        moderator.delete()
+        assert self.get_rating(client, title_id) is None, (
+            'Проверьте, что рейтинг произведения обновляется при каскадном '
+            'удалении отзывов вместе с их авторами.'
+        )
+
+    def test_02_save_keeps_rating(self, client, admin_client, admin,
+                                  user_client, user):
+        from reviews.models import Title
+
+        reviews, titles = create_reviews(
+            admin_client, {admin: admin_client}
+        )
+        title_id = titles[0]['id']
+        title = Title.objects.get(pk=title_id)
+        response = user_client.post(
+            f'/api/v1/titles/{title_id}/reviews/',
+            data={'text': 'Отзыв', 'score': 1}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        rating = self.get_rating(client, title_id)
+        title.name = 'Новое название'
+        title.save()
+        assert self.get_rating(client, title_id) == rating, (
+            'Проверьте, что save() произведения, загруженного до нового '
+            'отзыва, не перезаписывает рейтинг устаревшим значением.'
+        )
+
+    def test_03_rebuild_ratings_command(self, client, admin_client, admin):
+        from reviews.models import Title
+
+        reviews, titles = create_reviews(admin_client, {admin: admin_client})
+        title_id = titles[0]['id']
+        call_command('rebuild_ratings', '--check')
+
+        Title.objects.filter(pk=title_id).update(
+            rating_sum=100, rating_count=3, rating=33
+        )
+        with pytest.raises(CommandError):
+            call_command('rebuild_ratings', '--check')
+
+        call_command('rebuild_ratings')
+        call_command('rebuild_ratings', '--check')
+        assert self.get_rating(client, title_id) == 5, (
+            'Проверьте, что команда `rebuild_ratings` восстанавливает '
+            'рейтинг произведения по его отзывам.'
+        )
@@ -0,0 +1,82 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_categories, create_genre
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09TitleQueries:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    # COUNT(*) для пагинации, произведения с категориями, жанры.
+    LIST_QUERIES = 3
+
+    def create_titles(self, admin_client, count):
+        genres = create_genre(admin_client)
+        categories = create_categories(admin_client)
+        ids = []
+        for idx in range(count):
+            response = admin_client.post(self.TITLES_URL, data={
+                'name': f'Произведение {idx}',
+                'year': 2000,
+                'genre': [genre['slug'] for genre in genres],
+                'category': categories[idx % 2]['slug'],
+            })
+            assert response.status_code == HTTPStatus.CREATED
+            ids.append(response.json()['id'])
+        return ids, genres
+
+    def count_queries(self, client, url, **kwargs):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url, **kwargs)
+        assert response.status_code == HTTPStatus.OK
+        return len(context), response.json()
+
+    def test_01_title_list_queries(self, client, admin_client):
+        self.create_titles(admin_client, 12)
+        for limit in (1, 5, 12):
+            queries, data = self.count_queries(
+                client, self.TITLES_URL, data={'limit': limit}
+            )
+            assert len(data['results']) == limit
+            assert queries == self.LIST_QUERIES, (
+                f'Проверьте, что GET-запрос к `{self.TITLES_URL}` выполняет '
+                f'{self.LIST_QUERIES} запроса к БД независимо от размера '
+                f'страницы. При `limit={limit}` выполнено {queries}.'
+            )
+
+    def test_02_title_detail_queries(self, client, admin_client):
+        ids, _ = self.create_titles(admin_client, 1)
+        queries, _ = self.count_queries(
+            client, self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=ids[0])
+        )
+        assert queries == 2, (
+            'Проверьте, что GET-запрос к '
+            f'`{self.TITLES_DETAIL_URL_TEMPLATE}` загружает произведение '
+            'с категорией и жанры двумя запросами к БД.'
+        )
+
+    def test_03_title_write_representation_queries(self, admin_client):
+        ids, genres = self.create_titles(admin_client, 1)
+        url = self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=ids[0])
+        counts = set()
+        for genre_count in (1, len(genres)):
+            with CaptureQueriesContext(connection) as context:
+                response = admin_client.patch(url, data={
+                    'genre': [genre['slug'] for genre in genres[:genre_count]]
+                })
+            assert response.status_code == HTTPStatus.OK
+            assert len(response.json()['genre']) == genre_count
+            counts.add(len(
+                [query for query in context if 'reviews_genre"' in
+                 query['sql'] and 'SELECT' in query['sql']]
+            ))
+        assert len(counts) == 1, (
+            'Проверьте, что ответ на PATCH-запрос к '
+            f'`{self.TITLES_DETAIL_URL_TEMPLATE}` загружает жанры '
+            'фиксированным числом запросов.'
+        )
@@ -0,0 +1,102 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_comments, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10KeysetPagination:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def walk(self, client, url, direction='next'):
+        ids = []
+        pages = 0
+        while url:
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            data = response.json()
+            assert 'count' not in data, (
+                'Проверьте, что в курсорном режиме пагинации ответ не '
+                'содержит поле `count`.'
+            )
+            page_ids = [obj['id'] for obj in data['results']]
+            ids = ids + page_ids if direction == 'next' else page_ids + ids
+            url = data[direction]
+            pages += 1
+            assert pages < 50
+        return ids
+
+    def check_walk(self, client, url, expected_ids, limit):
+        first_page = f'{url}?pagination=cursor&limit={limit}'
+        assert self.walk(client, first_page) == expected_ids, (
+            f'Проверьте, что курсорная пагинация `{url}` по ссылкам `next` '
+            'возвращает все объекты в порядке сортировки без пропусков и '
+            'повторов.'
+        )
+        response = client.get(first_page)
+        last_page = response.json()['next']
+        while last_page:
+            data = client.get(last_page).json()
+            if not data['next']:
+                break
+            last_page = data['next']
+        if last_page:
+            assert self.walk(client, last_page, 'previous') == expected_ids, (
+                f'Проверьте, что курсорная пагинация `{url}` по ссылкам '
+                '`previous` возвращает все объекты в порядке сортировки.'
+            )
+
+    def test_01_titles_keyset(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        for idx in range(9):
+            response = admin_client.post(self.TITLES_URL, data={
+                'name': f'Произведение {idx % 3}',
+                'year': 2000,
+                'genre': [genres[0]['slug']],
+                'category': categories[0]['slug'],
+            })
+            assert response.status_code == HTTPStatus.CREATED
+
+        expected = [
+            title['id'] for title in client.get(
+                self.TITLES_URL, data={'limit': 100}
+            ).json()['results']
+        ]
+        self.check_walk(client, self.TITLES_URL, expected, limit=4)
+
+        response = client.get(self.TITLES_URL)
+        assert 'count' in response.json(), (
+            'Проверьте, что по умолчанию пагинация `limit/offset` не '
+            'изменилась.'
+        )
+        response = client.get(self.TITLES_URL, data={'cursor': 'broken'})
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_02_reviews_and_comments_keyset(self, client, admin_client,
+                                            admin, user, user_client,
+                                            moderator, moderator_client):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        comments, reviews, titles = create_comments(admin_client, author_map)
+        reviews_url = self.REVIEWS_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        self.check_walk(
+            client, reviews_url, [review['id'] for review in reviews], 2
+        )
+        comments_url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+        self.check_walk(
+            client, comments_url,
+            [comment['id'] for comment in reversed(comments)], 2
+        )
@@ -0,0 +1,98 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11StatelessAuth:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    CATEGORIES_URL = '/api/v1/categories/'
+    ME_URL = '/api/v1/users/me/'
+    TOKEN_URL = '/api/v1/auth/token/'
+
+    def get_client(self, user):
+        from django.contrib.auth.tokens import default_token_generator
+
+        response = APIClient().post(self.TOKEN_URL, data={
+            'username': user.username,
+            'confirmation_code': default_token_generator.make_token(user)
+        })
+        assert response.status_code == HTTPStatus.OK
+        client = APIClient()
+        client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {response.json()["token"]}'
+        )
+        return client
+
+    def count_queries(self, client, url):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        return len(context)
+
+    def test_01_no_user_query(self, client, admin):
+        from reviews.models import Title
+
+        admin_client = self.get_client(admin)
+        url = self.REVIEWS_URL_TEMPLATE.format(
+            title_id=Title.objects.create(name='Фильм', year=2000).pk
+        )
+        anonymous_queries = self.count_queries(client, url)
+        self.count_queries(admin_client, url)
+        assert (
+            self.count_queries(admin_client, url) == anonymous_queries
+        ), (
+            'Проверьте, что аутентификация по токену из '
+            f'`{self.TOKEN_URL}` не загружает пользователя из БД на каждый '
+            'запрос.'
+        )
+
+        response = admin_client.get(self.ME_URL)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['email'] == admin.email
+
+    def test_02_role_change_and_deletion(self, admin):
+        admin_client = self.get_client(admin)
+        data = {'name': 'Фильм', 'slug': 'films'}
+        response = admin_client.post(self.CATEGORIES_URL, data=data)
+        assert response.status_code == HTTPStatus.CREATED
+
+        admin.role = 'user'
+        admin.save()
+        data = {'name': 'Книга', 'slug': 'books'}
+        response = admin_client.post(self.CATEGORIES_URL, data=data)
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что смена роли пользователя применяется к уже '
+            'выданным токенам.'
+        )
+
+        admin.delete()
+        response = admin_client.get(self.TITLES_URL)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что токен удалённого пользователя не принимается.'
+        )
+
+    def test_03_state_cache_is_bounded(self, monkeypatch):
+        from api import authentication
+
+        cache = authentication.UserStateCache(ttl=30, maxsize=3)
+        for user_id in range(10):
+            cache.set(user_id, {'role': 'user'})
+        assert len(cache) == 3, (
+            'Проверьте, что кэш состояний пользователей хранит не больше '
+            '`maxsize` записей.'
+        )
+        assert cache.get(9) == {'role': 'user'}
+        assert cache.get(0) is authentication.MISSING
+
+        now = authentication.monotonic()
+        monkeypatch.setattr(authentication, 'monotonic', lambda: now + 60)
+        cache.set(100, {'role': 'user'})
+        assert len(cache) == 1, (
+            'Проверьте, что при записи истёкшие записи удаляются.'
+        )
@@ -0,0 +1,99 @@
+from http import HTTPStatus
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+
+
+class FailingBackend(BaseEmailBackend):
+
+    def send_messages(self, email_messages):
+        raise ConnectionError('SMTP недоступен')
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12MailOutbox:
+
+    SIGNUP_URL = '/api/v1/auth/signup/'
+
+    def signup(self, client, settings):
+        settings.MAIL_OUTBOX_EAGER = False
+        outbox_before_count = len(mail.outbox)
+        response = client.post(self.SIGNUP_URL, data={
+            'email': 'valid@yamdb.fake',
+            'username': 'valid_username'
+        })
+        assert response.status_code == HTTPStatus.OK
+        assert len(mail.outbox) == outbox_before_count, (
+            f'Проверьте, что POST-запрос к `{self.SIGNUP_URL}` не отправляет '
+            'письмо сам, а ставит его в очередь.'
+        )
+        return outbox_before_count
+
+    def test_01_outbox_worker_sends_mail(self, client, settings):
+        from users.models import OutgoingEmail
+
+        outbox_before_count = self.signup(client, settings)
+        email = OutgoingEmail.objects.get()
+        assert email.status == OutgoingEmail.Status.PENDING
+
+        call_command('send_outbox', '--once', '--threads', '2')
+        assert len(mail.outbox) == outbox_before_count + 1
+        assert mail.outbox[-1].to == ['valid@yamdb.fake']
+        email.refresh_from_db()
+        assert email.status == OutgoingEmail.Status.SENT
+        assert email.attempts == 1
+        assert email.message == '', (
+            'Проверьте, что после отправки текст письма с кодом '
+            'подтверждения не хранится в очереди.'
+        )
+
+    def test_02_outbox_worker_retries(self, client, settings):
+        from users.models import OutgoingEmail
+
+        self.signup(client, settings)
+        settings.EMAIL_BACKEND = 'tests.test_12_mail_outbox.FailingBackend'
+        call_command('send_outbox', '--once', '--max-attempts', '2')
+        email = OutgoingEmail.objects.get()
+        assert email.status == OutgoingEmail.Status.PENDING, (
+            'Проверьте, что письмо, которое не удалось отправить, '
+            'остаётся в очереди для повторной попытки.'
+        )
+        assert 'SMTP недоступен' in email.last_error
+        assert email.message, (
+            'Проверьте, что текст письма сохраняется до повторной попытки.'
+        )
+
+        OutgoingEmail.objects.update(next_attempt_at=email.created_at)
+        call_command('send_outbox', '--once', '--max-attempts', '2')
+        email.refresh_from_db()
+        assert email.status == OutgoingEmail.Status.FAILED
+        assert email.attempts == 2
+        assert email.message == '', (
+            'Проверьте, что у неотправленного письма текст с кодом '
+            'подтверждения стирается.'
+        )
+
+    def test_03_admin_hides_message(self, client, settings,
+                                    django_user_model):
+        from django.apps import apps
+
+        from users.models import OutgoingEmail
+
+        if not apps.is_installed('django.contrib.admin'):
+            pytest.skip('Только с админкой')
+        self.signup(client, settings)
+        email = OutgoingEmail.objects.get()
+        client.force_login(django_user_model.objects.create_superuser(
+            username='superuser', email='superuser@yamdb.fake',
+            password='1234567'
+        ))
+        response = client.get(
+            f'/admin/users/outgoingemail/{email.pk}/change/'
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert 'name="message"' not in response.content.decode(), (
+            'Проверьте, что админка очереди писем не показывает текст '
+            'письма с кодом подтверждения.'
+        )
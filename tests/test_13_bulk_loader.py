@@ -0,0 +1,57 @@
+import pytest
+from django.core.management import call_command
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13BulkLoader:
+
+    def test_01_add_data(self):
+        from reviews.models import Comment, Review, Title
+
+        call_command('add_data', '--dry-run', verbosity=0)
+        assert not Title.objects.exists(), (
+            'Проверьте, что `add_data --dry-run` не сохраняет данные.'
+        )
+
+        call_command('add_data', '--batch-size', '10', verbosity=0)
+        assert Title.objects.count() == 32
+        assert Review.objects.count() == 72
+        assert Comment.objects.count() == 3
+        review = Review.objects.get(pk=1)
+        assert review.pub_date.year == 2019, (
+            'Проверьте, что `add_data` сохраняет дату публикации из файла.'
+        )
+        call_command('rebuild_ratings', '--check')
+
+        call_command('add_data', '--upsert', '--drop-indexes', verbosity=0)
+        assert Review.objects.count() == 72
+        call_command('add_data', '--truncate', verbosity=0)
+        assert Review.objects.count() == 72
+
+    def test_02_natural_keys(self):
+        from reviews.bulk_loader import BulkLoader
+        from reviews.models import Category, Genre, GenreTitle, Title
+
+        loader = BulkLoader(batch_size=2)
+        loader.load_rows(Category, [{'name': 'Фильм', 'slug': 'movie'}])
+        loader.load_rows(Genre, [
+            {'name': 'Драма', 'slug': 'drama'},
+            {'name': 'Комедия', 'slug': 'comedy'},
+        ])
+        loader.load_rows(Title, [
+            {'id': '7', 'name': 'Фильм', 'year': '1994', 'category': 'movie'}
+        ])
+        stats = loader.load_rows(GenreTitle, [
+            {'title_id': '7', 'genre': 'drama'},
+            {'title_id': '7', 'genre': 'comedy'},
+        ])
+        assert stats.rows == 2
+        title = Title.objects.get(pk=7)
+        assert title.category.slug == 'movie'
+        assert set(title.genre.values_list('slug', flat=True)) == {
+            'drama', 'comedy'
+        }
+        with pytest.raises(ValueError):
+            loader.load_rows(Title, [
+                {'name': 'Фильм', 'year': '1994', 'category': 'missing'}
+            ])
@@ -0,0 +1,130 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14ResponseCache:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    GENRES_URL = '/api/v1/genres/'
+    CATEGORIES_URL = '/api/v1/categories/'
+
+    def get(self, client, url):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        return response.json(), len(context)
+
+    def test_01_cached_catalog(self, client, admin_client):
+        create_titles(admin_client)
+        for url in (self.TITLES_URL, self.GENRES_URL, self.CATEGORIES_URL):
+            data, _ = self.get(client, url)
+            cached_data, queries = self.get(client, url)
+            assert cached_data == data
+            assert queries == 0, (
+                f'Проверьте, что повторный GET-запрос к `{url}` отдаётся из '
+                'кэша без запросов к БД.'
+            )
+
+    def test_02_invalidation(self, client, admin_client, user_client):
+        titles, categories, genres = create_titles(admin_client)
+        title_url = self.TITLES_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        data, _ = self.get(client, self.TITLES_URL)
+        assert data['count'] == 2
+        self.get(client, title_url)
+        self.get(client, self.GENRES_URL)
+
+        admin_client.post(
+            self.GENRES_URL, data={'name': 'Мюзикл', 'slug': 'musical'}
+        )
+        data, _ = self.get(client, self.GENRES_URL)
+        assert 'musical' in [genre['slug'] for genre in data['results']], (
+            'Проверьте, что кэш списка жанров сбрасывается при создании '
+            'жанра.'
+        )
+
+        create_single_review(user_client, titles[0]['id'], 'Отзыв', 7)
+        data, _ = self.get(client, title_url)
+        assert data['rating'] == 7, (
+            'Проверьте, что кэш произведения сбрасывается при добавлении '
+            'отзыва.'
+        )
+
+        admin_client.patch(title_url, data={'genre': [genres[2]['slug']]})
+        data, _ = self.get(client, title_url)
+        assert [genre['slug'] for genre in data['genre']] == [
+            genres[2]['slug']
+        ]
+
+        admin_client.delete(f'{self.CATEGORIES_URL}{categories[0]["slug"]}/')
+        data, _ = self.get(client, title_url)
+        assert data['category'] is None, (
+            'Проверьте, что кэш произведений сбрасывается при удалении '
+            'категории.'
+        )
+
+        admin_client.delete(title_url)
+        data, _ = self.get(client, self.TITLES_URL)
+        assert data['count'] == 1
+
+    def test_03_bulk_changes(self, client, admin_client):
+        from django.core.management import call_command
+
+        from reviews.bulk_loader import BulkLoader
+        from reviews.models import Genre, Title
+
+        titles, _, _ = create_titles(admin_client)
+        title_url = self.TITLES_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        for command in ('rebuild_ratings', 'reconcile_counters'):
+            Title.objects.filter(pk=titles[0]['id']).update(rating=7)
+            self.get(client, title_url)
+            call_command(command)
+            data, _ = self.get(client, title_url)
+            assert data['rating'] is None, (
+                f'Проверьте, что после команды `{command}` закэшированные '
+                'ответы произведений сбрасываются.'
+            )
+
+        genres, _ = self.get(client, self.GENRES_URL)
+        BulkLoader().load_rows(Genre, [{'name': 'Мюзикл', 'slug': 'musical'}])
+        data, _ = self.get(client, self.GENRES_URL)
+        assert data['count'] == genres['count'] + 1, (
+            'Проверьте, что загрузка BulkLoader сбрасывает кэш ответов.'
+        )
+
+    def test_04_invalidation_after_commit(self, client, admin_client):
+        from django.db import transaction
+
+        from api.cache import get_generation
+        from reviews.models import Title
+
+        titles, _, _ = create_titles(admin_client)
+        title_url = self.TITLES_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        stale, _ = self.get(client, title_url)
+        generation = get_generation('titles')
+        with transaction.atomic():
+            title = Title.objects.get(pk=titles[0]['id'])
+            title.name = 'Новое название'
+            title.save()
+            assert get_generation('titles') == generation, (
+                'Проверьте, что кэш ответов сбрасывается только после '
+                'фиксации транзакции: иначе параллельный запрос закэширует '
+                'старые данные под новым поколением.'
+            )
+        assert get_generation('titles') != generation, (
+            'Проверьте, что после фиксации транзакции кэш сбрасывается.'
+        )
+        data, _ = self.get(client, title_url)
+        assert data['name'] == 'Новое название' != stale['name']
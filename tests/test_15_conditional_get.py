@@ -0,0 +1,110 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15ConditionalGet:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def check_not_modified(self, client, url):
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        etag = response.get('ETag')
+        assert etag, (
+            f'Проверьте, что ответ на GET-запрос к `{url}` содержит ETag.'
+        )
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что GET-запрос к `{url}` с совпадающим '
+            '`If-None-Match` возвращает ответ со статусом 304.'
+        )
+        assert len(context) <= 1, (
+            f'Проверьте, что ответ 304 на GET-запрос к `{url}` не '
+            'загружает данные из БД.'
+        )
+        return response
+
+    def test_01_conditional_get(self, client, admin_client, admin, user,
+                                user_client):
+        author_map = {admin: admin_client, user: user_client}
+        comments, reviews, titles = create_comments(admin_client, author_map)
+        title_id = titles[0]['id']
+        reviews_url = self.REVIEWS_URL_TEMPLATE.format(title_id=title_id)
+        comments_url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=title_id, review_id=reviews[0]['id']
+        )
+        self.check_not_modified(client, self.TITLES_URL)
+        self.check_not_modified(client, comments_url)
+        response = self.check_not_modified(client, reviews_url)
+        etag = response['ETag']
+        last_modified = response.get('Last-Modified')
+        assert last_modified, (
+            f'Проверьте, что ответ на GET-запрос к `{reviews_url}` содержит '
+            'заголовок Last-Modified.'
+        )
+        response = client.get(
+            reviews_url, HTTP_IF_MODIFIED_SINCE=last_modified
+        )
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+        response = user_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=reviews[1]['id']
+            ),
+            data={'text': 'Новый текст'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        response = client.get(reviews_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после изменения отзыва ETag списка отзывов '
+            'меняется.'
+        )
+        assert response['ETag'] != etag
+
+        etag = client.get(comments_url)['ETag']
+        admin_client.delete(f'{comments_url}{comments[0]["id"]}/')
+        response = client.get(comments_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после удаления комментария ETag списка '
+            'комментариев меняется.'
+        )
+
+    def test_02_author_rename(self, client, admin_client, admin, user,
+                              user_client):
+        author_map = {admin: admin_client, user: user_client}
+        _, reviews, titles = create_comments(admin_client, author_map)
+        reviews_url = self.REVIEWS_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        comments_url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+        etags = {url: client.get(url)['ETag'] for url in (
+            reviews_url, comments_url
+        )}
+        response = user_client.patch(
+            '/api/v1/users/me/', data={'username': 'renamed'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        for url, etag in etags.items():
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == HTTPStatus.OK, (
+                'Проверьте, что после смены имени пользователя ETag '
+                f'ответа на GET-запрос к `{url}` с его записями меняется.'
+            )
+            authors = {obj['author'] for obj in response.json()['results']}
+            assert 'renamed' in authors
@@ -0,0 +1,60 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Category, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16TitleSearch:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def search(self, client, query):
+        response = client.get(self.TITLES_URL, {'search': query})
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.TITLES_URL}` с параметром '
+            '`search` возвращает ответ со статусом 200.'
+        )
+        return [title['name'] for title in response.json()['results']]
+
+    def test_01_search(self, client):
+        category = Category.objects.create(name='Книги', slug='books')
+        Title.objects.create(
+            name='Мастер и Маргарита', year=1967, category=category,
+            description='Роман о визите дьявола в Москву'
+        )
+        Title.objects.create(
+            name='Собачье сердце', year=1925, category=category,
+            description='Повесть о профессоре и мастере на все руки'
+        )
+        Title.objects.create(name='Бег', year=1928, category=category)
+
+        assert self.search(client, 'мастер') == [
+            'Мастер и Маргарита', 'Собачье сердце'
+        ], (
+            'Проверьте, что поиск находит произведения по названию и '
+            'описанию и ставит совпадения в названии выше.'
+        )
+        assert self.search(client, 'марг') == ['Мастер и Маргарита'], (
+            'Проверьте, что поиск находит слова по префиксу.'
+        )
+        assert self.search(client, 'мастер сердце') == ['Собачье сердце'], (
+            'Проверьте, что поиск требует совпадения всех слов запроса.'
+        )
+        assert len(self.search(client, '')) == 3
+
+    def test_02_search_index_sync(self, client):
+        category = Category.objects.create(name='Книги', slug='books')
+        title = Title.objects.create(name='Бег', year=1928, category=category)
+        title.name = 'Белая гвардия'
+        title.save()
+        assert self.search(client, 'бег') == [], (
+            'Проверьте, что поисковый индекс обновляется при изменении '
+            'произведения.'
+        )
+        assert self.search(client, 'гвард') == ['Белая гвардия']
+        Title.objects.filter(pk=title.pk).delete()
+        assert self.search(client, 'гвард') == [], (
+            'Проверьте, что удалённые произведения пропадают из поиска.'
+        )
@@ -0,0 +1,58 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import IntegrityError
+
+from reviews.models import Category, Genre, GenreTitle, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17TitleFilters:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def filter_names(self, client, **params):
+        response = client.get(self.TITLES_URL, params)
+        assert response.status_code == HTTPStatus.OK
+        return sorted(title['name'] for title in response.json()['results'])
+
+    def test_01_slug_filters(self, client):
+        books = Category.objects.create(name='Книги', slug='books')
+        films = Category.objects.create(name='Фильмы', slug='films')
+        rock = Genre.objects.create(name='Рок', slug='rock')
+        rock_n_roll = Genre.objects.create(name='Рок-н-ролл', slug='rock-n')
+        jazz = Genre.objects.create(name='Джаз', slug='jazz')
+        first = Title.objects.create(name='Первое', year=2000, category=books)
+        second = Title.objects.create(name='Второе', year=2000, category=films)
+        third = Title.objects.create(name='Третье', year=2000, category=films)
+        first.genre.set([rock, jazz])
+        second.genre.set([rock_n_roll])
+        third.genre.set([jazz])
+
+        assert self.filter_names(client, genre='rock') == ['Первое'], (
+            'Проверьте, что фильтр по жанру сравнивает слаг целиком.'
+        )
+        assert self.filter_names(client, genre='rock,jazz') == [
+            'Первое', 'Третье'
+        ], (
+            'Проверьте, что фильтр по нескольким жанрам возвращает каждое '
+            'произведение один раз.'
+        )
+        assert self.filter_names(client, category='film') == [], (
+            'Проверьте, что фильтр по категории сравнивает слаг целиком.'
+        )
+        assert self.filter_names(client, category='books,films') == [
+            'Второе', 'Первое', 'Третье'
+        ]
+        assert self.filter_names(
+            client, category='films', genre='jazz'
+        ) == ['Третье']
+
+    def test_02_genre_title_unique(self):
+        category = Category.objects.create(name='Книги', slug='books')
+        genre = Genre.objects.create(name='Рок', slug='rock')
+        title = Title.objects.create(name='Первое', year=2000,
+                                     category=category)
+        GenreTitle.objects.create(genre=genre, title=title)
+        with pytest.raises(IntegrityError):
+            GenreTitle.objects.create(genre=genre, title=title)
@@ -0,0 +1,94 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Review
+from tests.utils import create_comments, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18NestedResources:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+    # Отзыв вместе с произведением, COUNT(*), страница с авторами.
+    LIST_QUERIES = 3
+
+    def test_01_missing_parent(self, client, admin_client, admin, user,
+                               user_client):
+        author_map = {admin: admin_client, user: user_client}
+        _, reviews, titles = create_comments(admin_client, author_map)
+        empty_title_id = titles[1]['id']
+        response = client.get(
+            self.REVIEWS_URL_TEMPLATE.format(title_id=empty_title_id)
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что список отзывов произведения без отзывов '
+            'возвращается со статусом 200.'
+        )
+        assert response.json()['results'] == []
+        response = client.get(self.REVIEWS_URL_TEMPLATE.format(title_id=0))
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что для несуществующего произведения список отзывов '
+            'возвращает ответ со статусом 404.'
+        )
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=empty_title_id, review_id=reviews[0]['id']
+        )
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что комментарии отзыва, запрошенные через чужое '
+            'произведение, возвращают ответ со статусом 404.'
+        )
+        response = user_client.post(url, data={'text': 'Комментарий'})
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_02_list_queries(self, client, admin_client, admin, user,
+                             user_client, moderator_client):
+        author_map = {admin: admin_client, user: user_client}
+        _, reviews, titles = create_comments(admin_client, author_map)
+        moderator_client.post(
+            self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id']),
+            data={'text': 'Отзыв модератора', 'score': 7}
+        )
+        urls = (
+            self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id']),
+            self.COMMENTS_URL_TEMPLATE.format(
+                title_id=titles[0]['id'], review_id=reviews[0]['id']
+            ),
+        )
+        for url in urls:
+            for limit in (1, 10):
+                with CaptureQueriesContext(connection) as context:
+                    response = client.get(url, {'limit': limit})
+                assert response.status_code == HTTPStatus.OK
+                assert len(context) == self.LIST_QUERIES, (
+                    f'Проверьте, что GET-запрос к `{url}` загружает авторов '
+                    'тем же запросом, что и страницу, а родителя - не больше '
+                    f'одного раза: выполнено {len(context)} запросов к БД.'
+                )
+
+    def test_03_duplicate_review(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        data = {'text': 'Отзыв', 'score': 5}
+        response = user_client.post(url, data=data)
+        assert response.status_code == HTTPStatus.CREATED
+        response = user_client.post(url, data=data)
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что повторный отзыв пользователя на произведение '
+            'возвращает ответ со статусом 400.'
+        )
+        assert response.json() == {
+            'non_field_errors': ['Вы уже оставляли отзыв на это произведение']
+        }, (
+            'Проверьте, что ошибка повторного отзыва возвращается в поле '
+            '`non_field_errors`, как при проверке сериализатора.'
+        )
+        assert Review.objects.count() == 1
+        response = user_client.get(url)
+        assert response.json()['results'][0]['score'] == 5
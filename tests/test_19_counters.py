@@ -0,0 +1,111 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from reviews.models import Review, Title
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19Counters:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+    COMMENT_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+        '{comment_id}/'
+    )
+
+    def get_counter(self, client, url, field):
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert field in data, (
+            f'Проверьте, что ответ на GET-запрос к `{url}` содержит поле '
+            f'`{field}`.'
+        )
+        return data[field]
+
+    def test_01_counters_follow_changes(self, client, admin_client, admin,
+                                        user, user_client):
+        author_map = {admin: admin_client, user: user_client}
+        comments, reviews, titles = create_comments(admin_client, author_map)
+        title_id = titles[0]['id']
+        title_url = self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        review_url = self.REVIEW_DETAIL_URL_TEMPLATE.format(
+            title_id=title_id, review_id=reviews[0]['id']
+        )
+        review_count = Review.objects.filter(title_id=title_id).count()
+        assert self.get_counter(
+            client, title_url, 'review_count'
+        ) == review_count, (
+            'Проверьте, что `review_count` произведения равен количеству '
+            'его отзывов.'
+        )
+        comment_count = Review.objects.get(
+            pk=reviews[0]['id']
+        ).comments.count()
+        assert comment_count
+        assert self.get_counter(
+            client, review_url, 'comment_count'
+        ) == comment_count, (
+            'Проверьте, что `comment_count` отзыва равен количеству его '
+            'комментариев.'
+        )
+
+        response = admin_client.delete(
+            self.COMMENT_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=reviews[0]['id'],
+                comment_id=comments[0]['id']
+            )
+        )
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert self.get_counter(
+            client, review_url, 'comment_count'
+        ) == comment_count - 1, (
+            'Проверьте, что удаление комментария уменьшает `comment_count`.'
+        )
+        response = admin_client.delete(review_url)
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert self.get_counter(
+            client, title_url, 'review_count'
+        ) == review_count - 1, (
+            'Проверьте, что удаление отзыва уменьшает `review_count`.'
+        )
+
+    def test_02_save_keeps_counters(self, admin_client, admin, user,
+                                    user_client):
+        author_map = {admin: admin_client, user: user_client}
+        _, reviews, titles = create_comments(admin_client, author_map)
+        title = Title.objects.get(pk=titles[0]['id'])
+        review = Review.objects.get(pk=reviews[0]['id'])
+        expected = title.rating_count, review.comment_count
+        Title.objects.filter(pk=title.pk).update(rating_count=100)
+        Review.objects.filter(pk=review.pk).update(comment_count=100)
+        title.name = 'Новое название'
+        title.save()
+        review.text = 'Новый текст'
+        review.save()
+        title.refresh_from_db()
+        review.refresh_from_db()
+        assert (title.rating_count, review.comment_count) == (100, 100), (
+            'Проверьте, что save() не перезаписывает хранимые счётчики '
+            f'устаревшими значениями {expected}.'
+        )
+
+    def test_03_reconcile_counters_command(self, admin_client, admin, user,
+                                           user_client):
+        author_map = {admin: admin_client, user: user_client}
+        _, reviews, titles = create_comments(admin_client, author_map)
+        call_command('reconcile_counters', '--check')
+        Title.objects.filter(pk=titles[0]['id']).update(rating_count=100)
+        Review.objects.filter(pk=reviews[0]['id']).update(comment_count=100)
+        with pytest.raises(CommandError):
+            call_command('reconcile_counters', '--check')
+        call_command('reconcile_counters')
+        call_command('reconcile_counters', '--check')
+        review = Review.objects.get(pk=reviews[0]['id'])
+        assert review.comment_count == review.comments.count()
@@ -0,0 +1,39 @@
+import pytest
+from django.conf import settings
+from django.db import connection
+
+from api_yamdb.database import check_connections
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20Database:
+
+    def pragma(self, name):
+        with connection.cursor() as cursor:
+            cursor.execute(f'PRAGMA {name}')
+            return cursor.fetchone()[0]
+
+    def test_01_sqlite_pragmas(self):
+        if connection.vendor != 'sqlite':
+            pytest.skip('Только для SQLite')
+        assert self.pragma('busy_timeout') == (
+            settings.SQLITE_PRAGMAS['busy_timeout']
+        ), (
+            'Проверьте, что новое соединение с SQLite получает busy_timeout '
+            'из настройки SQLITE_PRAGMAS.'
+        )
+        # 1 - NORMAL.
+        assert self.pragma('synchronous') == 1
+
+    def test_02_health_check(self, monkeypatch):
+        closed = []
+        connection.ensure_connection()
+        monkeypatch.setattr(connection, 'close', lambda: closed.append(1))
+        check_connections()
+        assert not closed
+        monkeypatch.setattr(connection, 'is_usable', lambda: False)
+        check_connections()
+        assert closed, (
+            'Проверьте, что в начале запроса разорванное соединение с БД '
+            'закрывается.'
+        )
@@ -0,0 +1,116 @@
+from http import HTTPStatus
+from time import time
+
+import pytest
+from django.db import DEFAULT_DB_ALIAS
+
+from api.cache import get_cache
+from api.replicas import signer
+from api_yamdb import routers
+from reviews.models import Category
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21Replicas:
+
+    CATEGORIES_URL = '/api/v1/categories/'
+
+    @pytest.fixture
+    def replica_reads(self, settings, monkeypatch):
+        # Реплика указывает на ту же тестовую БД: проверяем только выбор.
+        settings.DATABASE_REPLICAS = ['replica']
+        chosen = []
+
+        def choice(replicas):
+            chosen.append(replicas[0])
+            return DEFAULT_DB_ALIAS
+
+        monkeypatch.setattr(routers.random, 'choice', choice)
+        return chosen
+
+    def test_01_router(self, settings):
+        router = routers.ReplicaRouter()
+        settings.DATABASE_REPLICAS = ['replica']
+        assert router.db_for_read(Category) == DEFAULT_DB_ALIAS, (
+            'Проверьте, что вне вьюсетов чтение идёт с основной БД.'
+        )
+        with routers.replica_reads():
+            assert router.db_for_read(Category) == 'replica'
+            assert router.db_for_write(Category) == DEFAULT_DB_ALIAS
+        assert router.allow_migrate('replica', 'reviews') is False
+
+    def test_02_reads_go_to_replica(self, client, admin_client,
+                                    replica_reads):
+        response = client.get(self.CATEGORIES_URL)
+        assert response.status_code == HTTPStatus.OK
+        assert replica_reads, (
+            f'Проверьте, что GET-запрос к `{self.CATEGORIES_URL}` читает '
+            'данные с реплики.'
+        )
+        replica_reads.clear()
+        response = admin_client.post(
+            self.CATEGORIES_URL, data={'name': 'Книги', 'slug': 'books'}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert not replica_reads, (
+            'Проверьте, что изменяющие запросы выполняются на основной БД.'
+        )
+        assert response.cookies.get('primary_pin'), (
+            'Проверьте, что после изменяющего запроса клиент получает '
+            'cookie закрепления за основной БД.'
+        )
+        response = admin_client.get(self.CATEGORIES_URL)
+        assert response.status_code == HTTPStatus.OK
+        assert not replica_reads, (
+            'Проверьте, что сразу после изменения клиент читает данные с '
+            'основной БД.'
+        )
+        get_cache().clear()
+        response = client.get(
+            self.CATEGORIES_URL,
+            HTTP_X_PRIMARY_PIN=response.wsgi_request.COOKIES['primary_pin']
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert not replica_reads
+
+    def test_03_forged_pin(self, client, replica_reads):
+        forged = (
+            str(int(time()) + 10 ** 6),
+            signer.sign(str(int(time()) + 10 ** 6)),
+            signer.sign(str(int(time()) - 1)),
+            str(int(time()) + 5) + ':forged',
+        )
+        for value in forged:
+            replica_reads.clear()
+            get_cache().clear()
+            response = client.get(
+                self.CATEGORIES_URL, HTTP_X_PRIMARY_PIN=value
+            )
+            assert response.status_code == HTTPStatus.OK
+            assert replica_reads, (
+                'Проверьте, что неподписанное, просроченное или слишком '
+                f'долгое закрепление `{value}` не направляет чтение на '
+                'основную БД.'
+            )
+
+    def test_04_replica_reads_not_cached(self, client, settings,
+                                         replica_reads):
+        get_cache().clear()
+        for _ in range(2):
+            replica_reads.clear()
+            response = client.get(self.CATEGORIES_URL)
+            assert response.status_code == HTTPStatus.OK
+            assert replica_reads, (
+                'Проверьте, что ответ, прочитанный с реплики, не попадает '
+                'в общий кэш ответов.'
+            )
+        settings.DATABASE_REPLICAS = []
+        client.get(self.CATEGORIES_URL)
+        settings.DATABASE_REPLICAS = ['replica']
+        replica_reads.clear()
+        response = client.get(self.CATEGORIES_URL)
+        assert response.status_code == HTTPStatus.OK
+        assert not replica_reads, (
+            'Проверьте, что ответ, собранный на основной БД, кэшируется и '
+            'отдаётся при чтении с реплики.'
+        )
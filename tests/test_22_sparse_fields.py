@@ -0,0 +1,98 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22SparseFields:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    def get(self, client, url, **params):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url, params)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{url}` с параметрами {params} '
+            'возвращает ответ со статусом 200.'
+        )
+        return response.json(), context
+
+    def test_01_title_fields(self, client, admin_client, admin, user,
+                             user_client):
+        author_map = {admin: admin_client, user: user_client}
+        _, _, titles = create_comments(admin_client, author_map)
+        data, _ = self.get(client, self.TITLES_URL)
+        assert set(data['results'][0]) == {
+            'id', 'name', 'year', 'rating', 'review_count', 'description',
+            'genre', 'category'
+        }, 'Проверьте, что без параметров ответ содержит все поля.'
+
+        data, context = self.get(
+            client, self.TITLES_URL, fields='id,name,rating'
+        )
+        title = data['results'][0]
+        assert set(title) == {'id', 'name', 'rating'}, (
+            'Проверьте, что параметр `fields` оставляет в ответе только '
+            'перечисленные поля.'
+        )
+        sql = ' '.join(query['sql'] for query in context.captured_queries)
+        assert 'description' not in sql and 'reviews_genre' not in sql, (
+            'Проверьте, что незапрошенные колонки и жанры не загружаются '
+            'из БД.'
+        )
+
+        data, _ = self.get(client, self.TITLES_URL, fields='name,genre')
+        genres = {
+            title['name']: title['genre'] for title in data['results']
+        }
+        assert sorted(genres[titles[0]['name']]) == sorted(
+            titles[0]['genre']
+        ), (
+            'Проверьте, что без `expand` жанры отдаются списком слагов.'
+        )
+        data, _ = self.get(
+            client, self.TITLES_URL, fields='name,genre,category',
+            expand='genre'
+        )
+        title = data['results'][0]
+        assert isinstance(title['genre'][0], dict), (
+            'Проверьте, что `expand=genre` раскрывает жанры в объекты.'
+        )
+        assert isinstance(title['category'], str)
+
+        full, _ = self.get(client, self.TITLES_URL)
+        data, _ = self.get(client, self.TITLES_URL, expand='genre')
+        assert data == full, (
+            'Проверьте, что `expand` без `fields` не меняет ответ: '
+            'категория остаётся объектом.'
+        )
+
+    def test_02_review_fields_and_errors(self, client, admin_client, admin,
+                                         user, user_client):
+        author_map = {admin: admin_client, user: user_client}
+        _, _, titles = create_comments(admin_client, author_map)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        data, context = self.get(client, url, fields='id,score')
+        assert set(data['results'][0]) == {'id', 'score'}
+        sql = ' '.join(query['sql'] for query in context.captured_queries)
+        assert 'users_user' not in sql, (
+            'Проверьте, что без поля `author` авторы не загружаются.'
+        )
+        data, _ = self.get(client, url, fields='author')
+        assert data['results'][0]['author'] in {
+            admin.username, user.username
+        }
+        for params in (
+            {'fields': 'id,secret'}, {'fields': ''}, {'fields': ' , '},
+            {'expand': 'author'},
+        ):
+            response = client.get(url, params)
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                f'Проверьте, что GET-запрос к `{url}` с параметрами '
+                f'{params} возвращает ответ со статусом 400.'
+            )
@@ -0,0 +1,67 @@
+import io
+from datetime import datetime, timezone
+from decimal import Decimal
+from http import HTTPStatus
+
+import pytest
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+
+from api import parsers, renderers
+
+DATA = {
+    'results': [{
+        'id': 1,
+        'name': 'Мастер и Маргарита',
+        'rating': None,
+        'score': Decimal('7.5'),
+        'pub_date': datetime(2020, 1, 1, 12, 30, 15, 123456,
+                             tzinfo=timezone.utc),
+        'text': 'Строка\u2028с разделителем',
+    }],
+    'next': None,
+}
+
+
+class Test23JSONRenderer:
+
+    def test_01_same_output(self, monkeypatch):
+        expected = JSONRenderer().render(DATA)
+        assert renderers.FastJSONRenderer().render(DATA) == expected, (
+            'Проверьте, что FastJSONRenderer выдаёт тот же JSON, что и '
+            'JSONRenderer.'
+        )
+        monkeypatch.setattr(renderers, 'orjson', None)
+        assert renderers.FastJSONRenderer().render(DATA) == expected, (
+            'Проверьте, что без orjson FastJSONRenderer использует json.'
+        )
+        assert renderers.FastJSONRenderer().render(
+            DATA, 'application/json; indent=4'
+        ) == JSONRenderer().render(DATA, 'application/json; indent=4')
+
+    @pytest.mark.parametrize('accelerated', (True, False))
+    def test_02_parser(self, monkeypatch, accelerated):
+        if not accelerated:
+            monkeypatch.setattr(parsers, 'orjson', None)
+        parser = parsers.FastJSONParser()
+        stream = io.BytesIO('{"name": "Жанр", "year": 2000}'.encode())
+        assert parser.parse(stream) == {'name': 'Жанр', 'year': 2000}
+        with pytest.raises(ParseError):
+            parser.parse(io.BytesIO(b'{"name": NaN}'))
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_api_json(self, admin_client):
+        response = admin_client.post(
+            '/api/v1/categories/', data='{"name": "Книги", "slug": "books"}',
+            content_type='application/json'
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.json() == {'name': 'Книги', 'slug': 'books'}
+        response = admin_client.post(
+            '/api/v1/categories/', data='{"name": ',
+            content_type='application/json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что некорректный JSON в запросе возвращает ответ '
+            'со статусом 400.'
+        )
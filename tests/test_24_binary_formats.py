@@ -0,0 +1,85 @@
+from http import HTTPStatus
+
+import pytest
+
+from api.renderers import CBORRenderer, MessagePackRenderer
+from tests.utils import create_comments
+
+msgpack = pytest.importorskip('msgpack')
+cbor2 = pytest.importorskip('cbor2')
+
+FORMATS = (
+    ('application/msgpack', msgpack.packb, msgpack.unpackb),
+    ('application/cbor', cbor2.dumps, cbor2.loads),
+)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24BinaryFormats:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    CATEGORIES_URL = '/api/v1/categories/'
+
+    @pytest.mark.parametrize('media_type, dumps, loads', FORMATS)
+    def test_01_render(self, client, admin_client, admin, user, user_client,
+                       media_type, dumps, loads):
+        author_map = {admin: admin_client, user: user_client}
+        _, _, titles = create_comments(admin_client, author_map)
+        urls = (
+            self.TITLES_URL,
+            self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id']),
+        )
+        for url in urls:
+            expected = client.get(url).json()
+            response = client.get(url, HTTP_ACCEPT=media_type)
+            assert response.status_code == HTTPStatus.OK
+            assert response['Content-Type'] == media_type, (
+                f'Проверьте, что GET-запрос к `{url}` с `Accept: '
+                f'{media_type}` возвращает ответ в этом формате.'
+            )
+            assert loads(response.content) == expected, (
+                f'Проверьте, что ответ в формате {media_type} содержит те же '
+                'данные, что и ответ в JSON.'
+            )
+
+    @pytest.mark.parametrize('media_type, dumps, loads', FORMATS)
+    def test_02_parse(self, admin_client, media_type, dumps, loads):
+        response = admin_client.post(
+            self.CATEGORIES_URL,
+            data=dumps({'name': 'Книги', 'slug': 'books'}),
+            content_type=media_type, HTTP_ACCEPT=media_type
+        )
+        assert response.status_code == HTTPStatus.CREATED, (
+            f'Проверьте, что POST-запрос с телом в формате {media_type} '
+            'обрабатывается.'
+        )
+        assert loads(response.content) == {'name': 'Книги', 'slug': 'books'}
+        response = admin_client.post(
+            self.CATEGORIES_URL, data=b'\xc1\xff',
+            content_type=media_type
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            f'Проверьте, что некорректное тело в формате {media_type} '
+            'возвращает ответ со статусом 400.'
+        )
+
+    def test_03_unavailable(self, client, monkeypatch):
+        for renderer in (MessagePackRenderer, CBORRenderer):
+            monkeypatch.setattr(renderer, 'library', None)
+            response = client.get(
+                self.CATEGORIES_URL, HTTP_ACCEPT=renderer.media_type
+            )
+            assert response.status_code == HTTPStatus.NOT_ACCEPTABLE, (
+                'Проверьте, что формат без установленной библиотеки не '
+                'предлагается клиенту.'
+            )
+            response = client.get(
+                self.CATEGORIES_URL,
+                HTTP_ACCEPT=f'{renderer.media_type}, application/json;q=0.5'
+            )
+            assert response.status_code == HTTPStatus.OK
+            assert response['Content-Type'] == 'application/json', (
+                'Проверьте, что без установленной библиотеки ответ '
+                'приходит в JSON.'
+            )
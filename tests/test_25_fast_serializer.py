@@ -0,0 +1,89 @@
+from http import HTTPStatus
+
+import pytest
+
+from api.cache import get_cache
+from api.fast import FastListMixin
+from reviews.models import Title
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25FastSerializer:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def get_content(self, client, url, params):
+        get_cache().clear()
+        response = client.get(url, params)
+        assert response.status_code == HTTPStatus.OK
+        return response.content
+
+    def test_01_parity(self, client, admin_client, admin, user, user_client,
+                       monkeypatch):
+        author_map = {admin: admin_client, user: user_client}
+        _, reviews, titles = create_comments(admin_client, author_map)
+        Title.objects.filter(pk=titles[1]['id']).update(category=None)
+        title_id = titles[0]['id']
+        requests = (
+            (self.TITLES_URL, {}),
+            (self.TITLES_URL, {'limit': 1, 'offset': 1}),
+            (self.TITLES_URL, {'pagination': 'cursor', 'limit': 1}),
+            (self.TITLES_URL, {'genre': titles[0]['genre'][0]}),
+            (self.TITLES_URL, {'search': titles[0]['name'].split()[0]}),
+            (self.TITLES_URL, {'fields': 'name,genre,category'}),
+            (self.TITLES_URL, {'fields': 'id,rating', 'expand': 'genre'}),
+            (self.REVIEWS_URL_TEMPLATE.format(title_id=title_id), {}),
+            (
+                self.REVIEWS_URL_TEMPLATE.format(title_id=title_id),
+                {'pagination': 'cursor', 'fields': 'author,pub_date'}
+            ),
+            (
+                self.COMMENTS_URL_TEMPLATE.format(
+                    title_id=title_id, review_id=reviews[0]['id']
+                ),
+                {}
+            ),
+        )
+        fast = [
+            self.get_content(client, url, params) for url, params in requests
+        ]
+        monkeypatch.setattr(
+            FastListMixin, 'get_row_serializer', lambda self: None
+        )
+        for (url, params), content in zip(requests, fast):
+            assert content == self.get_content(client, url, params), (
+                f'Проверьте, что ответ на GET-запрос к `{url}` с параметрами '
+                f'{params} совпадает с ответом сериализатора.'
+            )
+
+    def test_02_cursor_with_fields(self, client, admin_client, admin, user,
+                                   user_client):
+        author_map = {admin: admin_client, user: user_client}
+        _, reviews, titles = create_comments(admin_client, author_map)
+        reviews_url = self.REVIEWS_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        for url, fields in (
+            (self.TITLES_URL, 'rating'),
+            (reviews_url, 'text'),
+        ):
+            response = client.get(
+                url, {'fields': fields, 'pagination': 'cursor', 'limit': 1}
+            )
+            assert response.status_code == HTTPStatus.OK, (
+                f'Проверьте, что курсорная пагинация `{url}` работает, '
+                'когда ключа сортировки нет среди полей `?fields=`.'
+            )
+            data = response.json()
+            assert list(data['results'][0]) == [fields]
+            assert data['next'], (
+                'Проверьте, что в ответе есть ссылка на следующую страницу.'
+            )
+            response = client.get(data['next'])
+            assert response.status_code == HTTPStatus.OK
+            assert list(response.json()['results'][0]) == [fields]
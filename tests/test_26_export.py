@@ -0,0 +1,118 @@
+import csv
+import gzip
+import io
+import json
+import shutil
+from http import HTTPStatus
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+
+
+def read_stream(response):
+    assert response.streaming, (
+        'Проверьте, что выгрузка отдаётся через `StreamingHttpResponse`.'
+    )
+    return b''.join(response.streaming_content)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26Export:
+
+    URL_TEMPLATE = '/api/v1/export/{resource}.{format}'
+    RESOURCES = (
+        ('categories', 'category.csv'),
+        ('genres', 'genre.csv'),
+        ('titles', 'titles.csv'),
+        ('genre_title', 'genre_title.csv'),
+        ('reviews', 'review.csv'),
+        ('comments', 'comments.csv'),
+    )
+
+    def test_01_permissions(self, client, user_client, moderator_client):
+        url = self.URL_TEMPLATE.format(resource='titles', format='csv')
+        assert client.get(url).status_code == HTTPStatus.UNAUTHORIZED
+        for role_client in (user_client, moderator_client):
+            assert role_client.get(url).status_code == HTTPStatus.FORBIDDEN, (
+                'Проверьте, что выгрузка доступна только администратору.'
+            )
+
+    def test_02_errors(self, admin_client):
+        url = self.URL_TEMPLATE.format(resource='users', format='csv')
+        assert admin_client.get(url).status_code == HTTPStatus.NOT_FOUND
+        url = self.URL_TEMPLATE.format(resource='titles', format='csv')
+        response = admin_client.get(url, {'compress': 'zip'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert 'compress' in response.json()
+
+    def test_03_csv_round_trip(self, admin_client, tmp_path):
+        from reviews.models import Comment, Review, Title
+
+        call_command('add_data', verbosity=0)
+        expected = (
+            Title.objects.count(), Review.objects.count(),
+            Comment.objects.count()
+        )
+        data_dir = settings.BASE_DIR / 'static' / 'data'
+        for resource, file in self.RESOURCES:
+            response = admin_client.get(
+                self.URL_TEMPLATE.format(resource=resource, format='csv'),
+                HTTP_ACCEPT='text/csv'
+            )
+            assert response.status_code == HTTPStatus.OK
+            assert response['Content-Type'].startswith('text/csv')
+            content = read_stream(response).decode()
+            with open(data_dir / file, encoding='utf-8-sig') as source:
+                source_header = next(csv.reader(source))
+            header = next(csv.reader(io.StringIO(content)))
+            assert header[:len(source_header)] == source_header, (
+                f'Проверьте, что колонки выгрузки `{resource}` совпадают '
+                f'с файлом `{file}`, который загружает add_data.'
+            )
+            (tmp_path / file).write_text(content, encoding='utf-8')
+        shutil.copy(data_dir / 'users.csv', tmp_path / 'users.csv')
+
+        call_command('add_data', '--truncate', '--path', tmp_path,
+                     verbosity=0)
+        assert (
+            Title.objects.count(), Review.objects.count(),
+            Comment.objects.count()
+        ) == expected, (
+            'Проверьте, что выгрузку в CSV можно загрузить обратно '
+            'командой add_data.'
+        )
+        assert Review.objects.get(pk=1).pub_date.year == 2019
+        call_command('rebuild_ratings', '--check')
+
+    def test_04_ndjson_gzip(self, admin_client):
+        from reviews.bulk_loader import BulkLoader
+        from reviews.models import Review
+
+        call_command('add_data', verbosity=0)
+        url = self.URL_TEMPLATE.format(resource='reviews', format='ndjson')
+        response = admin_client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert response['Content-Type'] == 'application/x-ndjson'
+        content = read_stream(response)
+        rows = [json.loads(line) for line in content.decode().splitlines()]
+        assert len(rows) == Review.objects.count()
+        assert [row['id'] for row in rows] == sorted(
+            Review.objects.values_list('id', flat=True)
+        )
+        assert set(rows[0]) == {
+            'id', 'title_id', 'text', 'author_id', 'score', 'pub_date'
+        }
+
+        response = admin_client.get(url, {'compress': 'gzip'})
+        assert response['Content-Encoding'] == 'gzip'
+        assert gzip.decompress(read_stream(response)) == content, (
+            'Проверьте, что `?compress=gzip` отдаёт ту же выгрузку, '
+            'сжатую gzip.'
+        )
+
+        Review.objects.all().delete()
+        BulkLoader().load_rows(Review, rows)
+        assert Review.objects.count() == len(rows), (
+            'Проверьте, что строки NDJSON можно загрузить через BulkLoader.'
+        )
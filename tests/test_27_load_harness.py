@@ -0,0 +1,48 @@
+from collections import Counter
+
+import pytest
+
+from benchmarks.datagen import generate, get_counts
+from benchmarks.load import SCENARIOS, InProcessClient, route_names, run
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27LoadHarness:
+
+    ROWS = 4000
+
+    def test_01_datagen(self):
+        from reviews.models import Comment, Review, Title
+
+        stats = generate(self.ROWS, seed=1, batch_size=500)
+        counts = get_counts(self.ROWS)
+        total = sum(table.rows for table in stats)
+        assert abs(total - self.ROWS) / self.ROWS < 0.1, (
+            'Проверьте, что генератор создаёт примерно заданное число строк.'
+        )
+        assert Title.objects.count() == counts['titles']
+        assert Comment.objects.count() == counts['comments']
+        per_title = Counter(
+            Review.objects.values_list('title_id', flat=True)
+        ).most_common()
+        top = sum(count for _, count in per_title[:len(per_title) // 10])
+        assert top > Review.objects.count() * 0.3, (
+            'Проверьте, что отзывы распределены по произведениям '
+            'неравномерно: 10% произведений получают большую часть отзывов.'
+        )
+        with pytest.raises(ValueError):
+            generate(self.ROWS)
+
+    def test_02_load_driver(self):
+        generate(self.ROWS, seed=1)
+        assert route_names() <= {scenario.route for scenario in SCENARIOS}, (
+            'Проверьте, что у каждого маршрута api/urls.py есть сценарий.'
+        )
+        result = run(SCENARIOS, InProcessClient, requests=2, concurrency=1)
+        for name, route in result['routes'].items():
+            assert route['errors'] == 0, (
+                f'Сценарий `{name}` завершился ошибкой: {route["status"]}'
+            )
+            assert route['p50_ms'] <= route['p95_ms'] <= route['p99_ms']
+            assert route['queries_per_request'] is not None
+        assert result['total']['requests'] == 2 * len(SCENARIOS)
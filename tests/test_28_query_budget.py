@@ -0,0 +1,81 @@
+from http import HTTPStatus
+
+import pytest
+from django.test import Client
+
+from api.cache import get_cache
+from api_yamdb import querybudget
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28QueryBudget:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_fingerprint(self):
+        assert querybudget.fingerprint(
+            'SELECT * FROM t WHERE id IN (%s, %s, %s) AND name = %s LIMIT 10'
+        ) == querybudget.fingerprint(
+            "SELECT * FROM t WHERE id IN (%s) AND name = 'x' LIMIT 20"
+        ), (
+            'Проверьте, что отпечаток запроса не зависит от значений '
+            'параметров и длины списка IN.'
+        )
+        assert querybudget.get_budget(None, 'list') is None
+        view = type('View', (), {'query_budget': {'list': 4}})
+        assert querybudget.get_budget(view, 'list') == 4
+        assert querybudget.get_budget(view, 'create') is None
+
+    def test_02_server_timing(self, client, admin_client, settings):
+        settings.QUERY_BUDGET_SERVER_TIMING = False
+        create_titles(admin_client)
+        assert 'Server-Timing' not in client.get(self.TITLES_URL), (
+            'Проверьте, что без QUERY_BUDGET_SERVER_TIMING заголовок '
+            '`Server-Timing` не отдаётся.'
+        )
+        settings.QUERY_BUDGET_SERVER_TIMING = True
+        # Middleware читает настройку при создании обработчика запросов.
+        client = Client()
+        get_cache().clear()
+        response = client.get(self.TITLES_URL)
+        assert response.status_code == HTTPStatus.OK
+        timing = response['Server-Timing']
+        assert timing.startswith('db;dur='), (
+            'Проверьте, что ответ содержит время запросов к БД в заголовке '
+            '`Server-Timing`.'
+        )
+        assert '"3 queries"' in timing
+        assert 'db-duplicates' not in timing
+        assert not querybudget.violations
+
+    def test_03_violation(self, client, admin_client, monkeypatch, settings):
+        from api.views import TitleViewSet
+        from reviews.models import Title
+
+        create_titles(admin_client)
+        # N+1: без prefetch_related и быстрого пути жанры каждого
+        # произведения загружаются отдельным запросом.
+        monkeypatch.setattr(TitleViewSet, 'queryset', Title.objects.order_by(
+            'name'
+        ))
+        monkeypatch.setattr(
+            TitleViewSet, 'get_row_serializer', lambda self: None
+        )
+        settings.QUERY_BUDGET_SERVER_TIMING = True
+        response = Client().get(self.TITLES_URL)
+        assert response.status_code == HTTPStatus.OK
+        assert 'db-duplicates;desc=' in response['Server-Timing'], (
+            'Проверьте, что повторяющиеся запросы попадают в `Server-Timing`.'
+        )
+        violations = list(querybudget.violations)
+        querybudget.violations.clear()
+        assert len(violations) == 1, (
+            'Проверьте, что запрос сверх `query_budget` вьюсета '
+            'записывается как превышение.'
+        )
+        violation = violations[0]
+        assert violation['view'] == 'TitleViewSet.list'
+        assert violation['budget'] == 4
+        assert violation['queries'] > violation['budget']
+        assert max(violation['duplicates'].values()) > 1
@@ -0,0 +1,127 @@
+import multiprocessing
+from http import HTTPStatus
+
+import pytest
+
+from api_yamdb import metrics
+from tests.utils import create_titles
+
+
+def child_process(directory, ready, done):
+    metrics.registry.inc('http_requests_total', {'view': 'Child'})
+    metrics.registry.observe(
+        'http_request_duration_seconds', {'view': 'Child'}, 0.1
+    )
+    metrics.registry.flush(directory, force=True)
+    ready.set()
+    done.wait(10)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test29Metrics:
+
+    METRICS_URL = '/metrics'
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_metrics(self, client, admin_client, settings, monkeypatch):
+        settings.MAIL_OUTBOX_EAGER = False
+        monkeypatch.setattr(metrics, 'METRICS_TOKEN', 'secret')
+        metrics.registry.reset()
+        create_titles(admin_client)
+        client.get(self.TITLES_URL)
+        client.get(self.TITLES_URL)
+        client.post('/api/v1/auth/signup/', data={
+            'username': 'metrics', 'email': 'metrics@yamdb.fake'
+        })
+        response = client.get(
+            self.METRICS_URL, HTTP_AUTHORIZATION='Bearer secret'
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response['Content-Type'].startswith('text/plain; version=0.0.4')
+        lines = response.content.decode().splitlines()
+        expected = (
+            'http_requests_total{method="GET",status="200",'
+            'view="TitleViewSet.list"} 2.0',
+            'http_requests_total{method="POST",status="201",'
+            'view="TitleViewSet.create"} 2.0',
+            'http_request_duration_seconds_count'
+            '{view="TitleViewSet.list"} 2',
+            'http_request_duration_seconds_bucket'
+            '{view="TitleViewSet.list",le="+Inf"} 2',
+            'api_cache_hit_ratio{namespace="titles"} 0.5',
+            'mail_outbox_messages{status="pending"} 1',
+            '# TYPE http_request_duration_seconds histogram',
+        )
+        for line in expected:
+            assert line in lines, (
+                f'Проверьте, что `/metrics` содержит строку `{line}`.'
+            )
+        assert any(
+            line.startswith('db_queries_total{view="TitleViewSet.list"}')
+            for line in lines
+        ), 'Проверьте, что `/metrics` содержит число запросов к БД.'
+        assert not any('metrics_view' in line for line in lines), (
+            'Запросы к самому `/metrics` не должны попадать в метрики.'
+        )
+
+    def test_02_token(self, client, monkeypatch):
+        monkeypatch.setattr(metrics, 'METRICS_TOKEN', 'secret')
+        assert client.get(self.METRICS_URL).status_code == (
+            HTTPStatus.FORBIDDEN
+        )
+        response = client.get(
+            self.METRICS_URL, HTTP_AUTHORIZATION='Bearer secret'
+        )
+        assert response.status_code == HTTPStatus.OK
+
+    def test_03_no_token(self, client, settings, monkeypatch):
+        monkeypatch.setattr(metrics, 'METRICS_TOKEN', None)
+        settings.DEBUG = False
+        assert client.get(self.METRICS_URL).status_code == (
+            HTTPStatus.NOT_FOUND
+        ), (
+            'Проверьте, что без `METRICS_TOKEN` `/metrics` закрыт для '
+            'анонимных запросов.'
+        )
+        settings.DEBUG = True
+        assert client.get(self.METRICS_URL).status_code == HTTPStatus.OK, (
+            'Проверьте, что без `METRICS_TOKEN` `/metrics` доступен при '
+            'включённом DEBUG.'
+        )
+
+    def test_04_processes(self, tmp_path):
+        metrics.registry.reset()
+        context = multiprocessing.get_context('fork')
+        ready, done = context.Event(), context.Event()
+        child = context.Process(
+            target=child_process, args=(tmp_path, ready, done)
+        )
+        child.start()
+        try:
+            assert ready.wait(10)
+            metrics.registry.inc('http_requests_total', {'view': 'Child'})
+            counters, _ = metrics.collect(tmp_path)
+            key = ('http_requests_total', (('view', 'Child'),))
+            assert counters[key] == 2, (
+                'Проверьте, что `/metrics` складывает значения всех '
+                'процессов из METRICS_DIR.'
+            )
+        finally:
+            done.set()
+            child.join(10)
+        counters, histograms = metrics.collect(tmp_path)
+        assert counters[key] == 2, (
+            'Проверьте, что значения счётчиков завершившегося процесса '
+            'сохраняются и счётчик не уменьшается.'
+        )
+        assert not (tmp_path / f'{child.pid}.json').exists(), (
+            'Проверьте, что файл завершившегося процесса удаляется.'
+        )
+        assert (tmp_path / 'aggregate.json').exists()
+        assert histograms[
+            ('http_request_duration_seconds', (('view', 'Child'),))
+        ][-1] == 1
+        assert metrics.collect(tmp_path)[0][key] == 2, (
+            'Проверьте, что значения завершившегося процесса учитываются '
+            'один раз.'
+        )
@@ -0,0 +1,117 @@
+import json
+import time
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.test import Client
+
+from api_yamdb import profiler
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test30Profiler:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def enable(self, settings, tmp_path, **options):
+        settings.PROFILER_ENABLED = True
+        settings.PROFILER_DIR = tmp_path
+        settings.PROFILER_THRESHOLD_MS = 1000
+        settings.PROFILER_SAMPLE_RATE = 0
+        for name, value in options.items():
+            setattr(settings, f'PROFILER_{name}', value)
+        # Middleware читает настройки при создании обработчика запросов.
+        return Client()
+
+    def test_01_cprofile(self, admin_client, settings, tmp_path):
+        create_titles(admin_client)
+        client = self.enable(
+            settings, tmp_path, BACKEND='cprofile', SAMPLE_RATE=1
+        )
+        response = client.get(self.TITLES_URL, {'year': 1990})
+        assert response.status_code == HTTPStatus.OK
+        files = list(tmp_path.glob('*.json'))
+        assert len(files) == 1, (
+            'Проверьте, что при PROFILER_SAMPLE_RATE = 1 профиль сохраняется '
+            'для каждого запроса.'
+        )
+        assert 'TitleViewSet.list' in files[0].name
+        profile = json.loads(files[0].read_text())
+        request = profile['request']
+        assert request['path'] == f'{self.TITLES_URL}?year=1990'
+        assert request['view'] == 'TitleViewSet.list'
+        assert request['status'] == HTTPStatus.OK
+        assert request['reason'] == 'sampled'
+        assert profile['sql'] and all(
+            'duration_ms' in query for query in profile['sql']
+        ), 'Проверьте, что профиль содержит SQL-запросы с временем.'
+        assert any('list (' in label for label in profile['functions'])
+
+    def test_02_sampling(self, admin_client, settings, tmp_path, monkeypatch):
+        from api.views import TitleViewSet
+
+        create_titles(admin_client)
+        list_view = TitleViewSet.list
+
+        def slow_list(self, request, *args, **kwargs):
+            time.sleep(0.05)
+            return list_view(self, request, *args, **kwargs)
+
+        monkeypatch.setattr(TitleViewSet, 'list', slow_list)
+        client = self.enable(
+            settings, tmp_path, BACKEND='sampling', THRESHOLD_MS=30,
+            INTERVAL_MS=1
+        )
+        client.get('/api/v1/genres/')
+        client.get(self.TITLES_URL)
+        files = list(tmp_path.glob('*.json'))
+        assert len(files) == 1, (
+            'Проверьте, что сохраняются только запросы дольше '
+            'PROFILER_THRESHOLD_MS.'
+        )
+        profile = json.loads(files[0].read_text())
+        assert profile['request']['reason'] == 'slow'
+        assert profile['request']['duration_ms'] >= 50
+        assert any('slow_list' in stack for stack in profile['stacks']), (
+            'Проверьте, что профиль содержит снятые стеки медленной функции.'
+        )
+        slow = next(
+            timing for label, timing in profile['functions'].items()
+            if label.startswith('slow_list ')
+        )
+        assert slow['total'] >= 25
+
+    def test_03_rotation(self, client, settings, tmp_path):
+        client = self.enable(
+            settings, tmp_path, BACKEND='sampling', SAMPLE_RATE=1,
+            MAX_FILES=2
+        )
+        for _ in range(4):
+            client.get('/api/v1/genres/')
+        assert len(list(tmp_path.glob('*.json'))) == 2, (
+            'Проверьте, что хранятся не больше PROFILER_MAX_FILES профилей.'
+        )
+
+    def test_04_summary(self, admin_client, settings, tmp_path):
+        create_titles(admin_client)
+        client = self.enable(
+            settings, tmp_path, BACKEND='cprofile', SAMPLE_RATE=1
+        )
+        client.get(self.TITLES_URL)
+        client.get('/api/v1/genres/')
+        profiles = profiler.load_profiles(tmp_path, 'TitleViewSet.list')
+        assert len(profiles) == 1
+        hottest = profiler.hottest_functions(profiles, 'total', limit=5)
+        assert len(hottest) == 5
+        assert hottest[0][1] >= hottest[-1][1]
+        out = StringIO()
+        call_command('profile_summary', '--path', str(tmp_path), stdout=out)
+        output = out.getvalue()
+        assert 'Профилей: 2' in output
+        assert f'GET {self.TITLES_URL}' in output
+        assert 'FROM "reviews_title"' in output, (
+            'Проверьте, что `profile_summary` показывает самые долгие SQL.'
+        )
@@ -0,0 +1,33 @@
+from http import HTTPStatus
+
+import pytest
+
+from api_yamdb import metrics, settings_api
+
+
+class Test31APIProfile:
+
+    def test_01_settings(self):
+        for middleware in settings_api.BROWSER_MIDDLEWARE:
+            assert middleware not in settings_api.MIDDLEWARE, (
+                'Проверьте, что в `settings_api` нет middleware сессий, '
+                'CSRF и сообщений.'
+            )
+        for app in settings_api.BROWSER_APPS:
+            assert app not in settings_api.INSTALLED_APPS
+        assert 'api.apps.ApiConfig' in settings_api.INSTALLED_APPS
+        assert settings_api.TEMPLATES == []
+        assert 'rest_framework.renderers.BrowsableAPIRenderer' not in (
+            settings_api.REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES']
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_urls(self, client, settings, monkeypatch):
+        monkeypatch.setattr(metrics, 'METRICS_TOKEN', 'secret')
+        settings.ROOT_URLCONF = 'api_yamdb.urls_api'
+        assert client.get('/admin/').status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что `urls_api` не подключает админку.'
+        )
+        assert client.get('/api/v1/genres/').status_code == HTTPStatus.OK
+        response = client.get('/metrics', HTTP_AUTHORIZATION='Bearer secret')
+        assert response.status_code == HTTPStatus.OK